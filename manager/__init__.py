@@ -2,4 +2,5 @@ from .dataset import *
 from .architecture import *
 from .model import *
 from .task import *
+from .result import *
 from .utils import *
@@ -1,7 +1,6 @@
 import logging
 import os
 import time
-import hashlib
 
 import metadata
 import storage
@@ -11,20 +10,7 @@ logger = logging.getLogger(__file__)
 
 CHUNK_SIZE_BYTES = 4096
 
-
-def file_to_hash(file_path):
-    hash = hashlib.sha256()
-
-    with open(file_path, 'rb') as f:
-        while True:
-            raw = f.read(1024)
-
-            if not raw:
-                break
-
-            hash.update(raw)
-
-    return hash.hexdigest()
+file_to_hash = storage.get_file_hash
 
 
 def save_dataset(meta, fileio):
@@ -0,0 +1,66 @@
+import numpy
+
+import storage
+
+__all__ = [
+    'read_predict_result'
+]
+
+ARGMAX = 'argmax'
+TOPK = 'topk'
+
+RESULT_REDUCTIONS = [
+    ARGMAX,
+    TOPK
+]
+
+
+def reduce_result(y, reduce=None, k=1):
+    """Reduce last axis of predictions
+
+    Returns:
+        dict of named arrays
+    """
+
+    if reduce is None:
+        return {'y': y}
+    elif reduce == ARGMAX:
+        return {'y': numpy.argmax(y, axis=-1)}
+    elif reduce == TOPK:
+        k = min(k, y.shape[-1])
+        indices = numpy.argsort(-y, axis=-1)[..., :k]
+        values = -numpy.sort(-y, axis=-1)[..., :k]
+
+        return {'indices': indices, 'values': values}
+    else:
+        raise ValueError('reduce must be one of {reductions}'.format(reductions=RESULT_REDUCTIONS))
+
+
+def read_predict_result(task, start=0, number=None, reduce=None, k=1):
+    """Read rows of predict task result, only requested rows are read from file
+
+    Args:
+        task (TaskMetadata): completed predict task
+        start (int): first row
+        number (None or int): number of rows, all rows if None
+        reduce (None or str): reduction of last axis: argmax or topk
+        k (int): number of top values for topk reduction
+
+    Returns:
+        (total, dict of named arrays)
+
+    Raises:
+        KeyError - task has not result
+        ValueError - invalid reduce
+    """
+
+    result_name = task.history['result']
+
+    with storage.open_dataset(result_name, mode='r', prefix='tmp') as h5:
+        dataset = h5['y']
+        total = dataset.shape[0]
+
+        stop = total if number is None else min(start + number, total)
+        y = dataset[start:stop] if start < stop else dataset[0:0]
+
+    return total, reduce_result(y, reduce, k)
@@ -1,9 +1,10 @@
 import uuid
 import logging
+import concurrent.futures
 
 from celery.result import AsyncResult
 from celery.task import control
-import gevent
+from kombu.exceptions import OperationalError
 
 from metadata.task import TaskMetadata
 import metadata
@@ -14,6 +15,19 @@ logger = logging.getLogger(__name__)
 
 CELERY_CONNECTION_TIMEOUT = 5
 
+# publish is retried for about CELERY_CONNECTION_TIMEOUT, so publishing thread is not held forever;
+# publish finished after timeout is not run: worker skips tasks which are marked failed
+PUBLISH_RETRY_POLICY = {
+    'max_retries': 3,
+    'interval_start': 0,
+    'interval_step': 1,
+    'interval_max': 1
+}
+
+# tasks are published by own threads: timeout of result works with threads and with gevent
+PUBLISH_THREADS = 4
+PUBLISH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(PUBLISH_THREADS)
+
 
 class Task:
     def __init__(self):
@@ -27,15 +41,38 @@ def terminate(task):
     task.delete()
 
 
+def revoke_all(ids):
+    """Terminate tasks by ids with one broadcast, metadata is not changed"""
+
+    control.revoke(list(ids), terminate=True)
+
+
 def start_task(task, *args, **kwargs):
+    """
+    Raises:
+        RuntimeError - broker is not available in CELERY_CONNECTION_TIMEOUT
+    """
+
     task = utils.prepare_task(task)
 
-    with gevent.Timeout(CELERY_CONNECTION_TIMEOUT):
-        task = app.send_task(
-            task.command,
-            args=args,
-            kwargs=kwargs,
-            task_id=task.id)
+    future = PUBLISH_EXECUTOR.submit(
+        app.send_task,
+        task.command,
+        args=args,
+        kwargs=kwargs,
+        task_id=task.id,
+        retry=True,
+        retry_policy=PUBLISH_RETRY_POLICY)
+
+    try:
+        task = future.result(timeout=CELERY_CONNECTION_TIMEOUT)
+    except (concurrent.futures.TimeoutError, OperationalError, OSError) as err:
+        # publish waiting for free thread is not started
+        future.cancel()
+
+        logger.warning('Can not send task {id}: {err!r}'.format(id=task.id, err=err))
+
+        raise RuntimeError('Can not send task')
 
     logger.debug('Send task {id} to worker'.format(id=task.id))
 
@@ -72,11 +109,11 @@ def create_task(command, config, context, start=True):
     if start:
         try:
             start_task(task)
-        except gevent.timeout.Timeout:
+        except RuntimeError:
             with task.save_context():
-                task.state = metadata.task.FAILURE
+                task.status = metadata.task.FAILURE
                 task.history['error'] = 'Can not send task'
 
-            raise RuntimeError('Can not send task')
+            raise
 
     return task
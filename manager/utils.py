@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 
 app = celery.Celery('tasks')
 
+# connection to broker is retried forever by default, web api must not wait for it
+BROKER_CONNECTION_MAX_RETRIES = 2
+
 
 def from_config(config_file):
     if type(config_file) is str:
@@ -20,6 +23,10 @@ def from_config(config_file):
 
     app.config_from_object(config)
 
+    transport_options = dict(app.conf.broker_transport_options or {})
+    transport_options.setdefault('max_retries', BROKER_CONNECTION_MAX_RETRIES)
+    app.conf.broker_transport_options = transport_options
+
 
 def prepare_metadata(metadata_cls, metadata):
     if isinstance(metadata, str):
@@ -8,11 +8,33 @@ from . import architecture
 from . import model
 from . import task
 from . import errors
+from . import counters
+from . import cache
+from . import indexes
+from . import pagination
+from . import raw
+from . import history
+from . import bulk
+from . import search
+from . import summary
+from . import feed
+from . import webhook
 
 from .dataset import *
 from .architecture import *
 from .model import *
 from .task import *
+from .counters import *
+from .cache import *
+from .indexes import *
+from .pagination import *
+from .raw import *
+from .history import *
+from .bulk import *
+from .search import *
+from .summary import *
+from .feed import *
+from .webhook import *
 
 
 def from_config(config_file):
@@ -30,3 +52,6 @@ def from_config(config_file):
             heartbeatFrequencyMS=1000)
     # more args:
     # https://api.mongodb.com/python/current/api/pymongo/mongo_client.html#pymongo.mongo_client.MongoClient
+
+    configure_cache(config.get('cache', {}))
+    configure_task_feed(config.get('task_feed', {}))
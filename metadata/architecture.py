@@ -6,6 +6,8 @@ from mongoengine.queryset.visitor import Q
 
 from .dataset import DATASET_CATEGORIES
 from .mixin import MetadataMixin
+from .cache import METADATA_CACHE
+from .pagination import paginate
 from .errors import ResourcePublishedException
 
 __all__ = [
@@ -25,7 +27,7 @@ ARCHITECTURE_STATUS_CODES = [
 ]
 
 
-class ArchitectureMetadata(Document, MetadataMixin):
+class ArchitectureMetadata(MetadataMixin, Document):
     id = fields.StringField(primary_key=True, default=lambda: str(uuid.uuid4()))
     is_public = fields.BooleanField(default=False)
     owner = fields.StringField(required=True)
@@ -34,11 +36,26 @@ class ArchitectureMetadata(Document, MetadataMixin):
     description = fields.StringField()
     category = fields.StringField(choices=DATASET_CATEGORIES)
     architecture = fields.DictField(required=True)
+    date = fields.LongField()
+
+    cached = True
 
     meta = {
         'allow_inheritance': True,
         'db_alias': 'metadata',
-        'collection': 'architectures'
+        'collection': 'architectures',
+        'indexes': [
+            # public architectures
+            ('is_public', 'date', '_id'),
+            # architectures of user
+            ('owner', 'is_public', 'date', '_id'),
+            # search
+            {
+                'fields': ['$title', '$description'],
+                'weights': {'title': 10, 'description': 1},
+                'cls': False
+            }
+        ]
     }
 
     def to_dict(self):
@@ -58,20 +75,24 @@ class ArchitectureMetadata(Document, MetadataMixin):
                 setattr(self, name, meta[name])
 
 
-def get_architecture(id, context):
+def get_architecture(id, context, fields=None):
     if not isinstance(id, str):
         raise TypeError('Type of id must be str')
 
     if not isinstance(context, dict):
         raise TypeError('Type of context must be dict')
 
+    if METADATA_CACHE.enabled:
+        # cached document has all fields
+        return ArchitectureMetadata.from_cache(id, context.get('user_id', None))
+
     if 'user_id' in context and context['user_id']:
         user_id = context['user_id']
         query = Q(id=id) & (Q(owner=user_id) | Q(is_public=True))
-        meta = ArchitectureMetadata.from_id(query)
+        meta = ArchitectureMetadata.from_id(query, fields=fields)
     else:
         kwargs = {'id': id, 'is_public': True}
-        meta = ArchitectureMetadata.from_id(**kwargs)
+        meta = ArchitectureMetadata.from_id(fields=fields, **kwargs)
 
     return meta
 
@@ -117,6 +138,11 @@ def update_architecture(architecture, data, context=None):
     with architecture.save_context():
         architecture.from_dict(data)
 
+    if 'title' in data:
+        # model module imports architecture module
+        from .model import sync_architecture_fields
+        sync_architecture_fields(architecture)
+
 
 def delete_architecture(architecture, context=None):
     """Delete architecture by id or directly
@@ -159,7 +185,7 @@ def delete_architecture(architecture, context=None):
     architecture.delete()
 
 
-def get_architectures(context, filter=None):
+def get_architectures(context, filter=None, fields=None):
     if not isinstance(context, dict):
         raise TypeError('Type of context must be dict')
 
@@ -173,14 +199,8 @@ def get_architectures(context, filter=None):
         query = query | (Q(is_public=False) & Q(owner=user_id))
 
     metas = ArchitectureMetadata.objects(query)
+    metas = ArchitectureMetadata.only_fields(metas, fields)
 
-    if filter:
-        if 'from' in filter:
-            from_ = filter['from']
-            metas = metas.skip(from_)
-
-        if 'number' in filter:
-            number = filter['number']
-            metas = metas.limit(number)
+    metas = paginate(metas, filter)
 
     return metas
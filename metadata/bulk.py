@@ -0,0 +1,286 @@
+from mongoengine.errors import ValidationError
+from mongoengine.queryset.visitor import Q
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .dataset import DatasetMetadata
+from .architecture import ArchitectureMetadata
+from .model import ModelMetadata, sync_dataset_fields, sync_architecture_fields
+from . import counters
+from .cache import METADATA_CACHE
+
+__all__ = [
+    'MAX_BULK_SIZE',
+    'insert_documents',
+    'update_documents',
+    'delete_documents'
+]
+
+MAX_BULK_SIZE = 1000  # items in one bulk operation
+
+# statuses of bulk items
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+INVALID = 'invalid'
+NOT_FOUND = 'not_found'
+CONFLICT = 'conflict'
+FAILED = 'failed'
+
+PUBLISHED = 'PUBLISHED'
+
+# fields copied to models from referenced documents
+SYNCED_FIELDS = {
+    DatasetMetadata: (('title', 'category'), sync_dataset_fields),
+    ArchitectureMetadata: (('title',), sync_architecture_fields)
+}
+
+
+def item_result(id, status, error=None):
+    result = {'id': id, 'status': status}
+
+    if error is not None:
+        result['error'] = error
+
+    return result
+
+
+def owner_query(document_type, context):
+    """Return query of documents owned by user of context
+
+    Raises:
+        KeyError - context not contain user_id key
+    """
+
+    user_id = context.get('user_id', None) if context else None
+
+    if not user_id:
+        raise KeyError('context must contain user_id key')
+
+    if 'base' in document_type._fields:
+        return Q(base__owner=user_id)
+
+    return Q(owner=user_id)
+
+
+def load_documents(document_type, ids, context):
+    """Return dict of id to document for owned documents, one $in query"""
+
+    query = owner_query(document_type, context) & Q(id__in=list(set(ids)))
+
+    return {document.id: document for document in document_type.objects(query)}
+
+
+def insert_documents(documents):
+    """Validate documents and insert valid ones with one insert_many
+
+    Args:
+        documents (list): new documents of one type
+
+    Returns:
+        list of item results in order of documents
+    """
+
+    results = [None] * len(documents)
+    valid = []
+
+    for index, document in enumerate(documents):
+        try:
+            document.validate()
+        except ValidationError as err:
+            results[index] = item_result(document.id, INVALID, str(err))
+            continue
+
+        valid.append(index)
+
+    if not valid:
+        return results
+
+    document_type = type(documents[0])
+    collection = document_type._get_collection()
+
+    ids = [documents[index].id for index in valid]
+    existing = {son['_id'] for son in collection.find({'_id': {'$in': ids}}, {'_id': 1})}
+
+    inserted = []
+    seen = set()
+    for index in valid:
+        id = documents[index].id
+
+        if id in existing or id in seen:
+            results[index] = item_result(id, CONFLICT, 'id already exists')
+        else:
+            inserted.append(index)
+            seen.add(id)
+
+    if not inserted:
+        return results
+
+    failed = set()
+    try:
+        collection.insert_many([documents[index].to_mongo() for index in inserted], ordered=False)
+    except BulkWriteError as err:
+        errors = err.details.get('writeErrors', []) if err.details else []
+        failed = {inserted[error['index']] for error in errors}
+
+        # check which of the other documents are written
+        ids = [documents[index].id for index in inserted if index not in failed]
+        written = {son['_id'] for son in collection.find({'_id': {'$in': ids}}, {'_id': 1})}
+        failed |= {index for index in inserted if documents[index].id not in written}
+
+    added = []
+
+    for index in inserted:
+        document = documents[index]
+
+        if index in failed:
+            results[index] = item_result(document.id, FAILED, 'document is not written')
+        else:
+            document._created = False
+            document._clear_changed_fields()
+            document._counter_keys = counters.get_counter_keys(document)
+            added.extend(document._counter_keys)
+            results[index] = item_result(document.id, CREATED)
+
+    counters.change_counters(counters.get_deltas(added=added))
+
+    return results
+
+
+def update_documents(document_type, items, context):
+    """Update owned documents with one unordered bulk_write
+
+    Only changed fields are written with $set / $unset. Items are reported
+    updated only after write, failed writes are reported by item.
+    Copies of dataset and architecture fields in models are synchronized.
+
+    Args:
+        document_type (type): document class
+        items (list): pairs of (id, data), data is flatten representation of fields
+        context (dict): context with user_id
+
+    Returns:
+        list of item results in order of items
+    """
+
+    documents = load_documents(document_type, [id for id, _ in items], context)
+    synced_fields, sync = SYNCED_FIELDS.get(document_type, ((), None))
+
+    results = []
+    writes = []  # (result index, id, document, update, synced)
+    seen = set()
+
+    for id, data in items:
+        document = documents.get(id, None)
+
+        if document is None:
+            results.append(item_result(id, NOT_FOUND))
+            continue
+
+        if id in seen:
+            results.append(item_result(id, CONFLICT, 'duplicate id in request'))
+            continue
+
+        seen.add(id)
+
+        try:
+            document.from_dict(data)
+            document.validate()
+        except (ValidationError, ValueError, TypeError) as err:
+            results.append(item_result(id, INVALID, str(err)))
+            continue
+
+        updates, removals = document._delta()
+
+        update = {}
+        if updates:
+            update['$set'] = updates
+        if removals:
+            update['$unset'] = removals
+
+        synced = bool(sync) and any(name in data for name in synced_fields)
+
+        if update:
+            writes.append((len(results), id, document, update, synced))
+            results.append(None)
+        else:
+            results.append(item_result(id, UPDATED))
+
+            if synced:
+                sync(document)
+
+    if not writes:
+        return results
+
+    operations = [UpdateOne({'_id': document.id}, update) for _, _, document, update, _ in writes]
+    errors = {}
+
+    try:
+        document_type._get_collection().bulk_write(operations, ordered=False)
+    except BulkWriteError as err:
+        write_errors = err.details.get('writeErrors', []) if err.details else []
+        errors = {error['index']: error.get('errmsg', 'document is not written') for error in write_errors}
+
+    removed_keys = []
+    added_keys = []
+
+    for index, (result_index, id, document, update, synced) in enumerate(writes):
+        if index in errors:
+            results[result_index] = item_result(id, FAILED, errors[index])
+            continue
+
+        results[result_index] = item_result(id, UPDATED)
+
+        new_keys = counters.get_counter_keys(document)
+        removed_keys.extend(document._counter_keys)
+        added_keys.extend(new_keys)
+        document._counter_keys = new_keys
+
+        if synced:
+            sync(document)
+
+    if document_type.cached:
+        for _, _, document, _, _ in writes:
+            METADATA_CACHE.invalidate(document_type._get_collection_name(), document.id)
+
+    counters.change_counters(counters.get_deltas(removed_keys, added_keys))
+
+    return results
+
+
+def delete_documents(document_type, ids, context):
+    """Delete owned documents with one delete_many, published documents are not deleted
+
+    Returns:
+        list of item results in order of ids
+    """
+
+    documents = load_documents(document_type, ids, context)
+
+    results = []
+    deleted = []
+    removed_keys = []
+
+    for id in ids:
+        document = documents.get(id, None)
+
+        if document is None:
+            results.append(item_result(id, NOT_FOUND))
+        elif id in deleted:
+            results.append(item_result(id, CONFLICT, 'duplicate id in request'))
+        elif getattr(document, 'status', None) == PUBLISHED:
+            results.append(item_result(id, CONFLICT, 'can not delete published document'))
+        else:
+            results.append(item_result(id, DELETED))
+            deleted.append(id)
+            removed_keys.extend(document._counter_keys)
+
+    if deleted:
+        document_type._get_collection().delete_many({'_id': {'$in': deleted}})
+        counters.change_counters(counters.get_deltas(removed=removed_keys))
+
+        if document_type.cached:
+            for id in deleted:
+                METADATA_CACHE.invalidate(document_type._get_collection_name(), id)
+
+    return results
@@ -0,0 +1,301 @@
+import collections
+import copy
+import datetime
+import logging
+import threading
+import time
+
+from mongoengine.connection import get_db
+
+__all__ = [
+    'METADATA_CACHE',
+    'MetadataCache',
+    'LocalChannel',
+    'MongoChannel',
+    'configure_cache'
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 10000  # documents
+DEFAULT_CACHE_TTL = 60  # seconds
+DEFAULT_POLL_INTERVAL = 1  # seconds
+
+INVALIDATIONS_COLLECTION = 'cache_invalidations'
+INVALIDATIONS_SEQUENCE = 'cache:invalidations'
+INVALIDATIONS_EXPIRE = 3600  # seconds
+
+ALL = '*'  # id of collection wide invalidation
+
+
+class LocalChannel:
+    """Invalidation channel of one process
+
+    Process invalidates its own cache directly, so nothing is sent.
+    Used by default and in tests.
+    """
+
+    def publish(self, key):
+        pass
+
+    def poll(self):
+        return []
+
+
+class MongoChannel:
+    """Invalidation channel between processes through metadata database
+
+    Messages are numbered by sequence in counters collection and read by
+    polling, one indexed query per poll interval. Message which is written
+    after newer one is read may be missed, staleness is bounded by cache ttl.
+    """
+
+    def __init__(self, alias='metadata'):
+        self.alias = alias
+        self.last = None
+
+    @property
+    def db(self):
+        return get_db(self.alias)
+
+    def get_last(self):
+        son = self.db[INVALIDATIONS_COLLECTION].find_one({}, sort=[('_id', -1)])
+        return son['_id'] if son else 0
+
+    def publish(self, key):
+        sequence = self.db.counters.find_one_and_update(
+            {'_id': INVALIDATIONS_SEQUENCE},
+            {'$inc': {'value': 1}},
+            upsert=True,
+            return_document=True)
+
+        self.db[INVALIDATIONS_COLLECTION].insert_one({
+            '_id': sequence['value'],
+            'collection': key[0],
+            'id': key[1],
+            'date': datetime.datetime.utcnow()
+        })
+
+    def poll(self):
+        if self.last is None:
+            # messages sent before start are not needed
+            self.last = self.get_last()
+            return []
+
+        messages = self.db[INVALIDATIONS_COLLECTION].find({'_id': {'$gt': self.last}}).sort('_id', 1)
+
+        keys = []
+        for message in messages:
+            self.last = message['_id']
+            keys.append((message['collection'], message['id']))
+
+        return keys
+
+    def create_indexes(self):
+        self.db[INVALIDATIONS_COLLECTION].create_index('date', expireAfterSeconds=INVALIDATIONS_EXPIRE)
+
+
+class CacheEntry:
+    __slots__ = ('son', 'version', 'expires')
+
+    def __init__(self, son, version, expires):
+        self.son = son
+        self.version = version
+        self.expires = expires
+
+
+class MetadataCache:
+    """Read-through TTL/LRU cache of metadata documents by (collection, id)
+
+    Documents and collections have version counters, which are incremented
+    on invalidation. Document is stored only if its versions are not changed
+    while it is read from database, so stale document is never stored.
+    Versions of documents are kept while documents are read.
+    Raw documents are stored, each hit constructs new Document.
+    """
+
+    def __init__(self, size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL,
+                 channel=None, poll_interval=DEFAULT_POLL_INTERVAL, enabled=False):
+        if not isinstance(size, int) or size < 1:
+            raise ValueError('size of cache must be positive int')
+
+        self.size = size
+        self.ttl = ttl
+        self.channel = channel or LocalChannel()
+        self.poll_interval = poll_interval
+        self.enabled = enabled
+
+        self._entries = collections.OrderedDict()
+        self._versions = {}
+        self._collection_versions = collections.defaultdict(int)
+        self._loading = collections.Counter()
+        self._lock = threading.Lock()
+        self._next_poll = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_version(self, key):
+        return self._versions.get(key, 0), self._collection_versions[key[0]]
+
+    def poll(self):
+        now = time.time()
+
+        if now < self._next_poll:
+            return
+
+        self._next_poll = now + self.poll_interval
+
+        try:
+            keys = self.channel.poll()
+        except Exception as err:
+            logger.warning('Can not poll cache invalidations: {err}'.format(err=err))
+            return
+
+        for key in keys:
+            self.drop(key)
+
+    def lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key, None)
+
+            if entry is not None and entry.version == self.get_version(key) and entry.expires > time.time():
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+                return copy.deepcopy(entry.son), None
+
+            self.misses += 1
+            self._loading[key] += 1
+
+            return None, self.get_version(key)
+
+    def store(self, key, son, version):
+        with self._lock:
+            self._loading[key] -= 1
+            if not self._loading[key]:
+                del self._loading[key]
+
+            # document can be changed while it is read
+            if son is None or self.get_version(key) != version:
+                if key not in self._loading and key not in self._entries:
+                    self._versions.pop(key, None)
+
+                return
+
+            self._entries[key] = CacheEntry(copy.deepcopy(son), version, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, document_type, id):
+        """Return document by id or None if document does not exist"""
+
+        self.poll()
+
+        key = (document_type._get_collection_name(), id)
+
+        son, version = self.lookup(key)
+
+        if son is None:
+            try:
+                son = document_type._get_collection().find_one({'_id': id})
+            finally:
+                self.store(key, son, version)
+
+            if son is None:
+                return None
+
+        return document_type._from_son(son)
+
+    def drop(self, key):
+        with self._lock:
+            self.invalidations += 1
+            collection, id = key
+
+            if id == ALL:
+                self._collection_versions[collection] += 1
+
+                for cached_key in [cached_key for cached_key in self._entries if cached_key[0] == collection]:
+                    del self._entries[cached_key]
+
+                return
+
+            self._entries.pop(key, None)
+
+            if key in self._loading:
+                self._versions[key] = self._versions.get(key, 0) + 1
+            else:
+                self._versions.pop(key, None)
+
+    def invalidate(self, collection, id=ALL):
+        """Invalidate document or all documents of collection in all processes"""
+
+        key = (collection, id)
+        self.drop(key)
+
+        try:
+            self.channel.publish(key)
+        except Exception as err:
+            logger.warning('Can not publish cache invalidation: {err}'.format(err=err))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        requests = self.hits + self.misses
+
+        return {
+            'enabled': self.enabled,
+            'size': len(self._entries),
+            'capacity': self.size,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
+
+
+METADATA_CACHE = MetadataCache()
+
+
+def configure_cache(config):
+    """Configure METADATA_CACHE from cache section of metadata config
+
+    Keys:
+        enabled (bool): use cache, default False
+        size (int): max number of cached documents
+        ttl (int): seconds of life of cached document
+        channel (str): local or mongo
+        poll_interval (float): seconds between reads of invalidation channel
+    """
+
+    cache = METADATA_CACHE
+
+    cache.enabled = config.get('enabled', False)
+    cache.size = config.get('size', DEFAULT_CACHE_SIZE)
+    cache.ttl = config.get('ttl', DEFAULT_CACHE_TTL)
+    cache.poll_interval = config.get('poll_interval', DEFAULT_POLL_INTERVAL)
+
+    channel = config.get('channel', 'local')
+    if channel == 'mongo':
+        cache.channel = MongoChannel()
+        cache.channel.create_indexes()
+    elif channel == 'local':
+        cache.channel = LocalChannel()
+    else:
+        raise ValueError('unknown cache channel {channel}'.format(channel=channel))
+
+    cache.clear()
+
+    return cache
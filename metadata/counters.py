@@ -0,0 +1,202 @@
+import collections
+
+from mongoengine import Document
+from mongoengine import fields
+from pymongo import UpdateOne
+
+__all__ = [
+    'Counter',
+    'count_visible',
+    'count_owned',
+    'reconcile_counters'
+]
+
+RECONCILE_BATCH_SIZE = 10000
+
+
+class Counter(Document):
+    """Number of documents of collection in one scope: owner, owner and status, public
+
+    Counters are changed with $inc on create, delete and change of counted fields
+    and recomputed by reconcile_counters.
+    """
+
+    id = fields.StringField(primary_key=True)
+    value = fields.LongField(default=0)
+
+    meta = {
+        'db_alias': 'metadata',
+        'collection': 'counters'
+    }
+
+
+def make_counter_keys(collection, owner, status, is_public=None):
+    keys = [
+        '{collection}:owner:{owner}'.format(collection=collection, owner=owner),
+        '{collection}:owner:{owner}:status:{status}'.format(collection=collection, owner=owner, status=status)
+    ]
+
+    if is_public is True:
+        keys.append('{collection}:public'.format(collection=collection))
+    elif is_public is False:
+        keys.append('{collection}:private:{owner}'.format(collection=collection, owner=owner))
+
+    return keys
+
+
+def get_owner_path(document_type):
+    return 'base.owner' if 'base' in document_type._fields else 'owner'
+
+
+def get_counter_keys(document):
+    """Return keys of counters which include document"""
+
+    base = document.base if 'base' in document._fields else document
+    is_public = document.is_public if 'is_public' in document._fields else None
+
+    return make_counter_keys(document._get_collection_name(), base.owner, document.status, is_public)
+
+
+def change_counters(deltas):
+    """Add deltas to counters with one unordered bulk_write
+
+    Args:
+        deltas (dict): counter key to delta
+    """
+
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+
+    if not deltas:
+        return
+
+    operations = [UpdateOne({'_id': key}, {'$inc': {'value': delta}}, upsert=True) for key, delta in deltas.items()]
+
+    Counter._get_collection().bulk_write(operations, ordered=False)
+
+
+def get_deltas(removed=(), added=()):
+    """Return deltas of counters for lists of removed and added keys"""
+
+    deltas = {}
+
+    for key in removed:
+        deltas[key] = deltas.get(key, 0) - 1
+
+    for key in added:
+        deltas[key] = deltas.get(key, 0) + 1
+
+    return deltas
+
+
+def get_counters_sum(keys):
+    counters = Counter._get_collection().find({'_id': {'$in': keys}}, {'value': 1})
+
+    return sum(counter['value'] for counter in counters)
+
+
+def count_visible(document_type, context):
+    """Return number of public documents and private documents of context user"""
+
+    collection = document_type._get_collection_name()
+    keys = ['{collection}:public'.format(collection=collection)]
+
+    user_id = context.get('user_id', None)
+    if user_id:
+        keys.append('{collection}:private:{owner}'.format(collection=collection, owner=user_id))
+
+    return get_counters_sum(keys)
+
+
+def count_owned(document_type, context, status=None):
+    """Return number of documents of context user, optionally with status"""
+
+    user_id = context.get('user_id', None)
+    if not user_id:
+        return 0
+
+    keys = make_counter_keys(document_type._get_collection_name(), user_id, status)
+
+    return get_counters_sum([keys[1] if status else keys[0]])
+
+
+def compute_counters(document_type):
+    """Return dict of counter key to value computed from counted fields of all documents
+
+    Only counted fields are read, documents are not constructed.
+    """
+
+    owner_path = get_owner_path(document_type)
+    has_public = 'is_public' in document_type._fields
+
+    projection = {'_id': 0, owner_path: 1, 'status': 1}
+    if has_public:
+        projection['is_public'] = 1
+
+    collection = document_type._get_collection()
+    groups = collections.Counter()
+
+    for son in collection.find({}, projection, batch_size=RECONCILE_BATCH_SIZE):
+        owner = son.get('base', {}).get('owner', None) if owner_path == 'base.owner' else son.get('owner', None)
+        is_public = bool(son.get('is_public', False)) if has_public else None
+        groups[(owner, son.get('status', None), is_public)] += 1
+
+    values = {}
+
+    for (owner, status, is_public), number in groups.items():
+        for counter in make_counter_keys(collection.name, owner, status, is_public):
+            values[counter] = values.get(counter, 0) + number
+
+    return values
+
+
+def reconcile_counters(documents=None):
+    """Recompute counters from collections, fixes drift of counters
+
+    Counters are read before documents, a counter is overwritten only if it
+    is not changed since then: $inc of concurrent writes are not lost, such
+    counters are fixed by next reconcile.
+
+    Returns:
+        dict of collection name to number of changed counters
+    """
+
+    if documents is None:
+        # documents modules import mixin which imports counters
+        from .dataset import DatasetMetadata
+        from .architecture import ArchitectureMetadata
+        from .model import ModelMetadata
+        from .task import TaskMetadata
+
+        documents = [DatasetMetadata, ArchitectureMetadata, ModelMetadata, TaskMetadata]
+
+    report = {}
+
+    for document_type in documents:
+        collection_name = document_type._get_collection_name()
+
+        prefix = '^{collection}:'.format(collection=collection_name)
+        current = {counter['_id']: counter['value'] for counter in Counter._get_collection().find({'_id': {'$regex': prefix}})}
+
+        values = compute_counters(document_type)
+        operations = []
+
+        for key, value in values.items():
+            if key not in current:
+                # counter created by concurrent write is kept
+                operations.append(UpdateOne({'_id': key}, {'$setOnInsert': {'value': value}}, upsert=True))
+            elif current[key] != value:
+                operations.append(UpdateOne({'_id': key, 'value': current[key]}, {'$set': {'value': value}}))
+
+        for key in current:
+            if key not in values and current[key] != 0:
+                operations.append(UpdateOne({'_id': key, 'value': current[key]}, {'$set': {'value': 0}}))
+
+        changed = 0
+
+        if operations:
+            result = Counter._get_collection().bulk_write(operations, ordered=False)
+            changed = result.modified_count + result.upserted_count
+
+        report[collection_name] = changed
+
+    return report
@@ -5,6 +5,8 @@ from mongoengine import fields
 from mongoengine.queryset.visitor import Q
 
 from .mixin import MetadataMixin
+from .cache import METADATA_CACHE
+from .pagination import paginate
 from .errors import ResourcePublishedException
 
 __all__ = [
@@ -49,18 +51,35 @@ class DatasetBase(EmbeddedDocument):
     shape = fields.ListField(fields.IntField())
 
 
-class DatasetMetadata(Document, MetadataMixin):
+class DatasetMetadata(MetadataMixin, Document):
     id = fields.StringField(primary_key=True, default=lambda: str(uuid.uuid4()))
     url = fields.StringField()
     status = fields.StringField(default=PENDING, choices=DATASET_STATUS_CODES, required=True)
     is_public = fields.BooleanField(default=False)
     hash = fields.StringField()
+    # set once on creation, base.date is changed by upload of file
+    created = fields.LongField()
     base = fields.EmbeddedDocumentField(DatasetBase, default=lambda: DatasetBase())
 
+    date_field = 'created'
+    cached = True
+
     meta = {
         'allow_inheritance': True,
         'db_alias': 'metadata',
-        'collection': 'datasets'
+        'collection': 'datasets',
+        'indexes': [
+            # public datasets
+            ('is_public', 'created', '_id'),
+            # datasets of user
+            ('base.owner', 'is_public', 'created', '_id'),
+            # search
+            {
+                'fields': ['$base.title', '$base.description', '$base.labels'],
+                'weights': {'base.title': 10, 'base.labels': 5, 'base.description': 1},
+                'cls': False
+            }
+        ]
     }
 
     def __init__(self, *args, **kwargs):
@@ -107,20 +126,24 @@ class DatasetMetadata(Document, MetadataMixin):
     from_dict = from_flatten
 
 
-def get_dataset(id, context):
+def get_dataset(id, context, fields=None):
     if not isinstance(id, str):
         raise TypeError('Type of id must be str')
 
     if not isinstance(context, dict):
         raise TypeError('Type of context must be dict')
 
+    if METADATA_CACHE.enabled:
+        # cached document has all fields
+        return DatasetMetadata.from_cache(id, context.get('user_id', None))
+
     if 'user_id' in context and context['user_id']:
         user_id = context['user_id']
         query = Q(id=id) & (Q(base__owner=user_id) | Q(is_public=True))
-        meta = DatasetMetadata.from_id(query)
+        meta = DatasetMetadata.from_id(query, fields=fields)
     else:
         kwargs = {'id': id, 'is_public': True}
-        meta = DatasetMetadata.from_id(**kwargs)
+        meta = DatasetMetadata.from_id(fields=fields, **kwargs)
 
     return meta
 
@@ -166,6 +189,11 @@ def update_dataset(dataset, data, context=None):
     with dataset.save_context():
         dataset.from_flatten(data)
 
+    if 'title' in data or 'category' in data:
+        # model module imports dataset module
+        from .model import sync_dataset_fields
+        sync_dataset_fields(dataset)
+
 
 def delete_dataset(dataset, context=None):
     """Delete dataset by id or directly
@@ -208,7 +236,7 @@ def delete_dataset(dataset, context=None):
     dataset.delete()
 
 
-def get_datasets(context, filter=None):
+def get_datasets(context, filter=None, fields=None):
     if not isinstance(context, dict):
         raise TypeError('Type of context must be dict')
 
@@ -222,14 +250,8 @@ def get_datasets(context, filter=None):
         query = query | (Q(is_public=False) & Q(base__owner=user_id))
 
     metas = DatasetMetadata.objects(query)
+    metas = DatasetMetadata.only_fields(metas, fields)
 
-    if filter:
-        if 'from' in filter:
-            from_ = filter['from']
-            metas = metas.skip(from_)
-
-        if 'number' in filter:
-            number = filter['number']
-            metas = metas.limit(number)
+    metas = paginate(metas, filter)
 
     return metas
@@ -0,0 +1,366 @@
+import asyncio
+import logging
+import threading
+import time
+
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .task import TaskMetadata
+from .summary import PROGRESS_KEYS
+
+__all__ = [
+    'TASK_FEED',
+    'TaskFeed',
+    'Subscription',
+    'get_task_state',
+    'configure_task_feed'
+]
+
+logger = logging.getLogger(__name__)
+
+AUTO = 'auto'
+CHANGE_STREAM = 'change_stream'
+POLL = 'poll'
+
+FEED_SOURCES = [
+    AUTO,
+    CHANGE_STREAM,
+    POLL
+]
+
+DEFAULT_POLL_INTERVAL = 1  # seconds
+
+DELETED = 'deleted'  # state of deleted task
+
+STATE_PROJECTION = dict([('status', 1)] + [('history.' + key, 1) for key in PROGRESS_KEYS])
+
+CHANGE_PIPELINE = [
+    {'$match': {'operationType': {'$in': ['insert', 'update', 'replace', 'delete']}}},
+    # only state fields of looked up document are sent, _id is resume token
+    {'$project': dict([('operationType', 1), ('documentKey', 1)] +
+                      [('fullDocument.' + key, 1) for key in STATE_PROJECTION])}
+]
+
+
+def get_task_state(son):
+    """Return dict of status and progress counters of task document"""
+
+    history = son.get('history', None) or {}
+
+    state = {key: history[key] for key in PROGRESS_KEYS if key in history}
+    state['status'] = son.get('status', None)
+
+    return state
+
+
+def wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Subscription:
+    """Latest state of one task for one subscriber
+
+    States are coalesced: slow subscriber gets only last state, so memory
+    does not grow with number of changes. Subscriber waits in thread by
+    get or on event loop by get_async.
+    """
+
+    def __init__(self, task_id):
+        self.task_id = task_id
+        self._state = None
+        self._condition = threading.Condition()
+        self._waiter = None  # (loop, future) of get_async
+
+    def put(self, state):
+        with self._condition:
+            self._state = state
+            self._condition.notify_all()
+            waiter = self._waiter
+
+        if waiter is not None:
+            loop, future = waiter
+
+            try:
+                loop.call_soon_threadsafe(wake, future)
+            except RuntimeError:
+                # loop is closed
+                pass
+
+    def get(self, timeout=None):
+        """Return new state or None after timeout"""
+
+        with self._condition:
+            if self._state is None:
+                self._condition.wait(timeout)
+
+            state, self._state = self._state, None
+
+            return state
+
+    async def get_async(self, timeout=None):
+        """Return new state or None after timeout, waits without thread"""
+
+        loop = asyncio.get_event_loop()
+        future = None
+
+        with self._condition:
+            if self._state is None:
+                future = loop.create_future()
+                self._waiter = (loop, future)
+
+        if future is not None:
+            try:
+                await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._condition:
+                    self._waiter = None
+
+        with self._condition:
+            state, self._state = self._state, None
+
+            return state
+
+
+class TaskFeed:
+    """Shared feed of task state changes
+
+    One watcher thread per process serves all subscribers: mongo change
+    stream of tasks collection if database supports it (replica set),
+    else one $in query of subscribed tasks per poll interval. Watcher is
+    started by first subscription and stops when nobody is subscribed.
+    """
+
+    def __init__(self, source=AUTO, poll_interval=DEFAULT_POLL_INTERVAL):
+        if source not in FEED_SOURCES:
+            raise ValueError('source of task feed must be one of {sources}'.format(sources=FEED_SOURCES))
+
+        self.source = source
+        self.poll_interval = poll_interval
+
+        self._subscriptions = {}
+        self._states = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stream = None
+        self._generation = 0
+        self.polls = 0
+
+    def subscribe(self, task_id):
+        subscription = Subscription(task_id)
+
+        with self._lock:
+            self._subscriptions.setdefault(task_id, set()).add(subscription)
+
+            # last published state, new states are published only on change
+            state = self._states.get(task_id, None)
+            if state is not None:
+                subscription.put(state)
+
+            if self._thread is None:
+                self._generation += 1
+                self._thread = threading.Thread(target=self.run, args=(self._generation,), name='task-feed', daemon=True)
+                self._thread.start()
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        stream = None
+
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.task_id, set())
+            subscriptions.discard(subscription)
+
+            if not subscriptions:
+                self._subscriptions.pop(subscription.task_id, None)
+                self._states.pop(subscription.task_id, None)
+
+            if not self._subscriptions:
+                # watcher waits for next change, closed stream wakes it
+                stream = self._stream
+
+        if stream is not None:
+            close_stream(stream)
+
+    def subscribed(self):
+        with self._lock:
+            return list(self._subscriptions)
+
+    def publish(self, task_id, state):
+        """Send state to subscribers of task if state is changed"""
+
+        with self._lock:
+            if self._states.get(task_id, None) == state:
+                return
+
+            subscriptions = list(self._subscriptions.get(task_id, ()))
+
+            if subscriptions:
+                self._states[task_id] = state
+
+        for subscription in subscriptions:
+            subscription.put(state)
+
+    def poll(self):
+        """Read states of subscribed tasks with one query"""
+
+        ids = self.subscribed()
+
+        if not ids:
+            return
+
+        sons = TaskMetadata._get_collection().find({'_id': {'$in': ids}}, STATE_PROJECTION)
+        found = set()
+
+        for son in sons:
+            found.add(son['_id'])
+            self.publish(son['_id'], get_task_state(son))
+
+        for task_id in set(ids) - found:
+            self.publish(task_id, DELETED)
+
+        self.polls += 1
+
+    def watch(self, generation=None):
+        """Publish changes of tasks from change stream while somebody is subscribed
+
+        Failed stream is opened again after last change. States of subscribed
+        tasks are polled once stream is open, so changes before it are not missed.
+
+        Raises:
+            OperationFailure - change streams are not supported by database
+            NotImplementedError - collection is not pymongo collection (mongomock)
+        """
+
+        collection = TaskMetadata._get_collection()
+
+        if not isinstance(collection, Collection):
+            raise NotImplementedError('collection does not support change streams')
+
+        resume_token = None
+
+        while True:
+            with self._lock:
+                if not self._subscriptions:
+                    # under lock, so new subscription starts new watcher
+                    if self._generation == generation:
+                        self._thread = None
+
+                    return
+
+            try:
+                stream = collection.watch(CHANGE_PIPELINE, full_document='updateLookup', resume_after=resume_token)
+            except OperationFailure:
+                if resume_token is None:
+                    raise
+
+                # changes after token are lost, states are polled after open
+                logger.warning('Can not resume change stream of tasks')
+                resume_token = None
+                continue
+            except PyMongoError as err:
+                logger.warning('Can not open change stream of tasks: {err}'.format(err=err))
+                time.sleep(self.poll_interval)
+                continue
+
+            with self._lock:
+                active = bool(self._subscriptions)
+
+                if active:
+                    self._stream = stream
+
+            if not active:
+                # last subscriber left while stream was opened
+                close_stream(stream)
+                continue
+
+            try:
+                logger.info('Task feed watches change stream')
+                self.poll()
+
+                for change in stream:
+                    resume_token = change['_id']
+                    task_id = change['documentKey']['_id']
+                    son = change.get('fullDocument', None)
+
+                    deleted = change.get('operationType', None) == 'delete' or not son
+                    self.publish(task_id, DELETED if deleted else get_task_state(son))
+            except PyMongoError as err:
+                logger.warning('Change stream of tasks failed: {err}'.format(err=err))
+                time.sleep(self.poll_interval)
+            finally:
+                with self._lock:
+                    self._stream = None
+
+                close_stream(stream)
+
+    def run(self, generation=None):
+        try:
+            if self.source in (AUTO, CHANGE_STREAM):
+                try:
+                    self.watch(generation)
+                    return
+                except (OperationFailure, NotImplementedError) as err:
+                    if self.source == CHANGE_STREAM:
+                        raise
+
+                    logger.info('Change streams are not supported, task feed polls database: {err}'.format(err=err))
+                    self.source = POLL
+
+            self.run_polling(generation)
+        except Exception as err:
+            logger.error('Task feed stopped: {err}'.format(err=err))
+        finally:
+            # next subscription starts new watcher
+            with self._lock:
+                if self._generation == generation:
+                    self._thread = None
+
+    def run_polling(self, generation=None):
+        while True:
+            with self._lock:
+                if not self._subscriptions:
+                    # under lock, so new subscription starts new poller
+                    if self._generation == generation:
+                        self._thread = None
+
+                    return
+
+            try:
+                self.poll()
+            except Exception as err:
+                logger.warning('Can not poll task states: {err}'.format(err=err))
+
+            time.sleep(self.poll_interval)
+
+
+def close_stream(stream):
+    try:
+        stream.close()
+    except PyMongoError:
+        pass
+
+
+TASK_FEED = TaskFeed()
+
+
+def configure_task_feed(config):
+    """Configure TASK_FEED from task_feed section of metadata config
+
+    Keys:
+        source (str): auto, change_stream or poll, default auto
+        poll_interval (float): seconds between polls of subscribed tasks
+    """
+
+    source = config.get('source', AUTO)
+
+    if source not in FEED_SOURCES:
+        raise ValueError('unknown task feed source {source}'.format(source=source))
+
+    TASK_FEED.source = source
+    TASK_FEED.poll_interval = config.get('poll_interval', DEFAULT_POLL_INTERVAL)
+
+    return TASK_FEED
@@ -0,0 +1,142 @@
+from mongoengine import Document
+from mongoengine import fields
+
+from .task import TaskMetadata
+
+__all__ = [
+    'HistoryBucket',
+    'append_history',
+    'get_history',
+    'get_task_history',
+    'delete_history',
+    'set_progress'
+]
+
+EPOCH = 'epoch'
+BATCH = 'batch'
+
+HISTORY_KINDS = [
+    EPOCH,
+    BATCH
+]
+
+BUCKET_SIZE = 128  # points in bucket
+
+
+class HistoryBucket(Document):
+    """Bucket of consecutive points of task metrics history
+
+    Point is dict of metrics with 'step' key: number of epoch or batch.
+    Points are appended with $push, so bucket is never rewritten.
+    """
+
+    id = fields.StringField(primary_key=True)
+    task = fields.StringField(required=True)
+    kind = fields.StringField(choices=HISTORY_KINDS, required=True)
+    start = fields.LongField(required=True)
+    count = fields.IntField(default=0)
+    points = fields.ListField(fields.DictField())
+
+    meta = {
+        'db_alias': 'metadata',
+        'collection': 'task_history',
+        'indexes': [
+            ('task', 'kind', 'start')
+        ]
+    }
+
+
+def get_bucket_start(step):
+    return step - step % BUCKET_SIZE
+
+
+def append_history(task_id, kind, points):
+    """Append points to task history, one upsert for each touched bucket
+
+    Args:
+        task_id (str): task id
+        kind (str): epoch or batch
+        points (list): dicts of metrics with int 'step' key
+    """
+
+    if kind not in HISTORY_KINDS:
+        raise ValueError('kind must be one of {kinds}'.format(kinds=HISTORY_KINDS))
+
+    buckets = {}
+    for point in points:
+        start = get_bucket_start(point['step'])
+        buckets.setdefault(start, []).append(point)
+
+    collection = HistoryBucket._get_collection()
+
+    for start, bucket_points in sorted(buckets.items()):
+        id = '{task}:{kind}:{start}'.format(task=task_id, kind=kind, start=start)
+
+        collection.update_one(
+            {'_id': id},
+            {
+                '$setOnInsert': {'task': task_id, 'kind': kind, 'start': start},
+                '$push': {'points': {'$each': bucket_points}},
+                '$inc': {'count': len(bucket_points)}
+            },
+            upsert=True)
+
+
+def get_history(task_id, kind, start=0, stop=None):
+    """Return points of task history with start <= step < stop ordered by step"""
+
+    buckets = HistoryBucket.objects(task=task_id, kind=kind, start__gte=get_bucket_start(start))
+
+    if stop is not None:
+        buckets = buckets.filter(start__lt=stop)
+
+    points = []
+
+    for bucket in buckets.order_by('start').only('points').as_pymongo():
+        for point in bucket['points']:
+            step = point['step']
+
+            if step >= start and (stop is None or step < stop):
+                points.append(point)
+
+    points.sort(key=lambda point: point['step'])
+
+    return points
+
+
+def get_task_history(task):
+    """Return task history in format of v0.5: counters and per-epoch lists of metrics"""
+
+    history = dict(task.history)
+
+    if EPOCH in history:
+        # task trained before history collection
+        return history
+
+    epoch_history = {}
+
+    for point in get_history(task.id, EPOCH):
+        for key, value in point.items():
+            if key != 'step':
+                epoch_history.setdefault(key, []).append(value)
+
+    if epoch_history or 'epochs' in history:
+        history[EPOCH] = epoch_history
+
+    return history
+
+
+def delete_history(task_id):
+    """Delete history of task or of list of tasks"""
+
+    if isinstance(task_id, (list, tuple, set)):
+        HistoryBucket.objects(task__in=list(task_id)).delete()
+    else:
+        HistoryBucket.objects(task=task_id).delete()
+
+
+def set_progress(task_id, **counters):
+    """Atomically set progress counters in task history without rewriting of task"""
+
+    update = {'set__history__' + key: value for key, value in counters.items()}
+    TaskMetadata.objects(id=task_id).update_one(**update)
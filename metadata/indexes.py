@@ -0,0 +1,128 @@
+from pymongo.errors import OperationFailure
+
+from .dataset import DatasetMetadata
+from .architecture import ArchitectureMetadata
+from .model import ModelMetadata
+from .task import TaskMetadata
+from .history import HistoryBucket
+from .webhook import WebhookMetadata, WebhookDelivery
+
+__all__ = [
+    'create_indexes',
+    'check_indexes'
+]
+
+DOCUMENTS = [
+    DatasetMetadata,
+    ArchitectureMetadata,
+    ModelMetadata,
+    TaskMetadata,
+    HistoryBucket,
+    WebhookMetadata,
+    WebhookDelivery
+]
+
+ID_INDEX = '_id_'
+
+
+def normalize_key(key):
+    """Return index key as tuple of (field, direction) pairs"""
+
+    return tuple((field, int(direction) if isinstance(direction, float) else direction) for field, direction in key)
+
+
+def normalize_text_key(key):
+    """Return key of text index as mongo stores it: text fields are replaced by _fts, _ftsx"""
+
+    normalized = []
+
+    for field, direction in key:
+        if direction == 'text':
+            if ('_fts', 'text') not in normalized:
+                normalized.extend([('_fts', 'text'), ('_ftsx', 1)])
+        else:
+            normalized.append((field, direction))
+
+    return tuple(normalized)
+
+
+def get_declared_indexes(document):
+    """Return keys of indexes declared in document meta"""
+
+    return [normalize_text_key(normalize_key(spec['fields'])) for spec in document._meta['index_specs']]
+
+
+def get_existing_indexes(document):
+    """Return dict of index name to key of indexes existing in collection"""
+
+    collection = document._get_collection()
+    info = collection.index_information()
+
+    return {name: normalize_key(index['key']) for name, index in info.items() if name != ID_INDEX}
+
+
+def get_index_usage(document):
+    """Return dict of index name to number of operations since server start
+
+    Returns None if server does not support $indexStats.
+    """
+
+    collection = document._get_collection()
+
+    try:
+        stats = collection.aggregate([{'$indexStats': {}}])
+        return {stat['name']: stat['accesses']['ops'] for stat in stats}
+    except (OperationFailure, NotImplementedError):
+        return None
+
+
+def compare_indexes(declared, existing, usage=None):
+    """Compare declared indexes with existing
+
+    Args:
+        declared (list): keys of declared indexes
+        existing (dict): index name to key of existing indexes
+        usage (None or dict): index name to number of operations
+
+    Returns:
+        dict with lists of missing keys, extra and unused index names
+    """
+
+    existing_keys = set(existing.values())
+    declared_keys = set(declared)
+
+    missing = [key for key in declared if key not in existing_keys]
+    extra = sorted(name for name, key in existing.items() if key not in declared_keys)
+
+    unused = []
+    if usage is not None:
+        unused = sorted(name for name, ops in usage.items() if name != ID_INDEX and not ops)
+
+    return {
+        'missing': missing,
+        'extra': extra,
+        'unused': unused
+    }
+
+
+def create_indexes(documents=None):
+    """Create indexes declared in documents meta, existing indexes are not changed"""
+
+    for document in documents or DOCUMENTS:
+        document.ensure_indexes()
+
+
+def check_indexes(documents=None):
+    """Return report of missing, extra and unused indexes for each collection"""
+
+    report = {}
+
+    for document in documents or DOCUMENTS:
+        declared = get_declared_indexes(document)
+        existing = get_existing_indexes(document)
+        usage = get_index_usage(document)
+
+        collection_name = document._get_collection_name()
+        report[collection_name] = compare_indexes(declared, existing, usage)
+
+    return report
@@ -1,15 +1,140 @@
 import contextlib
+import time
+
+from . import counters
+from .cache import METADATA_CACHE
+
+NOT_SAVED = object()
 
 
 class MetadataMixin:
+    # field of creation date, documents are paginated in (date, id) order
+    date_field = 'date'
+
+    # documents are read through METADATA_CACHE by get_* functions
+    cached = False
+
     @classmethod
-    def from_id(cls, *args, **kwargs):
-        return cls.objects.get(*args, class_check=False, **kwargs)
+    def from_id(cls, *args, fields=None, **kwargs):
+        objects = cls.only_fields(cls.objects, fields)
+        return objects.get(*args, class_check=False, **kwargs)
 
     @classmethod
     def all_from_id(cls, *args, **kwargs):
         return cls.objects(*args, class_check=False, **kwargs)
 
+    @classmethod
+    def get_field_paths(cls, names):
+        """Return paths of document fields for names of flatten representation
+
+        Raises:
+            ValueError - unknown field name
+        """
+
+        base = cls._fields.get('base', None)
+        base_fields = base.document_type._fields if base else {}
+
+        paths = []
+
+        for name in names:
+            if name in base_fields:
+                paths.append('base.' + name)
+            elif name in cls._fields and name != 'base':
+                paths.append(name)
+            else:
+                raise ValueError('unknown field {name}'.format(name=name))
+
+        return paths
+
+    @classmethod
+    def from_cache(cls, id, user_id=None):
+        """Return document visible for user from METADATA_CACHE
+
+        Raises:
+            DoesNotExist - document does not exist or is not visible
+        """
+
+        meta = METADATA_CACHE.get(cls, id)
+
+        if meta is not None:
+            owner = meta.base.owner if 'base' in cls._fields else meta.owner
+
+            if meta.is_public or (user_id and owner == user_id):
+                return meta
+
+        raise cls.DoesNotExist('{name} matching query does not exist.'.format(name=cls._class_name))
+
+    @classmethod
+    def only_fields(cls, metas, fields=None):
+        """Load only listed fields of flatten representation, id and date are loaded always"""
+
+        if not fields:
+            return metas
+
+        paths = cls.get_field_paths(fields)
+        paths = set(paths) | {'id', cls.date_field}
+
+        return metas.only(*paths)
+
+    @classmethod
+    def _from_son(cls, son, _auto_dereference=True, only_fields=None, created=False):
+        document = super()._from_son(son, _auto_dereference, only_fields, created)
+
+        # counted fields of partially loaded document are unknown
+        document._counter_keys = None if only_fields else counters.get_counter_keys(document)
+
+        return document
+
+    def clean(self):
+        self.set_created()
+
+    def set_created(self):
+        """Set created field of new document once, date of base is used if it is set"""
+
+        if 'created' not in self._fields or self.created is not None:
+            return
+
+        # documents loaded from database have keys
+        if getattr(self, '_counter_keys', NOT_SAVED) is not NOT_SAVED:
+            return
+
+        base = getattr(self, 'base', None)
+        self.created = (base.date if base is not None else None) or int(time.time())
+
+    def save(self, *args, **kwargs):
+        """Save document and update counters if document is created or counted fields are changed"""
+
+        # documents loaded from database have keys, _created is not used: it is reset by setting of id
+        old_keys = getattr(self, '_counter_keys', NOT_SAVED)
+
+        result = super().save(*args, **kwargs)
+
+        new_keys = counters.get_counter_keys(self)
+
+        if old_keys is NOT_SAVED:
+            counters.change_counters(counters.get_deltas(added=new_keys))
+        elif old_keys is not None and old_keys != new_keys:
+            counters.change_counters(counters.get_deltas(old_keys, new_keys))
+
+        self._counter_keys = new_keys
+
+        if self.cached:
+            METADATA_CACHE.invalidate(self._get_collection_name(), self.id)
+
+        return result
+
+    def delete(self, *args, **kwargs):
+        keys = getattr(self, '_counter_keys', None)
+
+        super().delete(*args, **kwargs)
+
+        if keys is not None:
+            counters.change_counters(counters.get_deltas(removed=keys))
+            self._counter_keys = None
+
+        if self.cached:
+            METADATA_CACHE.invalidate(self._get_collection_name(), self.id)
+
     @contextlib.contextmanager
     def save_context(self):
         """Save all changes in metadata does in context manager"""
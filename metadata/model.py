@@ -1,12 +1,17 @@
+import itertools
 import uuid
 
 from mongoengine import Document, EmbeddedDocument
 from mongoengine import fields
 from mongoengine.queryset.visitor import Q
+from pymongo import UpdateOne
 
-from .dataset import DatasetMetadata
-from .architecture import ArchitectureMetadata
+from .dataset import DatasetMetadata, DATASET_CATEGORIES, get_datasets
+from .architecture import ArchitectureMetadata, get_architectures
 from .mixin import MetadataMixin
+from .cache import METADATA_CACHE
+from .pagination import paginate
+from .raw import flatten_all
 from .errors import ResourcePublishedException
 
 __all__ = [
@@ -14,7 +19,9 @@ __all__ = [
     'get_model',
     'get_models',
     'update_model',
-    'delete_model'
+    'delete_model',
+    'expand_references',
+    'fill_copied_fields'
 ]
 
 PENDING = 'PENDING'
@@ -25,6 +32,8 @@ READY = 'READY'
 FAILURE = 'FAILURE'
 PUBLISHED = 'PUBLISHED'
 
+FILL_BATCH_SIZE = 1000  # models per $in query of fill_copied_fields
+
 MODEL_STATUS_CODES = [
     PENDING,
     INITIALIZE,
@@ -50,27 +59,59 @@ class ModelBase(EmbeddedDocument):
     # TODO: parent = fields.ReferenceField(Model)
     shape = fields.ListField(field=fields.IntField())
 
-    # category = fields.StringField()
+    # copies of referenced documents fields, kept in sync on update
+    category = fields.StringField(choices=DATASET_CATEGORIES)
+    dataset_title = fields.StringField()
+    architecture_title = fields.StringField()
+
+    def denormalize(self):
+        """Copy shown fields of dataset and architecture if references are changed"""
 
-    @property
-    def category(self):
-        """Return category from dataset"""
+        changed = getattr(self, '_changed_fields', None)
 
-        return self.dataset.base.category
+        if changed is None or 'dataset' in changed or self.dataset_title is None:
+            if self.dataset:
+                self.category = self.dataset.base.category
+                self.dataset_title = self.dataset.base.title
 
+        if changed is None or 'architecture' in changed or self.architecture_title is None:
+            if self.architecture:
+                self.architecture_title = self.architecture.title
 
-class ModelMetadata(Document, MetadataMixin):
+
+class ModelMetadata(MetadataMixin, Document):
     id = fields.StringField(primary_key=True, default=lambda: str(uuid.uuid4()))
     url = fields.StringField()
     status = fields.StringField(default=PENDING, choices=MODEL_STATUS_CODES, required=True)
     is_public = fields.BooleanField(default=False)
     hash = fields.StringField()
+    # set once on creation, base.date is changed by upload of file
+    created = fields.LongField()
     base = fields.EmbeddedDocumentField(ModelBase, default=lambda: ModelBase())
 
+    date_field = 'created'
+    cached = True
+
     meta = {
         'allow_inheritance': True,
         'db_alias': 'metadata',
-        'collection': 'models'
+        'collection': 'models',
+        'indexes': [
+            # public models
+            ('is_public', 'created', '_id'),
+            # models of user
+            ('base.owner', 'is_public', 'created', '_id'),
+            ('base.owner', 'status'),
+            # sync of denormalized fields
+            ('base.dataset',),
+            ('base.architecture',),
+            # search
+            {
+                'fields': ['$base.title', '$base.description', '$base.labels'],
+                'weights': {'base.title': 10, 'base.labels': 5, 'base.description': 1},
+                'cls': False
+            }
+        ]
     }
 
     def __init__(self, *args, **kwargs):
@@ -116,21 +157,29 @@ class ModelMetadata(Document, MetadataMixin):
 
     from_dict = from_flatten
 
+    def clean(self):
+        super().clean()
+        self.base.denormalize()
 
-def get_model(id, context):
+
+def get_model(id, context, fields=None):
     if not isinstance(id, str):
         raise TypeError('Type of id must be str')
 
     if not isinstance(context, dict):
         raise TypeError('Type of context must be dict')
 
+    if METADATA_CACHE.enabled:
+        # cached document has all fields
+        return ModelMetadata.from_cache(id, context.get('user_id', None))
+
     if 'user_id' in context and context['user_id']:
         user_id = context['user_id']
         query = Q(id=id) & (Q(base__owner=user_id) | Q(is_public=True))
-        meta = ModelMetadata.from_id(query)
+        meta = ModelMetadata.from_id(query, fields=fields)
     else:
         kwargs = {'id': id, 'is_public': True}
-        meta = ModelMetadata.from_id(**kwargs)
+        meta = ModelMetadata.from_id(fields=fields, **kwargs)
 
     return meta
 
@@ -218,7 +267,7 @@ def delete_model(model, context=None):
     model.delete()
 
 
-def get_models(context, filter=None):
+def get_models(context, filter=None, fields=None):
     if not isinstance(context, dict):
         raise TypeError('Type of context must be dict')
 
@@ -232,14 +281,128 @@ def get_models(context, filter=None):
         query = query | (Q(is_public=False) & Q(base__owner=user_id))
 
     metas = ModelMetadata.objects(query)
+    metas = ModelMetadata.only_fields(metas, fields)
 
-    if filter:
-        if 'from' in filter:
-            from_ = filter['from']
-            metas = metas.skip(from_)
-
-        if 'number' in filter:
-            number = filter['number']
-            metas = metas.limit(number)
+    metas = paginate(metas, filter)
 
     return metas
+
+
+def sync_dataset_fields(dataset):
+    """Update copies of dataset fields in models of dataset"""
+
+    models = ModelMetadata.objects(base__dataset=dataset)
+    if models.update(set__base__category=dataset.base.category, set__base__dataset_title=dataset.base.title):
+        METADATA_CACHE.invalidate(ModelMetadata._get_collection_name())
+
+
+def sync_architecture_fields(architecture):
+    """Update copies of architecture fields in models of architecture"""
+
+    models = ModelMetadata.objects(base__architecture=architecture)
+    if models.update(set__base__architecture_title=architecture.title):
+        METADATA_CACHE.invalidate(ModelMetadata._get_collection_name())
+
+
+def fill_copied_fields():
+    """Fill copies of dataset and architecture fields of models saved before they were added
+
+    Referenced documents of each batch of models are read by one $in query per collection.
+
+    Returns:
+        number of changed models
+    """
+
+    query = {'$or': [{'base.dataset_title': None}, {'base.architecture_title': None}]}
+    projection = {'base.dataset': 1, 'base.architecture': 1}
+
+    models = ModelMetadata._get_collection().find(query, projection, batch_size=FILL_BATCH_SIZE)
+    changed = 0
+
+    while True:
+        batch = list(itertools.islice(models, FILL_BATCH_SIZE))
+        if not batch:
+            break
+
+        changed += fill_copied_fields_batch([(son['_id'], son.get('base', {})) for son in batch])
+
+    if changed:
+        METADATA_CACHE.invalidate(ModelMetadata._get_collection_name())
+
+    return changed
+
+
+def fill_copied_fields_batch(models):
+    """Write copies of referenced fields for (id, raw base) pairs of models"""
+
+    dataset_ids = list({base['dataset'] for _, base in models if base.get('dataset', None)})
+    architecture_ids = list({base['architecture'] for _, base in models if base.get('architecture', None)})
+
+    datasets = DatasetMetadata._get_collection().find({'_id': {'$in': dataset_ids}}, {'base.title': 1, 'base.category': 1})
+    datasets = {son['_id']: son.get('base', {}) for son in datasets}
+
+    architectures = ArchitectureMetadata._get_collection().find({'_id': {'$in': architecture_ids}}, {'title': 1})
+    architectures = {son['_id']: son for son in architectures}
+
+    operations = []
+
+    for id, base in models:
+        update = {}
+
+        dataset = datasets.get(base.get('dataset', None), None)
+        if dataset is not None:
+            update['base.category'] = dataset.get('category', None)
+            update['base.dataset_title'] = dataset.get('title', None)
+
+        architecture = architectures.get(base.get('architecture', None), None)
+        if architecture is not None:
+            update['base.architecture_title'] = architecture.get('title', None)
+
+        if update:
+            operations.append(UpdateOne({'_id': id}, {'$set': update}))
+
+    if operations:
+        ModelMetadata._get_collection().bulk_write(operations, ordered=False)
+
+    return len(operations)
+
+
+EXPANDED_REFERENCES = {
+    'dataset': (get_datasets, ['id', 'title', 'category']),
+    'architecture': (get_architectures, ['id', 'title', 'category'])
+}
+
+
+def expand_references(models, names, context):
+    """Replace ids of referenced documents in flatten models by their fields
+
+    Each reference is resolved by one $in query for all models,
+    documents which are not visible in context are left as ids.
+
+    Args:
+        models (list): flatten models
+        names (list): names of references: dataset, architecture
+        context (dict): context for access to referenced documents
+
+    Returns:
+        list of flatten models
+
+    Raises:
+        KeyError - unknown reference name
+    """
+
+    for name in names:
+        get_documents, keys = EXPANDED_REFERENCES[name]
+
+        ids = list({model[name] for model in models if model.get(name, None)})
+        if not ids:
+            continue
+
+        documents = flatten_all(get_documents(context, fields=keys).filter(id__in=ids))
+        documents = {document['id']: {key: document.get(key, None) for key in keys} for document in documents}
+
+        for model in models:
+            if model.get(name, None) in documents:
+                model[name] = documents[model[name]]
+
+    return models
@@ -0,0 +1,168 @@
+import base64
+import json
+import time
+
+from mongoengine.queryset.visitor import Q
+from pymongo import UpdateOne
+
+from .cache import METADATA_CACHE
+
+__all__ = [
+    'MAX_PAGE_SIZE',
+    'encode_cursor',
+    'decode_cursor',
+    'fill_created'
+]
+
+MAX_PAGE_SIZE = 1000
+
+
+def get_field(meta, path):
+    value = meta
+
+    for name in path.split('.'):
+        value = getattr(value, name)
+
+    return value
+
+
+def encode_cursor(meta, document_type=None):
+    """Return opaque cursor pointing after meta in (date, id) order
+
+    Args:
+        meta (Document or dict): document or its flatten representation
+        document_type (type): type of flatten document, its date_field is used
+    """
+
+    if isinstance(meta, dict):
+        # fields of base are top level in flatten representation
+        name = document_type.date_field.rsplit('.', 1)[-1] if document_type else 'date'
+        key = [meta.get(name, None), meta['id']]
+    else:
+        key = [get_field(meta, meta.date_field), meta.id]
+    data = json.dumps(key, separators=(',', ':')).encode('utf-8')
+
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return (date, id) pair from cursor
+
+    Raises:
+        ValueError - invalid cursor
+    """
+
+    try:
+        data = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        date, id = json.loads(data.decode('utf-8'))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('invalid cursor')
+
+    if not isinstance(date, (int, type(None))) or isinstance(date, bool) or not isinstance(id, str):
+        raise ValueError('invalid cursor')
+
+    return date, id
+
+
+def after_cursor_query(date_field, cursor, descending=False):
+    """Return query of documents after cursor in (date, id) order
+
+    None dates go first in ascending order and last in descending order.
+    """
+
+    date, id = decode_cursor(cursor)
+    field = date_field.replace('.', '__')
+
+    if descending:
+        if date is None:
+            return Q(**{field: None}) & Q(id__lt=id)
+
+        return Q(**{field + '__lt': date}) | (Q(**{field: date}) & Q(id__lt=id)) | Q(**{field: None})
+
+    if date is None:
+        return (Q(**{field: None}) & Q(id__gt=id)) | Q(**{field + '__exists': True, field + '__ne': None})
+
+    return Q(**{field + '__gt': date}) | (Q(**{field: date}) & Q(id__gt=id))
+
+
+def paginate(metas, filter=None, descending=False):
+    """Order metadata by (date, id) and apply page filter
+
+    Filter keys:
+        after (str): cursor of last document of previous page
+        from (int): number of documents to skip, deprecated by after
+        number (int): page size, limited by MAX_PAGE_SIZE
+
+    Raises:
+        ValueError - invalid cursor
+    """
+
+    date_field = metas._document.date_field
+
+    if descending:
+        metas = metas.order_by('-' + date_field, '-id')
+    else:
+        metas = metas.order_by(date_field, 'id')
+
+    if filter:
+        if filter.get('after'):
+            metas = metas.filter(after_cursor_query(date_field, filter['after'], descending))
+
+        metas = limit_page(metas, filter)
+
+    return metas
+
+
+def limit_page(metas, filter):
+    """Apply from and number keys of page filter"""
+
+    if 'from' in filter:
+        from_ = filter['from']
+        metas = metas.skip(from_)
+
+    if 'number' in filter:
+        number = min(filter['number'], MAX_PAGE_SIZE)
+        # limit(0) means no limit in mongo
+        metas = metas.limit(number) if number else metas.none()
+
+    return metas
+
+
+def fill_created(documents=None):
+    """Set created field of documents saved before it was added
+
+    created is copied from base.date, documents without date get current time.
+
+    Args:
+        documents (list): document types with created field, datasets and models by default
+
+    Returns:
+        dict of collection name to number of changed documents
+    """
+
+    if documents is None:
+        # dataset and model modules import pagination module
+        from .dataset import DatasetMetadata
+        from .model import ModelMetadata
+        documents = [DatasetMetadata, ModelMetadata]
+
+    now = int(time.time())
+    report = {}
+
+    for document in documents:
+        collection = document._get_collection()
+        operations = []
+
+        for son in collection.find({'created': None}, {'base.date': 1}):
+            date = (son.get('base') or {}).get('date', None)
+            operations.append(UpdateOne({'_id': son['_id'], 'created': None}, {'$set': {'created': date or now}}))
+
+        if operations:
+            collection.bulk_write(operations, ordered=False)
+
+            if document.cached:
+                METADATA_CACHE.invalidate(document._get_collection_name())
+
+        report[document._get_collection_name()] = len(operations)
+
+    return report
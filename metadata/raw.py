@@ -0,0 +1,83 @@
+__all__ = [
+    'flatten_all'
+]
+
+_flatteners = {}
+
+
+def get_defaults(document_type):
+    """Return (db field, default) pairs of fields which to_mongo fills by default"""
+
+    defaults = []
+
+    for name, field in document_type._fields.items():
+        if field.primary_key or name == 'base' or field.default is None:
+            continue
+
+        defaults.append((field.db_field, field.default))
+
+    return defaults
+
+
+def compile_flattener(document):
+    """Return function which flattens raw pymongo document as document to_dict does
+
+    Defaults are resolved once, so flattening of each row is plain dict operations.
+    """
+
+    defaults = get_defaults(document)
+
+    base = document._fields.get('base', None)
+    base_defaults = get_defaults(base.document_type) if base else None
+
+    # datasets and models set url equal to id in constructor
+    has_url = 'url' in document._fields
+
+    def flatten(son):
+        meta = son
+
+        meta.pop('_cls', None)
+
+        if '_id' in meta:
+            meta['id'] = meta.pop('_id')
+
+            if has_url:
+                meta['url'] = meta['id']
+
+        for key, default in defaults:
+            if key not in meta:
+                meta[key] = default() if callable(default) else default
+
+        if base_defaults is not None:
+            base = meta.pop('base', None) or {}
+
+            for key, default in base_defaults:
+                if key not in base:
+                    base[key] = default() if callable(default) else default
+
+            meta.update(base)
+
+        return meta
+
+    return flatten
+
+
+def get_flattener(document):
+    flatten = _flatteners.get(document, None)
+
+    if flatten is None:
+        flatten = _flatteners[document] = compile_flattener(document)
+
+    return flatten
+
+
+def flatten_all(metas):
+    """Return flatten representations of queryset documents
+
+    Reads raw pymongo documents, mongoengine documents are not constructed.
+    Result is equal to [meta.to_dict() for meta in metas].
+    """
+
+    flatten = get_flattener(metas._document)
+
+    return [flatten(son) for son in metas.as_pymongo()]
@@ -0,0 +1,144 @@
+from mongoengine.queryset.visitor import Q
+
+from .dataset import DatasetMetadata, get_datasets
+from .architecture import ArchitectureMetadata, get_architectures
+from .model import ModelMetadata, get_models
+from .pagination import paginate, limit_page
+
+__all__ = [
+    'SEARCH_FACETS',
+    'SEARCH_SORTS',
+    'search_metadata',
+    'count_facets'
+]
+
+CATEGORY = 'category'
+STATUS = 'status'
+OWNER = 'owner'
+IS_PUBLIC = 'is_public'
+
+SEARCH_FACETS = [
+    CATEGORY,
+    STATUS,
+    OWNER,
+    IS_PUBLIC
+]
+
+DATE = 'date'
+DATE_DESCENDING = '-date'
+RELEVANCE = 'relevance'
+
+SEARCH_SORTS = [
+    DATE,
+    DATE_DESCENDING,
+    RELEVANCE
+]
+
+FACET_LIMIT = 20  # most frequent values of facet
+
+# queries of documents visible to context user
+VISIBLE_QUERIES = {
+    DatasetMetadata: get_datasets,
+    ArchitectureMetadata: get_architectures,
+    ModelMetadata: get_models
+}
+
+
+def get_facet_path(document_type, name):
+    """Return db path of facet field, fields of base are nested"""
+
+    if name not in SEARCH_FACETS:
+        raise ValueError('unknown facet {name}'.format(name=name))
+
+    base = document_type._fields.get('base', None)
+
+    if base is not None and name in base.document_type._fields:
+        return 'base.' + name
+
+    return name
+
+
+def get_query(document_type, context, text=None, facets=None):
+    """Return queryset of visible documents which match text and facet values"""
+
+    metas = VISIBLE_QUERIES[document_type](context)
+
+    for name, value in (facets or {}).items():
+        path = get_facet_path(document_type, name)
+        metas = metas.filter(Q(**{path.replace('.', '__'): value}))
+
+    if text:
+        metas = metas.search_text(text)
+
+    return metas
+
+
+def search_metadata(document_type, context, text=None, facets=None, sort=DATE, filter=None, fields=None):
+    """Search visible datasets, architectures or models
+
+    Args:
+        document_type (type): DatasetMetadata, ArchitectureMetadata or ModelMetadata
+        context (dict): context with optional user_id
+        text (str): words searched in text index of title, description, labels
+        facets (dict): facet name to required value
+        sort (str): date, -date or relevance, relevance needs text
+        filter (dict): page filter, after cursor is used with date sorts only
+        fields (list): loaded fields
+
+    Returns:
+        queryset of documents
+
+    Raises:
+        ValueError - unknown facet or sort, invalid cursor
+    """
+
+    if sort not in SEARCH_SORTS:
+        raise ValueError('sort must be one of {sorts}'.format(sorts=SEARCH_SORTS))
+
+    metas = get_query(document_type, context, text, facets)
+    metas = document_type.only_fields(metas, fields)
+
+    if sort == RELEVANCE:
+        if not text:
+            raise ValueError('relevance sort needs text')
+
+        if filter and filter.get('after'):
+            raise ValueError('cursor can not be used with relevance sort')
+
+        metas = metas.order_by('$text_score', 'id')
+        metas = limit_page(metas, filter) if filter else metas
+    else:
+        metas = paginate(metas, filter, descending=sort == DATE_DESCENDING)
+
+    return metas
+
+
+def count_facets(document_type, context, text=None, facets=None, names=SEARCH_FACETS):
+    """Return numbers of found documents by values of facets
+
+    Counts of facet are computed with other facet values applied, so all
+    values of selected facet are shown. One aggregation per facet.
+
+    Returns:
+        dict of facet name to list of {'value', 'count'} ordered by count
+    """
+
+    facets = facets or {}
+    result = {}
+
+    for name in names:
+        path = get_facet_path(document_type, name)
+        others = {key: value for key, value in facets.items() if key != name}
+        metas = get_query(document_type, context, text, others)
+
+        pipeline = [
+            {'$match': metas._query},
+            {'$group': {'_id': '$' + path, 'count': {'$sum': 1}}},
+            {'$sort': {'count': -1, '_id': 1}},
+            {'$limit': FACET_LIMIT}
+        ]
+
+        groups = document_type._get_collection().aggregate(pipeline)
+        result[name] = [{'value': group['_id'], 'count': group['count']} for group in groups]
+
+    return result
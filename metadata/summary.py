@@ -0,0 +1,223 @@
+import collections
+import threading
+import time
+
+from .dataset import DatasetMetadata
+from .architecture import ArchitectureMetadata
+from .model import ModelMetadata
+from .task import TaskMetadata, PENDING, RECEIVED, STARTED, RETRY
+
+__all__ = [
+    'get_summary'
+]
+
+SUMMARY_TTL = 5  # seconds
+SUMMARY_CACHE_SIZE = 10000  # users
+ACTIVE_TASKS_LIMIT = 100
+
+ACTIVE_TASK_STATUSES = [
+    PENDING,
+    RECEIVED,
+    STARTED,
+    RETRY
+]
+
+# counters of task progress written by worker
+PROGRESS_KEYS = [
+    'epochs',
+    'current_epoch',
+    'batches',
+    'current_batch',
+    'examples',
+    'current_example'
+]
+
+
+class SummaryCache:
+    """Summaries of users for SUMMARY_TTL seconds, oldest are evicted"""
+
+    def __init__(self, size=SUMMARY_CACHE_SIZE, ttl=SUMMARY_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id, None)
+
+            if entry is None or entry[0] < time.time():
+                return None
+
+            return entry[1]
+
+    def set(self, user_id, summary):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._entries[user_id] = (time.time() + self.ttl, summary)
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+SUMMARY_CACHE = SummaryCache()
+
+
+def get_path(document_type, name):
+    """Return db path of field, fields of base are nested, None if document has no field"""
+
+    base = document_type._fields.get('base', None)
+
+    if base is not None and name in base.document_type._fields:
+        return 'base.' + name
+
+    return name if name in document_type._fields else None
+
+
+def group(document_type, user_id, names, size=False):
+    """Return groups of documents of user by values of fields, one $group by compound key
+
+    Missing values are grouped under empty string key.
+
+    Returns:
+        list of {'_id': {name: value}, 'count', 'size'}
+    """
+
+    paths = {name: get_path(document_type, name) for name in names}
+
+    projection = {'_id': 0}
+    projection.update({name: {'$ifNull': ['$' + path, '']} for name, path in paths.items()})
+    accumulators = {'_id': {name: '$' + name for name in paths}, 'count': {'$sum': 1}}
+
+    if size:
+        projection['size'] = {'$ifNull': ['$' + get_path(document_type, 'size'), 0]}
+        accumulators['size'] = {'$sum': '$size'}
+
+    pipeline = [
+        {'$match': {get_path(document_type, 'owner'): user_id}},
+        {'$project': projection},
+        {'$group': accumulators}
+    ]
+
+    return list(document_type._get_collection().aggregate(pipeline))
+
+
+def summarize(document_type, user_id, size=False):
+    """Return total, counts by status and category and size of documents of user"""
+
+    has_category = get_path(document_type, 'category') is not None
+    names = ['status', 'category'] if has_category else ['status']
+
+    groups = group(document_type, user_id, names, size)
+
+    statuses = collections.Counter()
+    categories = collections.Counter()
+
+    for son in groups:
+        key = son['_id']
+
+        if key['status']:
+            statuses[key['status']] += son['count']
+
+        if has_category and key['category']:
+            categories[key['category']] += son['count']
+
+    summary = {
+        'total': sum(son['count'] for son in groups),
+        'status': dict(statuses)
+    }
+
+    if size:
+        summary['size'] = sum(son['size'] for son in groups)
+
+    if has_category:
+        summary['category'] = dict(categories)
+
+    return summary
+
+
+def get_progress(history):
+    """Return fraction of done batches or epochs of task"""
+
+    if history.get('batches'):
+        return history.get('current_batch', 0) / history['batches']
+
+    if history.get('epochs'):
+        return history.get('current_epoch', 0) / history['epochs']
+
+    return 0.0
+
+
+def get_active_tasks(user_id):
+    projection = {'command': 1, 'status': 1, 'date': 1}
+    projection.update({'history.' + key: 1 for key in PROGRESS_KEYS})
+
+    sons = TaskMetadata._get_collection() \
+        .find({'owner': user_id, 'status': {'$in': ACTIVE_TASK_STATUSES}}, projection) \
+        .sort([('date', -1)]) \
+        .limit(ACTIVE_TASKS_LIMIT)
+
+    tasks = []
+
+    for son in sons:
+        history = son.get('history', {})
+        task = {
+            'id': son['_id'],
+            'command': son.get('command', None),
+            'status': son.get('status', None),
+            'date': son.get('date', None),
+            'progress': get_progress(history)
+        }
+        task.update({key: history[key] for key in PROGRESS_KEYS if key in history})
+        tasks.append(task)
+
+    return tasks
+
+
+def compute_summary(user_id):
+    datasets = summarize(DatasetMetadata, user_id, size=True)
+    models = summarize(ModelMetadata, user_id, size=True)
+
+    tasks = summarize(TaskMetadata, user_id)
+    tasks['active'] = get_active_tasks(user_id)
+
+    return {
+        'datasets': datasets,
+        'architectures': summarize(ArchitectureMetadata, user_id),
+        'models': models,
+        'tasks': tasks,
+        'storage': {
+            'datasets': datasets['size'],
+            'models': models['size'],
+            'total': datasets['size'] + models['size']
+        }
+    }
+
+
+def get_summary(context, cached=True):
+    """Return dashboard summary of documents of context user
+
+    Counts by status and category and size of datasets, architectures,
+    models and tasks and progress of active tasks. Summary is cached for
+    SUMMARY_TTL seconds.
+
+    Raises:
+        KeyError - context not contain user_id key
+    """
+
+    user_id = context.get('user_id', None)
+
+    if not user_id:
+        raise KeyError('context must contain user_id key')
+
+    summary = SUMMARY_CACHE.get(user_id) if cached else None
+
+    if summary is None:
+        summary = compute_summary(user_id)
+        SUMMARY_CACHE.set(user_id, summary)
+
+    return summary
@@ -7,6 +7,7 @@ from mongoengine.queryset.visitor import Q
 from mongoengine.errors import DoesNotExist
 
 from .mixin import MetadataMixin
+from .pagination import paginate
 
 __all__ = [
     'TaskMetadata',
@@ -42,8 +43,11 @@ TASK_COMMANDS = [
     MODEL_PREDICT
 ]
 
+NOT_SAVED = object()
+UNKNOWN_STATUS = object()  # status of partially loaded task
 
-class TaskMetadata(Document, MetadataMixin):
+
+class TaskMetadata(MetadataMixin, Document):
     id = fields.StringField(primary_key=True, default=lambda: str(uuid.uuid4()))
     status = fields.StringField(default=PENDING, choices=TASK_STATUS_CODES, required=True)
     owner = fields.StringField(required=True)
@@ -55,9 +59,40 @@ class TaskMetadata(Document, MetadataMixin):
     meta = {
         'allow_inheritance': True,
         'db_alias': 'metadata',
-        'collection': 'tasks'
+        'collection': 'tasks',
+        'indexes': [
+            # tasks of user
+            ('owner', 'date', '_id'),
+            ('owner', 'status', 'command')
+        ]
     }
 
+    @classmethod
+    def _from_son(cls, son, _auto_dereference=True, only_fields=None, created=False):
+        document = super()._from_son(son, _auto_dereference, only_fields, created)
+
+        if only_fields and 'status' not in only_fields:
+            document._saved_status = UNKNOWN_STATUS
+        else:
+            document._saved_status = son.get('status', None)
+
+        return document
+
+    def save(self, *args, **kwargs):
+        """Save task and write webhook deliveries if status is changed"""
+
+        old_status = getattr(self, '_saved_status', NOT_SAVED)
+
+        result = super().save(*args, **kwargs)
+
+        if old_status is not UNKNOWN_STATUS and old_status != self.status:
+            from .webhook import enqueue_task_event
+            enqueue_task_event(self, None if old_status is NOT_SAVED else old_status)
+
+        self._saved_status = self.status
+
+        return result
+
     def to_dict(self):
         meta = self.to_mongo().to_dict()
 
@@ -75,7 +110,7 @@ class TaskMetadata(Document, MetadataMixin):
                 setattr(self, name, meta[name])
 
 
-def get_task(id, context):
+def get_task(id, context, fields=None):
     if not isinstance(id, str):
         raise TypeError('Type of id must be str')
 
@@ -85,14 +120,14 @@ def get_task(id, context):
     if 'user_id' in context and context['user_id']:
         user_id = context['user_id']
         query = Q(id=id) & Q(owner=user_id)
-        meta = TaskMetadata.from_id(query)
+        meta = TaskMetadata.from_id(query, fields=fields)
     else:
         raise DoesNotExist('task does not exists for None user')
 
     return meta
 
 
-def get_tasks(context, filter=None):
+def get_tasks(context, filter=None, fields=None):
     if not isinstance(context, dict):
         raise TypeError('Type of context must be dict')
 
@@ -105,14 +140,8 @@ def get_tasks(context, filter=None):
     user_id = context['user_id']
     query = Q(owner=user_id)
     metas = TaskMetadata.objects(query)
+    metas = TaskMetadata.only_fields(metas, fields)
 
-    if filter:
-        if 'from' in filter:
-            from_ = filter['from']
-            metas = metas.skip(from_)
-
-        if 'number' in filter:
-            number = filter['number']
-            metas = metas.limit(number)
+    metas = paginate(metas, filter)
 
     return metas
@@ -0,0 +1,292 @@
+import datetime
+import secrets
+import time
+import uuid
+
+from mongoengine import Document
+from mongoengine import fields
+from mongoengine.queryset.visitor import Q
+from mongoengine.errors import DoesNotExist
+from pymongo import UpdateOne
+
+from . import task as task_module
+
+__all__ = [
+    'WebhookMetadata',
+    'WebhookDelivery',
+    'get_webhook',
+    'get_webhooks',
+    'get_deliveries',
+    'delete_webhook',
+    'enqueue_task_event',
+    'claim_deliveries',
+    'extend_claim',
+    'mark_delivered',
+    'mark_failed'
+]
+
+# statuses of delivery
+PENDING = 'PENDING'
+DELIVERED = 'DELIVERED'
+FAILED = 'FAILED'
+
+DELIVERY_STATUSES = [
+    PENDING,
+    DELIVERED,
+    FAILED
+]
+
+# task statuses sent by default: "done or failed", revoked tasks are deleted without status
+DEFAULT_EVENTS = [
+    task_module.SUCCESS,
+    task_module.FAILURE
+]
+
+MAX_ATTEMPTS = 8
+RETRY_DELAY = 10  # seconds, doubled after each failed attempt
+MAX_RETRY_DELAY = 3600  # seconds
+CLAIM_TIMEOUT = 60  # seconds, claimed delivery is retried if worker dies, extended before each send
+DELIVERIES_LIMIT = 100
+DELIVERY_EXPIRE = 7 * 24 * 3600  # seconds, delivered and failed deliveries are removed by TTL index
+
+
+def create_secret():
+    return secrets.token_hex(32)
+
+
+class WebhookMetadata(Document):
+    """Callback url of user for status changes of one task or of all tasks of user"""
+
+    id = fields.StringField(primary_key=True, default=lambda: str(uuid.uuid4()))
+    owner = fields.StringField(required=True)
+    url = fields.StringField(required=True)
+    secret = fields.StringField(required=True, default=create_secret)
+    task = fields.StringField(default=None)
+    events = fields.ListField(fields.StringField(choices=task_module.TASK_STATUS_CODES), default=lambda: list(DEFAULT_EVENTS))
+    date = fields.LongField(default=lambda: int(time.time()))
+
+    meta = {
+        'db_alias': 'metadata',
+        'collection': 'webhooks',
+        'indexes': [
+            ('owner', 'task')
+        ]
+    }
+
+    def to_dict(self, secret=False):
+        meta = {
+            'id': self.id,
+            'url': self.url,
+            'task': self.task,
+            'events': list(self.events),
+            'date': self.date
+        }
+
+        if secret:
+            meta['secret'] = self.secret
+
+        return meta
+
+
+class WebhookDelivery(Document):
+    """Outbox of webhook events, written with status change and sent by worker"""
+
+    id = fields.StringField(primary_key=True, default=lambda: str(uuid.uuid4()))
+    webhook = fields.StringField(required=True)
+    owner = fields.StringField(required=True)
+    event = fields.DictField()
+    status = fields.StringField(default=PENDING, choices=DELIVERY_STATUSES)
+    attempts = fields.IntField(default=0)
+    next_attempt = fields.FloatField(default=time.time)
+    claim = fields.StringField(default=None)
+    last_error = fields.StringField(default=None)
+    date = fields.FloatField(default=time.time)
+    # time of delivery or final failure, pending deliveries do not expire
+    finished = fields.DateTimeField(default=None)
+
+    meta = {
+        'db_alias': 'metadata',
+        'collection': 'webhook_deliveries',
+        'indexes': [
+            # due deliveries
+            ('status', 'next_attempt'),
+            ('webhook', 'date'),
+            {'fields': ['finished'], 'expireAfterSeconds': DELIVERY_EXPIRE}
+        ]
+    }
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'event': dict(self.event),
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt': self.next_attempt,
+            'last_error': self.last_error,
+            'date': self.date
+        }
+
+
+def get_webhook(id, context):
+    user_id = context.get('user_id', None)
+
+    if not user_id:
+        raise DoesNotExist('webhook does not exists for None user')
+
+    return WebhookMetadata.objects.get(id=id, owner=user_id)
+
+
+def get_webhooks(context):
+    user_id = context.get('user_id', None)
+
+    if not user_id:
+        raise DoesNotExist('webhook does not exists for None user')
+
+    return WebhookMetadata.objects(owner=user_id).order_by('date', 'id')
+
+
+def get_deliveries(webhook_id, limit=DELIVERIES_LIMIT):
+    """Return last deliveries of webhook"""
+
+    return WebhookDelivery.objects(webhook=webhook_id).order_by('-date').limit(limit)
+
+
+def delete_webhook(webhook):
+    """Delete webhook and its pending deliveries, finished deliveries expire"""
+
+    webhook.delete()
+    WebhookDelivery.objects(webhook=webhook.id, status=PENDING).delete()
+
+
+def enqueue_task_event(task, old_status=None):
+    """Write deliveries of task status change to outbox, one insert for all webhooks
+
+    Returns:
+        number of deliveries
+    """
+
+    webhooks = WebhookMetadata.objects(Q(owner=task.owner) & (Q(task=None) | Q(task=task.id)))
+    webhooks = [webhook for webhook in webhooks if task.status in webhook.events]
+
+    if not webhooks:
+        return 0
+
+    event = {
+        'type': 'task.status',
+        'task': task.id,
+        'command': task.command,
+        'status': task.status,
+        'previous_status': old_status,
+        'date': time.time()
+    }
+
+    deliveries = [WebhookDelivery(webhook=webhook.id, owner=task.owner, event=dict(event, webhook=webhook.id))
+                  for webhook in webhooks]
+
+    WebhookDelivery.objects.insert(deliveries, load_bulk=False)
+
+    return len(deliveries)
+
+
+def claim_deliveries(limit=DELIVERIES_LIMIT, now=None):
+    """Claim due deliveries for sending by this worker
+
+    Claimed deliveries are postponed by CLAIM_TIMEOUT, so other workers do
+    not send them and they are retried if worker dies before marking.
+
+    Returns:
+        list of WebhookDelivery
+    """
+
+    now = time.time() if now is None else now
+    claim = str(uuid.uuid4())
+
+    collection = WebhookDelivery._get_collection()
+
+    due = {'status': PENDING, 'next_attempt': {'$lte': now}}
+    ids = [son['_id'] for son in collection.find(due, {'_id': 1}).sort('next_attempt', 1).limit(limit)]
+
+    if not ids:
+        return []
+
+    due['_id'] = {'$in': ids}
+    collection.update_many(due, {'$set': {'claim': claim, 'next_attempt': now + CLAIM_TIMEOUT}})
+
+    return list(WebhookDelivery.objects(claim=claim, status=PENDING))
+
+
+def get_claimed_filter(deliveries):
+    """Filter of deliveries still claimed by claim of this worker"""
+
+    return {
+        '_id': {'$in': [delivery.id for delivery in deliveries]},
+        'status': PENDING,
+        'claim': deliveries[0].claim
+    }
+
+
+def extend_claim(deliveries, now=None):
+    """Postpone claimed deliveries by CLAIM_TIMEOUT before sending them
+
+    Deliveries claimed again by other worker after claim timeout are
+    not sent twice.
+
+    Returns:
+        list of deliveries still claimed by this worker
+    """
+
+    if not deliveries:
+        return []
+
+    now = time.time() if now is None else now
+    claimed = get_claimed_filter(deliveries)
+
+    collection = WebhookDelivery._get_collection()
+    collection.update_many(claimed, {'$set': {'next_attempt': now + CLAIM_TIMEOUT}})
+
+    # other worker does not claim them after extension
+    kept = {son['_id'] for son in collection.find(claimed, {'_id': 1})}
+
+    return [delivery for delivery in deliveries if delivery.id in kept]
+
+
+def mark_delivered(deliveries):
+    """Mark deliveries sent, deliveries claimed by other worker are not changed"""
+
+    if not deliveries:
+        return
+
+    WebhookDelivery._get_collection().update_many(
+        get_claimed_filter(deliveries),
+        {'$set': {'status': DELIVERED, 'claim': None, 'last_error': None, 'finished': datetime.datetime.utcnow()},
+         '$inc': {'attempts': 1}})
+
+
+def get_retry_delay(attempts):
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def mark_failed(deliveries, error, now=None, retry=True):
+    """Schedule retry of deliveries with exponential backoff, fail after MAX_ATTEMPTS
+
+    Deliveries are failed at once if retry is False.
+    """
+
+    now = time.time() if now is None else now
+    operations = []
+
+    for delivery in deliveries:
+        attempts = delivery.attempts + 1
+        update = {'attempts': attempts, 'claim': None, 'last_error': str(error)}
+
+        if not retry or attempts >= MAX_ATTEMPTS:
+            update['status'] = FAILED
+            update['finished'] = datetime.datetime.utcnow()
+        else:
+            update['next_attempt'] = now + get_retry_delay(attempts)
+
+        claimed = {'_id': delivery.id, 'status': PENDING, 'claim': delivery.claim}
+        operations.append(UpdateOne(claimed, {'$set': update}))
+
+    if operations:
+        WebhookDelivery._get_collection().bulk_write(operations, ordered=False)
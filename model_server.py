@@ -0,0 +1,12 @@
+from gevent import monkey
+monkey.patch_all()
+
+import webapi
+import serving
+
+webapi.init_logging('log-model-server.txt')
+config = serving.from_config('config/serving_config.json')
+api = serving.main(config)
+
+if __name__ == '__main__':
+    serving.serve_forever(api, config)
@@ -0,0 +1,74 @@
+import logging
+import json
+
+import falcon
+
+import metadata
+import storage
+import webapi
+from webapi import serializers
+from .pool import ModelPool, DEFAULT_POOL_SIZE
+from .batcher import BatchScheduler, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_BATCH_DELAY
+from .resources import *
+
+logger = logging.getLogger(__name__)
+
+
+def from_config(config_file=None):
+    if type(config_file) is str:
+        with open(config_file) as f:
+            config = json.load(f)
+    elif type(config_file) is dict:
+        config = config_file
+    elif config_file is None:
+        return {}
+
+    metadata_config = config.get('metadata_config', None)
+    if metadata_config:
+        metadata.from_config(metadata_config)
+
+    storage_config = config.get('storage_config', None)
+    if storage_config:
+        storage.from_config(storage_config)
+
+    return config
+
+
+def main(config):
+    if not type(config) is dict:
+        raise TypeError('type of config must be dict')
+
+    key_file = config['auth_key_file']
+    auth_middleware = webapi.get_auth_middleware(key_file=key_file)
+
+    api = falcon.API(middleware=[auth_middleware])
+    api.set_error_serializer(serializers.falcon_error_serializer)
+
+    pool = ModelPool(config.get('pool_size', DEFAULT_POOL_SIZE))
+    scheduler = BatchScheduler(
+        pool,
+        max_batch_size=config.get('max_batch_size', DEFAULT_MAX_BATCH_SIZE),
+        max_batch_delay=config.get('max_batch_delay', DEFAULT_MAX_BATCH_DELAY))
+
+    BASE = '/api/v1/'
+
+    model_infer_resource = ModelInferResource(scheduler)
+    api.add_route(BASE + 'model/{id}/infer', model_infer_resource)
+
+    serving_metrics_resource = ServingMetricsResource(scheduler)
+    api.add_route(BASE + 'serving/metrics', serving_metrics_resource)
+
+    logger.debug('serving api initialized')
+
+    return api
+
+
+def serve_forever(api, config):
+    from gevent import pywsgi
+
+    host = config['host']
+    port = config['port']
+
+    httpd = pywsgi.WSGIServer((host, port), api)
+    logging.debug('Start model server on {}:{}'.format(host, port))
+    httpd.serve_forever()
@@ -0,0 +1,138 @@
+import logging
+import time
+
+import numpy
+import gevent
+from gevent.event import AsyncResult
+from gevent.queue import Queue, Empty
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_BATCH_DELAY = 0.005  # in seconds
+IDLE_TIMEOUT = 60  # in seconds
+
+
+class InferRequest:
+    def __init__(self, x):
+        self.x = x
+        self.result = AsyncResult()
+
+    def __len__(self):
+        return self.x.shape[0]
+
+
+class ModelBatcher:
+    """Gather requests for one model into batches and run them in one predict"""
+
+    def __init__(self, scheduler, key, model_meta):
+        self.scheduler = scheduler
+        self.key = key
+        self.model_meta = model_meta
+        self.queue = Queue()
+        self.greenlet = gevent.spawn(self.run)
+
+    def submit(self, request):
+        self.queue.put(request)
+
+    def collect(self):
+        """Wait for first request and gather others until batch is full or delay is over"""
+
+        first = self.queue.get(timeout=IDLE_TIMEOUT)
+        batch = [first]
+        rows = len(first)
+
+        deadline = time.time() + self.scheduler.max_batch_delay
+
+        while rows < self.scheduler.max_batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+
+            try:
+                request = self.queue.get(timeout=timeout)
+            except Empty:
+                break
+
+            batch.append(request)
+            rows += len(request)
+
+        return batch
+
+    def run(self):
+        while True:
+            try:
+                batch = self.collect()
+            except Empty:
+                self.scheduler.remove(self.key)
+                logger.debug('Batcher for model {id} stopped'.format(id=self.model_meta.id))
+                return
+
+            self.process(batch)
+
+    def process(self, batch):
+        try:
+            x = numpy.concatenate([request.x for request in batch])
+            y = self.scheduler.pool.predict(self.model_meta, x)
+        except Exception as ex:
+            for request in batch:
+                request.result.set_exception(ex)
+            return
+
+        self.scheduler.batches += 1
+        self.scheduler.batched_requests += len(batch)
+
+        offset = 0
+        for request in batch:
+            request.result.set(y[offset:offset + len(request)])
+            offset += len(request)
+
+
+class BatchScheduler:
+    """Dynamic micro-batching in front of model pool
+
+    Requests for same model and sample shape, received within max_batch_delay,
+    are predicted as one batch up to max_batch_size rows.
+    """
+
+    def __init__(self, pool, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_batch_delay=DEFAULT_MAX_BATCH_DELAY):
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ValueError('max_batch_size must be positive int')
+
+        if max_batch_delay < 0:
+            raise ValueError('max_batch_delay must be greater or equal than 0')
+
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self._batchers = {}
+
+        self.batches = 0
+        self.batched_requests = 0
+
+    def remove(self, key):
+        self._batchers.pop(key, None)
+
+    def predict(self, model_meta, x):
+        if x.ndim < 1 or x.shape[0] == 0:
+            raise ValueError('x must contain at least one sample')
+
+        key = (model_meta.id, x.shape[1:], x.dtype.str)
+
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = ModelBatcher(self, key, model_meta)
+            self._batchers[key] = batcher
+
+        request = InferRequest(x)
+        batcher.submit(request)
+
+        return request.result.get()
+
+    def metrics(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_batch_delay_ms': 1000 * self.max_batch_delay,
+            'batches': self.batches,
+            'batch_size_avg': self.batched_requests / self.batches if self.batches else 0.0
+        }
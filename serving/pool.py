@@ -0,0 +1,166 @@
+import collections
+import logging
+import os
+import time
+
+import numpy
+import tensorflow as tf
+from keras.models import load_model
+
+import storage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 8
+
+
+def get_fingerprint(path):
+    """Return fingerprint of model file which changes when file is rewritten"""
+
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class LoadedModel:
+    """Keras model loaded in own graph and session
+
+    Every model has separate tensorflow graph, so evicted model
+    releases memory when session is closed.
+    """
+
+    def __init__(self, model_id, path):
+        self.model_id = model_id
+        self.path = path
+        self.fingerprint = get_fingerprint(path)
+
+        self.graph = tf.Graph()
+        with self.graph.as_default():
+            self.session = tf.Session(graph=self.graph)
+            with self.session.as_default():
+                self.model = load_model(path)
+                self.model._make_predict_function()
+
+    @property
+    def input_shape(self):
+        return self.model.input_shape
+
+    def warm_up(self):
+        """Run model on zero sample to build and cache predict function"""
+
+        shape = [1] + [dim or 1 for dim in self.input_shape[1:]]
+        self.predict(numpy.zeros(shape, dtype=numpy.float32))
+
+    def predict(self, x, batch_size=32):
+        with self.graph.as_default(), self.session.as_default():
+            return self.model.predict(x, batch_size=batch_size)
+
+    def close(self):
+        self.session.close()
+
+
+class ModelPool:
+    """LRU pool of loaded and warmed models
+
+    Models are keyed by model id and file fingerprint, so retrained model
+    file is loaded again.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE):
+        if not isinstance(size, int) or size < 1:
+            raise ValueError('size of pool must be positive int')
+
+        self.size = size
+        self._models = collections.OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.predictions = 0
+        self.predict_time = 0.0
+        self.predict_time_max = 0.0
+        self.load_time = 0.0
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, model_id):
+        return model_id in self._models
+
+    def get(self, model_meta):
+        """Return loaded model for model metadata"""
+
+        model_id = model_meta.id
+        path = storage.get_model_path(model_meta.url)
+        model = self._models.get(model_id, None)
+
+        if model is not None and model.fingerprint == get_fingerprint(path):
+            self.hits += 1
+            self._models.move_to_end(model_id)
+
+            return model
+
+        if model is not None:
+            self.evict(model_id)
+
+        self.misses += 1
+
+        start = time.time()
+        model = LoadedModel(model_id, path)
+        model.warm_up()
+        self.load_time += time.time() - start
+
+        logger.debug('Model {id} loaded to pool'.format(id=model_id))
+
+        self._models[model_id] = model
+
+        while len(self._models) > self.size:
+            self.evict()
+
+        return model
+
+    def evict(self, model_id=None):
+        """Evict model by id or least recently used model"""
+
+        if model_id is None:
+            model_id, model = self._models.popitem(last=False)
+        else:
+            model = self._models.pop(model_id)
+
+        model.close()
+        self.evictions += 1
+
+        logger.debug('Model {id} evicted from pool'.format(id=model_id))
+
+    def clear(self):
+        while self._models:
+            self.evict()
+
+    def predict(self, model_meta, x):
+        model = self.get(model_meta)
+
+        start = time.time()
+        result = model.predict(x)
+        duration = time.time() - start
+
+        self.predictions += 1
+        self.predict_time += duration
+        self.predict_time_max = max(self.predict_time_max, duration)
+
+        return result
+
+    def metrics(self):
+        requests = self.hits + self.misses
+
+        return {
+            'size': len(self._models),
+            'capacity': self.size,
+            'models': list(self._models),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'predictions': self.predictions,
+            'latency_avg_ms': 1000 * self.predict_time / self.predictions if self.predictions else 0.0,
+            'latency_max_ms': 1000 * self.predict_time_max,
+            'load_time_ms': 1000 * self.load_time
+        }
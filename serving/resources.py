@@ -0,0 +1,132 @@
+import io
+import logging
+
+import numpy
+import falcon
+
+import metadata
+
+__all__ = [
+    'ModelInferResource',
+    'ServingMetricsResource'
+]
+
+logger = logging.getLogger(__name__)
+
+NPY_CONTENT_TYPE = 'application/x-npy'
+JSON_CONTENT_TYPE = 'application/json'
+
+MAX_INFER_SIZE = 16 * 2**20  # in bytes
+
+SERVED_STATUSES = (
+    metadata.model.READY,
+    metadata.model.PUBLISHED
+)
+
+
+def read_tensor(req):
+    if req.content_length and req.content_length > MAX_INFER_SIZE:
+        raise falcon.HTTPRequestEntityTooLarge(
+            title="Request is too large",
+            description="Request size must be less than {size} bytes".format(size=MAX_INFER_SIZE)
+        )
+
+    content_type = (req.content_type or JSON_CONTENT_TYPE).split(';')[0]
+
+    if content_type == NPY_CONTENT_TYPE:
+        try:
+            return numpy.load(io.BytesIO(req.stream.read()), allow_pickle=False)
+        except ValueError:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="Body is not valid npy array"
+            )
+    elif content_type == JSON_CONTENT_TYPE:
+        media = req.media
+
+        if not isinstance(media, dict) or 'x' not in media:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="Body must contain 'x' key"
+            )
+
+        try:
+            return numpy.asarray(media['x'], dtype=numpy.float32)
+        except (ValueError, TypeError):
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="'x' must be numeric array"
+            )
+    else:
+        raise falcon.HTTPUnsupportedMediaType(
+            description="Content type must be {json} or {npy}".format(json=JSON_CONTENT_TYPE, npy=NPY_CONTENT_TYPE)
+        )
+
+
+def write_tensor(req, resp, y):
+    # last of equally preferred types is chosen, json is default for */*
+    if req.client_prefers([NPY_CONTENT_TYPE, JSON_CONTENT_TYPE]) == NPY_CONTENT_TYPE:
+        buffer = io.BytesIO()
+        numpy.save(buffer, y, allow_pickle=False)
+
+        resp.content_type = NPY_CONTENT_TYPE
+        resp.data = buffer.getvalue()
+    else:
+        resp.media = {
+            'y': y.tolist()
+        }
+
+
+class ModelInferResource:
+    auth = {
+        'optional_methods': ['POST']
+    }
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+
+    def on_post(self, req, resp, id):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        try:
+            context = {'user_id': user_id}
+            model_meta = metadata.get_model(id, context)
+        except metadata.DoesNotExist:
+            logger.debug('Model {id} does not exist'.format(id=id))
+
+            raise falcon.HTTPNotFound(
+                title="Model not found",
+                description="Model metadata does not exist"
+            )
+
+        if model_meta.status not in SERVED_STATUSES:
+            raise falcon.HTTPConflict(
+                title="Model is not trained",
+                description="Model must be trained before inference"
+            )
+
+        x = read_tensor(req)
+
+        try:
+            y = self.scheduler.predict(model_meta, x)
+        except ValueError as err:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description=str(err)
+            )
+
+        resp.status = falcon.HTTP_200
+        write_tensor(req, resp, y)
+
+
+class ServingMetricsResource:
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+
+    def on_get(self, req, resp):
+        resp.status = falcon.HTTP_200
+        resp.media = {
+            'pool': self.scheduler.pool.metrics(),
+            'batching': self.scheduler.metrics()
+        }
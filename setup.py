@@ -38,7 +38,7 @@ requires = [
 
 tests_require = [
     'mongoengine==0.15.0',
-    'mongomock==3.9.0',
+    'mongomock==3.15.0',
     'falcon==1.4.1',
     'PyJWT==1.6.0',
     'falcon-auth==1.1.0'
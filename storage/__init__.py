@@ -1,11 +1,14 @@
 import os
 from os import path
 import json
+import hashlib
 
 import h5py
 
 HOME_DIR = 'home'
 
+HASH_CHUNK_SIZE = 2**16  # in bytes
+
 
 def from_config(config_file):
     global HOME_DIR
@@ -52,3 +55,20 @@ def get_model_path(name):
 
 def get_tmp_path(name):
     return path.join(HOME_DIR, 'tmp', name)
+
+
+def get_file_hash(file_path):
+    """Return sha256 hex digest of file content"""
+
+    hash = hashlib.sha256()
+
+    with open(file_path, 'rb') as f:
+        while True:
+            raw = f.read(HASH_CHUNK_SIZE)
+
+            if not raw:
+                break
+
+            hash.update(raw)
+
+    return hash.hexdigest()
@@ -0,0 +1,89 @@
+import concurrent.futures
+import threading
+import time
+import unittest
+from unittest import mock
+
+from mongoengine import connect
+
+import manager
+import metadata
+from manager import task as task_manager
+
+
+class TestStartTask(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+    def tearDown(self):
+        metadata.TaskMetadata.objects.all().delete()
+
+    def test_timeout_in_thread(self):
+        def hanging_send(*args, **kwargs):
+            time.sleep(1)
+
+        errors = []
+
+        def create():
+            try:
+                manager.create_task(metadata.task.MODEL_TRAIN, {}, {'user_id': 'u1'})
+            except RuntimeError as err:
+                errors.append(err)
+
+        # not monkey patched thread, as in asyncio server
+        with mock.patch.object(task_manager, 'CELERY_CONNECTION_TIMEOUT', 0.1), \
+                mock.patch.object(task_manager.app, 'send_task', hanging_send):
+            start = time.time()
+            thread = threading.Thread(target=create)
+            thread.start()
+            thread.join(5)
+
+        self.assertLess(time.time() - start, 0.9)
+        self.assertEqual(len(errors), 1)
+
+        task = metadata.TaskMetadata.objects.get()
+        self.assertEqual(task.status, metadata.task.FAILURE)
+        self.assertEqual(task.history['error'], 'Can not send task')
+
+    def test_queued_publish_is_cancelled(self):
+        executor = concurrent.futures.ThreadPoolExecutor(1)
+        release = threading.Event()
+        executor.submit(release.wait)
+
+        send_task = mock.Mock()
+
+        with mock.patch.object(task_manager, 'CELERY_CONNECTION_TIMEOUT', 0.05), \
+                mock.patch.object(task_manager, 'PUBLISH_EXECUTOR', executor), \
+                mock.patch.object(task_manager.app, 'send_task', send_task):
+            with self.assertRaises(RuntimeError):
+                manager.create_task(metadata.task.MODEL_TRAIN, {}, {'user_id': 'u1'})
+
+            release.set()
+            executor.shutdown()
+
+        send_task.assert_not_called()
+
+    def test_broker_is_not_available(self):
+        def refused_send(*args, **kwargs):
+            raise ConnectionRefusedError(111, 'Connection refused')
+
+        with mock.patch.object(task_manager.app, 'send_task', refused_send):
+            with self.assertRaises(RuntimeError):
+                manager.create_task(metadata.task.MODEL_TRAIN, {}, {'user_id': 'u1'})
+
+    def test_publish_options(self):
+        send_task = mock.Mock()
+
+        with mock.patch.object(task_manager.app, 'send_task', send_task):
+            task = manager.create_task(metadata.task.MODEL_TRAIN, {}, {'user_id': 'u1'})
+
+        kwargs = send_task.call_args[1]
+        self.assertEqual(kwargs['task_id'], task.id)
+        self.assertEqual(kwargs['retry_policy'], task_manager.PUBLISH_RETRY_POLICY)
+
+    def test_connection_retries_are_limited(self):
+        with mock.patch.object(manager.utils.app, 'config_from_object'):
+            manager.utils.from_config({})
+
+        options = manager.utils.app.conf.broker_transport_options
+        self.assertEqual(options['max_retries'], manager.utils.BROKER_CONNECTION_MAX_RETRIES)
@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+from mongoengine import connect
+from pymongo.errors import BulkWriteError
+
+import metadata
+from metadata import bulk
+
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+    def tearDown(self):
+        metadata.ArchitectureMetadata.objects.all().delete()
+        metadata.ModelMetadata.objects.all().delete()
+        metadata.DatasetMetadata.objects.all().delete()
+
+    def create_architecture(self, id, owner='u1'):
+        architecture = metadata.ArchitectureMetadata(id=id, owner=owner, title=id)
+        architecture.architecture = {'layers': []}
+        return architecture
+
+    def test_insert_documents(self):
+        self.create_architecture('a0').save()
+
+        invalid = self.create_architecture('a3')
+        invalid.title = None
+
+        documents = [
+            self.create_architecture('a0'),
+            self.create_architecture('a1'),
+            self.create_architecture('a1'),
+            invalid,
+            self.create_architecture('a2')
+        ]
+
+        results = bulk.insert_documents(documents)
+
+        statuses = [result['status'] for result in results]
+        self.assertEqual(statuses, [bulk.CONFLICT, bulk.CREATED, bulk.CONFLICT, bulk.INVALID, bulk.CREATED])
+        self.assertEqual(metadata.ArchitectureMetadata.objects.count(), 3)
+
+    def test_update_documents_sync_models(self):
+        dataset = metadata.DatasetMetadata()
+        dataset.base.owner = 'u1'
+        dataset.base.title = 'dataset'
+        dataset.save()
+
+        architecture = self.create_architecture('a1')
+        architecture.save()
+
+        model = metadata.ModelMetadata()
+        model.base.owner = 'u1'
+        model.base.title = 'model'
+        model.base.dataset = dataset
+        model.base.architecture = architecture
+        model.save()
+
+        context = {'user_id': 'u1'}
+        results = bulk.update_documents(metadata.ArchitectureMetadata, [('a1', {'title': 'renamed'})], context)
+
+        self.assertEqual(results, [{'id': 'a1', 'status': bulk.UPDATED}])
+
+        model.reload()
+        self.assertEqual(model.base.architecture_title, 'renamed')
+
+    def test_update_documents_write_errors(self):
+        self.create_architecture('a1').save()
+        self.create_architecture('a2').save()
+
+        collection = metadata.ArchitectureMetadata._get_collection()
+        error = BulkWriteError({'writeErrors': [{'index': 1, 'errmsg': 'write failed'}]})
+
+        context = {'user_id': 'u1'}
+        items = [('a1', {'title': 'one'}), ('a2', {'title': 'two'})]
+
+        with mock.patch.object(collection, 'bulk_write', side_effect=error), \
+                mock.patch.object(metadata.ArchitectureMetadata, '_get_collection', return_value=collection):
+            results = bulk.update_documents(metadata.ArchitectureMetadata, items, context)
+
+        self.assertEqual(results, [
+            {'id': 'a1', 'status': bulk.UPDATED},
+            {'id': 'a2', 'status': bulk.FAILED, 'error': 'write failed'}
+        ])
+
+    def test_owner_required(self):
+        with self.assertRaises(KeyError):
+            bulk.delete_documents(metadata.ArchitectureMetadata, ['a1'], {'user_id': None})
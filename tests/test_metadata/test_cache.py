@@ -0,0 +1,139 @@
+import time
+import unittest
+
+from mongoengine import connect
+
+import metadata
+from metadata import cache
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        self.cache = metadata.METADATA_CACHE
+        self.cache.enabled = True
+        self.cache.clear()
+        self.cache.hits = self.cache.misses = 0
+
+    def tearDown(self):
+        self.cache.enabled = False
+        self.cache.clear()
+
+        metadata.DatasetMetadata.objects.all().delete()
+        metadata.ArchitectureMetadata.objects.all().delete()
+        metadata.ModelMetadata.objects.all().delete()
+
+    def create_dataset(self, owner, is_public=False):
+        with metadata.DatasetMetadata().save_context() as dataset:
+            dataset.base.owner = owner
+            dataset.base.title = 'dataset'
+            dataset.is_public = is_public
+
+        return dataset
+
+    def test_read_through(self):
+        dataset = self.create_dataset('u1', is_public=True)
+
+        for user_id in ['u1', 'u2', None]:
+            meta = metadata.get_dataset(dataset.id, {'user_id': user_id})
+            self.assertEqual(meta.base.title, 'dataset')
+
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 2)
+
+        # cached document is copied
+        meta.base.title = 'changed'
+        self.assertEqual(metadata.get_dataset(dataset.id, {'user_id': 'u1'}).base.title, 'dataset')
+
+    def test_visibility(self):
+        dataset = self.create_dataset('u1')
+
+        self.assertEqual(metadata.get_dataset(dataset.id, {'user_id': 'u1'}).id, dataset.id)
+
+        with self.assertRaises(metadata.DoesNotExist):
+            metadata.get_dataset(dataset.id, {'user_id': 'u2'})
+
+        with self.assertRaises(metadata.DoesNotExist):
+            metadata.get_dataset(dataset.id, {'user_id': None})
+
+        with self.assertRaises(metadata.DoesNotExist):
+            metadata.get_dataset('unknown', {'user_id': 'u1'})
+
+    def test_invalidate_on_update_and_delete(self):
+        dataset = self.create_dataset('u1')
+        context = {'user_id': 'u1'}
+
+        metadata.get_dataset(dataset.id, context)
+        metadata.update_dataset(dataset.id, {'title': 'new title'}, context)
+
+        self.assertEqual(metadata.get_dataset(dataset.id, context).base.title, 'new title')
+
+        metadata.delete_dataset(dataset.id, context)
+
+        with self.assertRaises(metadata.DoesNotExist):
+            metadata.get_dataset(dataset.id, context)
+
+    def test_invalidate_models_on_sync(self):
+        dataset = self.create_dataset('u1')
+
+        with metadata.ArchitectureMetadata().save_context() as architecture:
+            architecture.owner = 'u1'
+            architecture.title = 'architecture'
+            architecture.architecture = {'layers': []}
+
+        with metadata.ModelMetadata().save_context() as model:
+            model.base.owner = 'u1'
+            model.base.title = 'model'
+            model.base.dataset = dataset
+            model.base.architecture = architecture
+
+        context = {'user_id': 'u1'}
+        self.assertEqual(metadata.get_model(model.id, context).base.dataset_title, 'dataset')
+
+        metadata.update_dataset(dataset.id, {'title': 'renamed'}, context)
+
+        self.assertEqual(metadata.get_model(model.id, context).base.dataset_title, 'renamed')
+
+    def test_not_store_document_changed_while_read(self):
+        key = ('datasets', 'd1')
+
+        son, version = self.cache.lookup(key)
+        self.cache.drop(key)
+        self.cache.store(key, {'_id': 'd1'}, version)
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache._versions, {})
+
+    def test_ttl_and_lru(self):
+        local_cache = cache.MetadataCache(size=2, ttl=0.05, enabled=True)
+        datasets = [self.create_dataset('u1', is_public=True) for _ in range(3)]
+
+        for dataset in datasets:
+            local_cache.get(metadata.DatasetMetadata, dataset.id)
+
+        self.assertEqual(len(local_cache), 2)
+        self.assertEqual(local_cache.evictions, 1)
+
+        local_cache.get(metadata.DatasetMetadata, datasets[2].id)
+        self.assertEqual(local_cache.hits, 1)
+
+        time.sleep(0.1)
+        local_cache.get(metadata.DatasetMetadata, datasets[2].id)
+        self.assertEqual(local_cache.misses, 4)
+
+    def test_mongo_channel(self):
+        first = cache.MetadataCache(channel=cache.MongoChannel(), poll_interval=0, enabled=True)
+        second = cache.MetadataCache(channel=cache.MongoChannel(), poll_interval=0, enabled=True)
+
+        dataset = self.create_dataset('u1', is_public=True)
+
+        first.get(metadata.DatasetMetadata, dataset.id)
+        second.get(metadata.DatasetMetadata, dataset.id)
+
+        first.invalidate('datasets', dataset.id)
+        self.assertEqual(len(first), 0)
+
+        second.get(metadata.DatasetMetadata, dataset.id)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(second.misses, 2)
@@ -0,0 +1,129 @@
+import unittest
+from unittest import mock
+
+from mongoengine import connect
+
+import metadata
+from metadata import bulk
+from metadata import counters
+
+
+class TestCounters(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+        metadata.Counter.objects.delete()
+
+    def tearDown(self):
+        metadata.DatasetMetadata.objects.all().delete()
+        metadata.TaskMetadata.objects.all().delete()
+        metadata.Counter.objects.delete()
+
+    def create_dataset(self, owner, is_public=False):
+        with metadata.DatasetMetadata().save_context() as dataset:
+            dataset.base.owner = owner
+            dataset.base.title = 'dataset'
+            dataset.is_public = is_public
+
+        return dataset
+
+    def create_task(self, owner):
+        with metadata.TaskMetadata().save_context() as task:
+            task.owner = owner
+            task.command = metadata.task.MODEL_TRAIN
+
+        return task
+
+    def count_datasets(self, user_id):
+        return metadata.count_visible(metadata.DatasetMetadata, {'user_id': user_id})
+
+    def test_create_and_delete(self):
+        d1 = self.create_dataset('u1', is_public=True)
+        self.create_dataset('u1')
+        self.create_dataset('u2')
+
+        self.assertEqual(self.count_datasets('u1'), 2)
+        self.assertEqual(self.count_datasets('u2'), 2)
+        self.assertEqual(self.count_datasets(None), 1)
+
+        # delete of loaded document
+        metadata.DatasetMetadata.objects.get(id=d1.id).delete()
+
+        self.assertEqual(self.count_datasets('u1'), 1)
+        self.assertEqual(self.count_datasets(None), 0)
+
+    def test_change_counted_fields(self):
+        self.create_dataset('u1')
+
+        dataset = metadata.DatasetMetadata.objects.get()
+        dataset.is_public = True
+        dataset.save()
+
+        self.assertEqual(self.count_datasets('u2'), 1)
+
+        # not counted field
+        dataset.base.title = 'new title'
+        dataset.save()
+
+        self.assertEqual(self.count_datasets('u2'), 1)
+        self.assertEqual(self.count_datasets('u1'), 1)
+
+    def test_task_status(self):
+        task = self.create_task('u1')
+        self.create_task('u1')
+
+        with task.save_context():
+            task.status = metadata.task.SUCCESS
+
+        context = {'user_id': 'u1'}
+        self.assertEqual(metadata.count_owned(metadata.TaskMetadata, context), 2)
+        self.assertEqual(metadata.count_owned(metadata.TaskMetadata, context, metadata.task.SUCCESS), 1)
+        self.assertEqual(metadata.count_owned(metadata.TaskMetadata, context, metadata.task.PENDING), 1)
+
+    def test_bulk(self):
+        d1 = self.create_dataset('u1')
+        d2 = self.create_dataset('u1')
+
+        context = {'user_id': 'u1'}
+        bulk.update_documents(metadata.DatasetMetadata, [(d1.id, {'is_public': True})], context)
+        self.assertEqual(self.count_datasets(None), 1)
+
+        bulk.delete_documents(metadata.DatasetMetadata, [d1.id, d2.id], context)
+        self.assertEqual(self.count_datasets('u1'), 0)
+
+    def test_reconcile(self):
+        self.create_dataset('u1', is_public=True)
+        self.create_dataset('u1')
+        self.create_task('u2')
+
+        # queryset delete bypasses counters
+        metadata.TaskMetadata.objects.all().delete()
+        metadata.Counter.objects(id='datasets:public').update(set__value=10)
+
+        report = metadata.reconcile_counters()
+
+        self.assertEqual(report['datasets'], 1)
+        self.assertEqual(report['tasks'], 2)
+        self.assertEqual(self.count_datasets('u1'), 2)
+        self.assertEqual(metadata.count_owned(metadata.TaskMetadata, {'user_id': 'u2'}), 0)
+
+        self.assertEqual(metadata.reconcile_counters(), {'datasets': 0, 'architectures': 0, 'models': 0, 'tasks': 0})
+
+    def test_reconcile_keeps_concurrent_changes(self):
+        self.create_dataset('u1', is_public=True)
+        metadata.Counter.objects(id='datasets:public').update(set__value=10)
+        metadata.Counter.objects(id='datasets:owner:u1').delete()
+
+        compute_counters = counters.compute_counters
+
+        def compute_with_write(document_type):
+            values = compute_counters(document_type)
+            # datasets are created while collection is read
+            counters.change_counters({'datasets:public': 1, 'datasets:owner:u1': 2})
+            return values
+
+        with mock.patch.object(counters, 'compute_counters', compute_with_write):
+            report = metadata.reconcile_counters([metadata.DatasetMetadata])
+
+        self.assertEqual(report, {'datasets': 0})
+        self.assertEqual(metadata.Counter.objects.get(id='datasets:public').value, 11)
+        self.assertEqual(metadata.Counter.objects.get(id='datasets:owner:u1').value, 2)
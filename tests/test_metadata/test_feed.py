@@ -0,0 +1,253 @@
+import asyncio
+import queue
+import threading
+import time
+import unittest
+import uuid
+from unittest import mock
+
+from mongoengine import connect
+from pymongo.errors import AutoReconnect
+
+import metadata
+from metadata import feed
+
+
+class TestSubscription(unittest.TestCase):
+    def test_coalesce(self):
+        subscription = feed.Subscription('t1')
+        subscription.put({'status': 'PENDING'})
+        subscription.put({'status': 'STARTED'})
+
+        self.assertEqual(subscription.get(0), {'status': 'STARTED'})
+        self.assertIsNone(subscription.get(0.01))
+
+    def test_get_async(self):
+        subscription = feed.Subscription('t1')
+        loop = asyncio.new_event_loop()
+
+        try:
+            self.assertIsNone(loop.run_until_complete(subscription.get_async(0.01)))
+
+            # state put by other thread wakes waiting coroutine
+            timer = threading.Timer(0.05, subscription.put, [{'status': 'STARTED'}])
+            timer.start()
+
+            start = time.time()
+            state = loop.run_until_complete(subscription.get_async(5))
+            timer.join()
+
+            self.assertEqual(state, {'status': 'STARTED'})
+            self.assertLess(time.time() - start, 1)
+            self.assertIsNone(subscription._waiter)
+
+            subscription.put({'status': 'SUCCESS'})
+            self.assertEqual(loop.run_until_complete(subscription.get_async(0)), {'status': 'SUCCESS'})
+        finally:
+            loop.close()
+
+
+class FakeStream:
+    """Change stream which yields queued changes or raises queued errors until closed"""
+
+    def __init__(self, *changes):
+        self.changes = queue.Queue()
+        self.closed = threading.Event()
+
+        for change in changes:
+            self.changes.put(change)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self.closed.is_set():
+            try:
+                change = self.changes.get(timeout=0.01)
+            except queue.Empty:
+                continue
+
+            if isinstance(change, Exception):
+                raise change
+
+            return change
+
+        raise StopIteration
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeCollection:
+    def __init__(self, collection, streams):
+        self.collection = collection
+        self.streams = list(streams)
+        self.resume_tokens = []
+
+    def watch(self, pipeline, full_document=None, resume_after=None):
+        self.resume_tokens.append(resume_after)
+        return self.streams.pop(0)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+class TestTaskFeed(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+        self.feed = feed.TaskFeed(source=feed.POLL, poll_interval=0.01)
+
+    def tearDown(self):
+        metadata.TaskMetadata.objects.all().delete()
+
+    def create_task(self, status=metadata.task.PENDING, history=None):
+        with metadata.TaskMetadata().save_context() as task:
+            task.id = str(uuid.uuid4())
+            task.owner = 'u1'
+            task.command = metadata.task.MODEL_TRAIN
+            task.status = status
+            task.history = history or {}
+
+        return task
+
+    def wait(self, subscription, timeout=2):
+        state = subscription.get(timeout)
+        self.assertIsNotNone(state)
+        return state
+
+    def test_get_task_state(self):
+        son = {'status': 'STARTED', 'history': {'epochs': 10, 'current_epoch': 2, 'loss': [1.0]}}
+
+        self.assertEqual(feed.get_task_state(son), {'status': 'STARTED', 'epochs': 10, 'current_epoch': 2})
+
+    def test_publish_changed(self):
+        subscription = feed.Subscription('t1')
+        self.feed._subscriptions['t1'] = {subscription}
+
+        self.feed.publish('t1', {'status': 'PENDING'})
+        self.feed.publish('t1', {'status': 'PENDING'})
+        self.feed.publish('t2', {'status': 'PENDING'})
+
+        self.assertEqual(subscription.get(0), {'status': 'PENDING'})
+        self.assertIsNone(subscription.get(0))
+
+    def test_one_query_for_subscribers(self):
+        task = self.create_task()
+        subscriptions = [self.feed.subscribe(task.id) for _ in range(3)]
+
+        for subscription in subscriptions:
+            self.assertEqual(self.wait(subscription), {'status': metadata.task.PENDING})
+
+        metadata.set_progress(task.id, epochs=10, current_epoch=1)
+
+        for subscription in subscriptions:
+            self.assertEqual(self.wait(subscription), {'status': metadata.task.PENDING, 'epochs': 10, 'current_epoch': 1})
+
+        for subscription in subscriptions:
+            self.feed.unsubscribe(subscription)
+
+        self.assertEqual(self.feed.subscribed(), [])
+
+    def test_deleted(self):
+        task = self.create_task()
+        subscription = self.feed.subscribe(task.id)
+        self.wait(subscription)
+
+        task.delete()
+
+        self.assertEqual(self.wait(subscription), feed.DELETED)
+        self.feed.unsubscribe(subscription)
+
+    def test_poller_stops_without_subscribers(self):
+        task = self.create_task()
+        subscription = self.feed.subscribe(task.id)
+        self.wait(subscription)
+        self.feed.unsubscribe(subscription)
+
+        for _ in range(100):
+            if self.feed._thread is None:
+                break
+            time.sleep(0.01)
+
+        self.assertIsNone(self.feed._thread)
+
+        # new subscription starts poller again
+        subscription = self.feed.subscribe(task.id)
+        self.assertEqual(self.wait(subscription), {'status': metadata.task.PENDING})
+        self.feed.unsubscribe(subscription)
+
+    def test_auto_falls_back_to_polling(self):
+        self.feed.source = feed.AUTO
+
+        task = self.create_task()
+        subscription = self.feed.subscribe(task.id)
+
+        self.assertEqual(self.wait(subscription), {'status': metadata.task.PENDING})
+        self.assertEqual(self.feed.source, feed.POLL)
+        self.feed.unsubscribe(subscription)
+
+    def test_configure(self):
+        with self.assertRaises(ValueError):
+            feed.configure_task_feed({'source': 'broker'})
+
+
+    def watch(self, *streams):
+        collection = FakeCollection(metadata.TaskMetadata._get_collection(), streams)
+        self.feed.source = feed.CHANGE_STREAM
+
+        patches = [
+            mock.patch.object(feed, 'Collection', FakeCollection),
+            mock.patch.object(metadata.TaskMetadata, '_get_collection', return_value=collection)
+        ]
+
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        return collection
+
+    def change(self, token, task, status):
+        return {'_id': token, 'operationType': 'update', 'documentKey': {'_id': task.id},
+                'fullDocument': {'status': status}}
+
+    def test_change_stream_polls_after_open(self):
+        # final status is saved before stream is open
+        task = self.create_task(status=metadata.task.SUCCESS)
+        stream = FakeStream()
+        self.watch(stream)
+
+        subscription = self.feed.subscribe(task.id)
+
+        self.assertEqual(self.wait(subscription), {'status': metadata.task.SUCCESS})
+        self.feed.unsubscribe(subscription)
+
+    def test_change_stream_resumed_after_error(self):
+        task = self.create_task()
+        first = FakeStream(self.change('r1', task, metadata.task.PENDING), AutoReconnect('failover'))
+        second = FakeStream(self.change('r2', task, metadata.task.SUCCESS))
+        collection = self.watch(first, second)
+
+        subscription = self.feed.subscribe(task.id)
+
+        self.assertEqual(self.wait(subscription), {'status': metadata.task.PENDING})
+        self.assertEqual(self.wait(subscription), {'status': metadata.task.SUCCESS})
+        self.assertEqual(collection.resume_tokens, [None, 'r1'])
+        self.assertTrue(first.closed.is_set())
+        self.feed.unsubscribe(subscription)
+
+    def test_change_stream_closed_without_subscribers(self):
+        task = self.create_task()
+        stream = FakeStream()
+        self.watch(stream)
+
+        subscription = self.feed.subscribe(task.id)
+        self.wait(subscription)
+        self.feed.unsubscribe(subscription)
+
+        for _ in range(100):
+            if self.feed._thread is None:
+                break
+            time.sleep(0.01)
+
+        self.assertTrue(stream.closed.is_set())
+        self.assertIsNone(self.feed._thread)
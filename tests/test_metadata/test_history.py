@@ -0,0 +1,60 @@
+import unittest
+
+from mongoengine import connect
+
+import metadata
+from metadata import history
+
+
+class TestTaskHistory(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        self.task = metadata.TaskMetadata()
+        self.task.owner = 'u1'
+        self.task.command = metadata.task.MODEL_TRAIN
+        self.task.history = {'epochs': 3}
+        self.task.save()
+
+    def tearDown(self):
+        metadata.TaskMetadata.objects.all().delete()
+        metadata.HistoryBucket.objects.all().delete()
+
+    def test_append_to_buckets(self):
+        size = history.BUCKET_SIZE
+        points = [{'step': step, 'loss': float(step)} for step in range(size * 2 + 1)]
+
+        # append in parts crossing bucket boundaries
+        history.append_history(self.task.id, history.BATCH, points[:size - 1])
+        history.append_history(self.task.id, history.BATCH, points[size - 1:])
+
+        buckets = metadata.HistoryBucket.objects(task=self.task.id).order_by('start')
+        self.assertEqual([bucket.count for bucket in buckets], [size, size, 1])
+
+        self.assertEqual(history.get_history(self.task.id, history.BATCH), points)
+        self.assertEqual(history.get_history(self.task.id, history.BATCH, size - 2, size + 2), points[size - 2:size + 2])
+        self.assertEqual(history.get_history(self.task.id, history.EPOCH), [])
+
+    def test_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            history.append_history(self.task.id, 'unknown', [{'step': 0}])
+
+    def test_task_history(self):
+        history.append_history(self.task.id, history.EPOCH, [{'step': 0, 'loss': 2.0}, {'step': 1, 'loss': 1.0}])
+        history.set_progress(self.task.id, current_epoch=2)
+
+        task = metadata.TaskMetadata.objects.get(id=self.task.id)
+        self.assertEqual(history.get_task_history(task), {
+            'epochs': 3,
+            'current_epoch': 2,
+            'epoch': {'loss': [2.0, 1.0]}
+        })
+
+        history.delete_history(self.task.id)
+        self.assertEqual(metadata.HistoryBucket.objects(task=self.task.id).count(), 0)
+
+    def test_legacy_task_history(self):
+        self.task.history = {'epochs': 1, 'epoch': {'loss': [1.0]}}
+        self.task.save()
+
+        self.assertEqual(history.get_task_history(self.task), self.task.history)
@@ -0,0 +1,69 @@
+import unittest
+
+from mongoengine import connect
+
+import metadata
+from metadata import indexes
+
+
+class TestIndexes(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+    def test_declared_indexes(self):
+        declared = indexes.get_declared_indexes(metadata.DatasetMetadata)
+
+        self.assertIn((('_cls', 1), ('is_public', 1), ('created', 1), ('_id', 1)), declared)
+        self.assertIn((('_cls', 1), ('base.owner', 1), ('is_public', 1), ('created', 1), ('_id', 1)), declared)
+
+    def test_all_collections_declare_indexes(self):
+        for document in indexes.DOCUMENTS:
+            self.assertTrue(indexes.get_declared_indexes(document), document)
+
+    def test_compare_indexes(self):
+        declared = [
+            (('owner', 1), ('date', 1)),
+            (('owner', 1), ('status', 1))
+        ]
+        existing = {
+            'owner_1_date_1': (('owner', 1), ('date', 1)),
+            'title_1': (('title', 1),)
+        }
+        usage = {
+            '_id_': 0,
+            'owner_1_date_1': 10,
+            'title_1': 0
+        }
+
+        result = indexes.compare_indexes(declared, existing, usage)
+
+        self.assertEqual(result['missing'], [(('owner', 1), ('status', 1))])
+        self.assertEqual(result['extra'], ['title_1'])
+        self.assertEqual(result['unused'], ['title_1'])
+
+    def test_compare_indexes_no_usage(self):
+        declared = [(('owner', 1),)]
+        existing = {'owner_1': (('owner', 1),)}
+
+        result = indexes.compare_indexes(declared, existing)
+
+        self.assertEqual(result, {'missing': [], 'extra': [], 'unused': []})
+
+    def test_normalize_key(self):
+        key = indexes.normalize_key([('owner', 1.0), ('title', 'text')])
+
+        self.assertEqual(key, (('owner', 1), ('title', 'text')))
+
+    def test_text_index_key(self):
+        declared = indexes.get_declared_indexes(metadata.DatasetMetadata)
+
+        self.assertIn((('_fts', 'text'), ('_ftsx', 1)), declared)
+        self.assertEqual(indexes.normalize_text_key((('owner', 1), ('title', 'text'), ('description', 'text'))),
+                         (('owner', 1), ('_fts', 'text'), ('_ftsx', 1)))
+
+    def test_create_and_check_indexes(self):
+        metadata.create_indexes()
+        report = metadata.check_indexes()
+
+        self.assertEqual(set(report), {'datasets', 'architectures', 'models', 'tasks', 'task_history',
+                                       'webhooks', 'webhook_deliveries'})
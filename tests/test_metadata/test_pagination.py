@@ -0,0 +1,129 @@
+import unittest
+import uuid
+
+from mongoengine import connect
+
+import metadata
+
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+    def tearDown(self):
+        metadata.TaskMetadata.objects.all().delete()
+        metadata.DatasetMetadata.objects.all().delete()
+
+    def create_task(self, date):
+        task = metadata.TaskMetadata()
+        task.id = str(uuid.uuid4())
+        task.owner = 'u1'
+        task.command = metadata.task.MODEL_TRAIN
+        task.date = date
+        task.save()
+
+        return task
+
+    def get_all_pages(self, number):
+        context = {'user_id': 'u1'}
+        filter = {'number': number}
+        tasks = []
+
+        while True:
+            page = list(metadata.get_tasks(context, filter))
+            tasks += page
+
+            if len(page) < number:
+                return tasks
+
+            filter['after'] = metadata.encode_cursor(page[-1])
+
+    def test_cursor_order(self):
+        tasks = [self.create_task(date) for date in [3, 1, 2, 1, 3, 2, 1]]
+        expected = sorted(tasks, key=lambda task: (task.date, task.id))
+
+        for number in [1, 2, 3, 10]:
+            received = self.get_all_pages(number)
+            self.assertEqual([task.id for task in received], [task.id for task in expected])
+
+    def test_cursor_none_date(self):
+        datasets = []
+        for date in [2, None, 1, None, 2]:
+            dataset = metadata.DatasetMetadata()
+            dataset.is_public = True
+            dataset.base.owner = 'u1'
+            dataset.base.title = 'title'
+            dataset.base.date = date
+            dataset.save()
+            datasets.append(dataset)
+
+            if date is None:
+                # saved before created field was added
+                metadata.DatasetMetadata.objects(id=dataset.id).update(unset__created=True)
+
+        filter = {'number': 1}
+        received = []
+
+        while True:
+            page = list(metadata.get_datasets({}, filter))
+            received += page
+
+            if not page:
+                break
+
+            filter['after'] = metadata.encode_cursor(page[-1])
+
+        expected = sorted(datasets, key=lambda meta: (meta.base.date or 0, meta.id))
+        self.assertEqual([meta.id for meta in received], [meta.id for meta in expected])
+
+    def test_created_is_not_changed(self):
+        dataset = metadata.DatasetMetadata()
+        dataset.base.owner = 'u1'
+        dataset.base.title = 'title'
+        dataset.base.date = 1
+        dataset.save()
+
+        dataset.base.date = 2
+        dataset.save()
+        dataset.reload()
+
+        self.assertEqual(dataset.created, 1)
+
+    def test_cursor_of_flatten_document(self):
+        dataset = {'id': 'd1', 'date': 1, 'created': 2}
+
+        self.assertEqual(metadata.decode_cursor(metadata.encode_cursor(dataset, metadata.DatasetMetadata)), (2, 'd1'))
+        self.assertEqual(metadata.decode_cursor(metadata.encode_cursor(dataset)), (1, 'd1'))
+
+    def test_fill_created(self):
+        for date in [5, None]:
+            dataset = metadata.DatasetMetadata()
+            dataset.base.owner = 'u1'
+            dataset.base.title = 'title'
+            dataset.base.date = date
+            dataset.save()
+
+        metadata.DatasetMetadata.objects.update(unset__created=True)
+
+        report = metadata.fill_created([metadata.DatasetMetadata])
+
+        self.assertEqual(report, {'datasets': 2})
+        self.assertEqual(metadata.DatasetMetadata.objects(created=None).count(), 0)
+        self.assertEqual(metadata.DatasetMetadata.objects(created=5).count(), 1)
+        self.assertEqual(metadata.fill_created([metadata.DatasetMetadata]), {'datasets': 0})
+
+    def test_decode_invalid_cursor(self):
+        for cursor in ['', 'abc', 'WzEsMl0=', 'eyJhIjogMX0=']:
+            with self.assertRaises(ValueError):
+                metadata.decode_cursor(cursor)
+
+    def test_encode_decode_cursor(self):
+        task = self.create_task(10)
+        cursor = metadata.encode_cursor(task)
+
+        self.assertEqual(metadata.decode_cursor(cursor), (10, task.id))
+
+    def test_max_page_size(self):
+        metas = metadata.get_tasks({'user_id': 'u1'}, {'number': 10**6})
+
+        self.assertEqual(metas._limit, metadata.MAX_PAGE_SIZE)
@@ -0,0 +1,44 @@
+import unittest
+
+from mongoengine import connect
+
+import metadata
+
+
+class TestProjection(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+    def tearDown(self):
+        metadata.TaskMetadata.objects.all().delete()
+
+    def test_field_paths_of_flatten_document(self):
+        paths = metadata.DatasetMetadata.get_field_paths(['id', 'status', 'owner', 'title'])
+
+        self.assertEqual(paths, ['id', 'status', 'base.owner', 'base.title'])
+
+    def test_field_paths_of_denormalized_fields(self):
+        paths = metadata.ModelMetadata.get_field_paths(['id', 'category', 'dataset_title'])
+
+        self.assertEqual(paths, ['id', 'base.category', 'base.dataset_title'])
+
+    def test_field_paths_unknown_field(self):
+        with self.assertRaises(ValueError):
+            metadata.TaskMetadata.get_field_paths(['id', 'unknown'])
+
+    def test_only_requested_fields_loaded(self):
+        task = metadata.TaskMetadata()
+        task.owner = 'u1'
+        task.command = metadata.task.MODEL_TRAIN
+        task.history = {'epoch': [{'loss': 1.0}] * 100}
+        task.save()
+
+        context = {'user_id': 'u1'}
+        loaded = metadata.get_tasks(context, fields=['status']).first()
+
+        self.assertEqual(loaded.id, task.id)
+        self.assertEqual(loaded.date, task.date)
+        self.assertEqual(loaded.history, {})
+
+        loaded = metadata.get_task(task.id, context, fields=['history'])
+        self.assertEqual(loaded.history, task.history)
@@ -0,0 +1,71 @@
+import unittest
+
+from mongoengine import connect
+
+import metadata
+
+
+class TestFlattenAll(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        self.dataset = metadata.DatasetMetadata()
+        self.dataset.base.owner = 'u1'
+        self.dataset.base.title = 'dataset'
+        self.dataset.base.labels = ['a', 'b']
+        self.dataset.base.date = 10
+        self.dataset.save()
+
+        self.architecture = metadata.ArchitectureMetadata()
+        self.architecture.owner = 'u1'
+        self.architecture.title = 'architecture'
+        self.architecture.architecture = {'layers': []}
+        self.architecture.save()
+
+        self.model = metadata.ModelMetadata()
+        self.model.base.owner = 'u1'
+        self.model.base.title = 'model'
+        self.model.base.dataset = self.dataset
+        self.model.base.architecture = self.architecture
+        self.model.base.metrics = {'acc': 0.5}
+        self.model.save()
+
+        self.task = metadata.TaskMetadata()
+        self.task.owner = 'u1'
+        self.task.command = metadata.task.MODEL_TRAIN
+        self.task.history = {'epoch': [{'loss': 1.0}]}
+        self.task.save()
+
+    def tearDown(self):
+        metadata.DatasetMetadata.objects.all().delete()
+        metadata.ArchitectureMetadata.objects.all().delete()
+        metadata.ModelMetadata.objects.all().delete()
+        metadata.TaskMetadata.objects.all().delete()
+
+    def assertSameFlatten(self, metas):
+        self.assertEqual(metadata.flatten_all(metas), [meta.to_dict() for meta in metas])
+
+    def test_flatten_equal_to_dict(self):
+        context = {'user_id': 'u1'}
+
+        self.assertSameFlatten(metadata.get_datasets(context))
+        self.assertSameFlatten(metadata.get_architectures(context))
+        self.assertSameFlatten(metadata.get_models(context))
+        self.assertSameFlatten(metadata.get_tasks(context))
+
+    def test_flatten_projection_equal_to_dict(self):
+        context = {'user_id': 'u1'}
+
+        self.assertSameFlatten(metadata.get_datasets(context, fields=['title']))
+        self.assertSameFlatten(metadata.get_models(context, fields=['status', 'dataset']))
+        self.assertSameFlatten(metadata.get_tasks(context, fields=['config']))
+
+    def test_flatten_fills_missing_defaults(self):
+        metadata.DatasetMetadata.objects(id=self.dataset.id).update(unset__base__labels=True, unset__status=True)
+
+        self.assertSameFlatten(metadata.get_datasets({'user_id': 'u1'}))
+
+    def test_flatten_cursor(self):
+        flatten = metadata.flatten_all(metadata.get_datasets({'user_id': 'u1'}))
+
+        self.assertEqual(metadata.encode_cursor(flatten[0]), metadata.encode_cursor(self.dataset))
@@ -0,0 +1,128 @@
+import unittest
+
+from mongoengine import connect
+
+import metadata
+
+
+class TestReferences(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+    def tearDown(self):
+        metadata.DatasetMetadata.objects.all().delete()
+        metadata.ArchitectureMetadata.objects.all().delete()
+        metadata.ModelMetadata.objects.all().delete()
+
+    def create_dataset(self, owner, is_public=True, title='dataset'):
+        dataset = metadata.DatasetMetadata()
+        dataset.is_public = is_public
+        dataset.base.owner = owner
+        dataset.base.title = title
+        dataset.base.category = metadata.dataset.CLASSIFICATION
+        dataset.save()
+
+        return dataset
+
+    def create_architecture(self, owner, is_public=True, title='architecture'):
+        architecture = metadata.ArchitectureMetadata()
+        architecture.is_public = is_public
+        architecture.owner = owner
+        architecture.title = title
+        architecture.architecture = {'layers': []}
+        architecture.save()
+
+        return architecture
+
+    def create_model(self, owner, dataset, architecture):
+        model = metadata.ModelMetadata()
+        model.is_public = True
+        model.base.owner = owner
+        model.base.title = 'model'
+        model.base.dataset = dataset
+        model.base.architecture = architecture
+        model.save()
+
+        return model
+
+    def test_denormalized_on_create(self):
+        dataset = self.create_dataset('u1')
+        architecture = self.create_architecture('u1')
+        model = self.create_model('u1', dataset, architecture)
+
+        model = metadata.ModelMetadata.objects.get(id=model.id)
+        self.assertEqual(model.base.category, metadata.dataset.CLASSIFICATION)
+        self.assertEqual(model.base.dataset_title, 'dataset')
+        self.assertEqual(model.base.architecture_title, 'architecture')
+
+    def test_sync_on_dataset_update(self):
+        dataset = self.create_dataset('u1')
+        model = self.create_model('u1', dataset, self.create_architecture('u1'))
+
+        data = {'title': 'new title', 'category': metadata.dataset.REGRESSION}
+        metadata.update_dataset(dataset.id, data, {'user_id': 'u1'})
+
+        model = metadata.ModelMetadata.objects.get(id=model.id)
+        self.assertEqual(model.base.dataset_title, 'new title')
+        self.assertEqual(model.base.category, metadata.dataset.REGRESSION)
+
+    def test_sync_on_architecture_update(self):
+        architecture = self.create_architecture('u1')
+        model = self.create_model('u1', self.create_dataset('u1'), architecture)
+
+        metadata.update_architecture(architecture.id, {'title': 'new title'}, {'user_id': 'u1'})
+
+        model = metadata.ModelMetadata.objects.get(id=model.id)
+        self.assertEqual(model.base.architecture_title, 'new title')
+
+    def test_sync_on_reference_change(self):
+        model = self.create_model('u1', self.create_dataset('u1'), self.create_architecture('u1'))
+        other = self.create_dataset('u1', title='other')
+
+        model = metadata.ModelMetadata.objects.get(id=model.id)
+        metadata.update_model(model, {'dataset': other})
+
+        model = metadata.ModelMetadata.objects.get(id=model.id)
+        self.assertEqual(model.base.dataset_title, 'other')
+
+    def test_expand_references(self):
+        d1 = self.create_dataset('u1', title='d1')
+        d2 = self.create_dataset('u2', is_public=False, title='d2')
+        a1 = self.create_architecture('u1', title='a1')
+
+        self.create_model('u1', d1, a1)
+        self.create_model('u1', d2, a1)
+
+        context = {'user_id': 'u1'}
+        models = metadata.flatten_all(metadata.get_models(context))
+        models = metadata.expand_references(models, ['dataset', 'architecture'], context)
+
+        datasets = sorted(models, key=lambda model: model['dataset'] == d2.id)
+        self.assertEqual(datasets[0]['dataset'], {'id': d1.id, 'title': 'd1', 'category': metadata.dataset.CLASSIFICATION})
+        # private dataset of other user is not expanded
+        self.assertEqual(datasets[1]['dataset'], d2.id)
+
+        for model in models:
+            self.assertEqual(model['architecture'], {'id': a1.id, 'title': 'a1', 'category': None})
+
+    def test_expand_unknown_reference(self):
+        with self.assertRaises(KeyError):
+            metadata.expand_references([], ['owner'], {})
+
+    def test_fill_copied_fields(self):
+        dataset = self.create_dataset('u1')
+        architecture = self.create_architecture('u1')
+        models = [self.create_model('u1', dataset, architecture) for _ in range(3)]
+
+        # saved before copies were added
+        unset = {'$unset': {'base.category': 1, 'base.dataset_title': 1, 'base.architecture_title': 1}}
+        metadata.ModelMetadata._get_collection().update_many({'_id': {'$ne': models[0].id}}, unset)
+
+        self.assertEqual(metadata.fill_copied_fields(), 2)
+
+        for model in metadata.ModelMetadata.objects:
+            self.assertEqual(model.base.category, metadata.dataset.CLASSIFICATION)
+            self.assertEqual(model.base.dataset_title, 'dataset')
+            self.assertEqual(model.base.architecture_title, 'architecture')
+
+        self.assertEqual(metadata.fill_copied_fields(), 0)
@@ -0,0 +1,89 @@
+import unittest
+
+from mongoengine import connect
+
+import metadata
+from metadata import search
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        self.datasets = [
+            self.create_dataset('u1', True, 'classification', 1),
+            self.create_dataset('u1', False, 'regression', 2),
+            self.create_dataset('u2', True, 'classification', 3),
+            self.create_dataset('u2', False, 'classification', 4),
+            self.create_dataset('u3', True, 'regression', 5)
+        ]
+
+    def tearDown(self):
+        metadata.DatasetMetadata.objects.all().delete()
+
+    def create_dataset(self, owner, is_public, category, date):
+        with metadata.DatasetMetadata().save_context() as dataset:
+            dataset.base.owner = owner
+            dataset.base.title = 'dataset {date}'.format(date=date)
+            dataset.base.category = category
+            dataset.base.date = date
+            dataset.is_public = is_public
+
+        return dataset
+
+    def search(self, user_id, **kwargs):
+        metas = metadata.search_metadata(metadata.DatasetMetadata, {'user_id': user_id}, **kwargs)
+        return [meta.base.date for meta in metas]
+
+    def test_visibility_and_facets(self):
+        self.assertEqual(self.search('u1'), [1, 2, 3, 5])
+        self.assertEqual(self.search(None), [1, 3, 5])
+        self.assertEqual(self.search('u1', facets={'category': 'classification'}), [1, 3])
+        self.assertEqual(self.search('u1', facets={'owner': 'u1', 'is_public': False}), [2])
+
+    def test_descending_cursor(self):
+        filter = {'number': 2}
+        dates = []
+
+        while True:
+            page = list(metadata.search_metadata(metadata.DatasetMetadata, {'user_id': 'u2'}, sort='-date', filter=filter))
+            dates += [meta.base.date for meta in page]
+
+            if len(page) < 2:
+                break
+
+            filter['after'] = metadata.encode_cursor(page[-1])
+
+        self.assertEqual(dates, [5, 4, 3, 1])
+
+    def test_text_query(self):
+        metas = metadata.search_metadata(metadata.DatasetMetadata, {}, text='cifar', sort='relevance')
+
+        self.assertEqual(metas._query['$text'], {'$search': 'cifar'})
+        self.assertEqual(metas._ordering[0], ('_text_score', {'$meta': 'textScore'}))
+
+    def test_invalid_params(self):
+        context = {'user_id': 'u1'}
+
+        with self.assertRaises(ValueError):
+            metadata.search_metadata(metadata.DatasetMetadata, context, sort='title')
+
+        with self.assertRaises(ValueError):
+            metadata.search_metadata(metadata.DatasetMetadata, context, sort='relevance')
+
+        with self.assertRaises(ValueError):
+            metadata.search_metadata(metadata.DatasetMetadata, context, facets={'title': 'x'})
+
+    def test_count_facets(self):
+        facets = metadata.count_facets(metadata.DatasetMetadata, {'user_id': 'u1'}, facets={'category': 'classification'})
+
+        # selected facet is counted without its own value
+        self.assertEqual(facets['category'], [{'value': 'classification', 'count': 2}, {'value': 'regression', 'count': 2}])
+        self.assertEqual(facets['owner'], [{'value': 'u1', 'count': 1}, {'value': 'u2', 'count': 1}])
+        self.assertEqual(facets['is_public'], [{'value': True, 'count': 2}])
+
+    def test_facet_path(self):
+        self.assertEqual(search.get_facet_path(metadata.DatasetMetadata, 'owner'), 'base.owner')
+        self.assertEqual(search.get_facet_path(metadata.DatasetMetadata, 'status'), 'status')
+        self.assertEqual(search.get_facet_path(metadata.ModelMetadata, 'category'), 'base.category')
+        self.assertEqual(search.get_facet_path(metadata.ArchitectureMetadata, 'owner'), 'owner')
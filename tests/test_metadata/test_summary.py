@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+
+import mongomock
+from mongoengine import connect
+
+import metadata
+from metadata import summary
+
+
+class TestSummary(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+        summary.SUMMARY_CACHE.clear()
+
+    def tearDown(self):
+        metadata.DatasetMetadata.objects.all().delete()
+        metadata.ArchitectureMetadata.objects.all().delete()
+        metadata.TaskMetadata.objects.all().delete()
+
+    def create_dataset(self, owner, status, category=None, size=None):
+        with metadata.DatasetMetadata().save_context() as dataset:
+            dataset.base.owner = owner
+            dataset.base.title = 'dataset'
+            dataset.base.category = category
+            dataset.base.size = size
+            dataset.status = status
+
+        return dataset
+
+    def create_task(self, owner, status, history=None):
+        with metadata.TaskMetadata().save_context() as task:
+            task.owner = owner
+            task.command = metadata.task.MODEL_TRAIN
+            task.status = status
+            task.history = history or {}
+
+        return task
+
+    def test_summary(self):
+        self.create_dataset('u1', 'RECEIVED', 'classification', 100)
+        self.create_dataset('u1', 'RECEIVED', 'regression', 20)
+        self.create_dataset('u1', 'PENDING')
+        self.create_dataset('u2', 'RECEIVED', 'classification', 1000)
+
+        active = self.create_task('u1', 'STARTED', {'epochs': 10, 'current_epoch': 5, 'epoch': {'loss': [1.0]}})
+        self.create_task('u1', 'SUCCESS')
+
+        result = metadata.get_summary({'user_id': 'u1'})
+
+        self.assertEqual(result['datasets'], {
+            'total': 3,
+            'status': {'RECEIVED': 2, 'PENDING': 1},
+            'category': {'classification': 1, 'regression': 1},
+            'size': 120
+        })
+        self.assertEqual(result['architectures'], {'total': 0, 'status': {}, 'category': {}})
+        self.assertEqual(result['storage'], {'datasets': 120, 'models': 0, 'total': 120})
+
+        self.assertEqual(result['tasks']['status'], {'STARTED': 1, 'SUCCESS': 1})
+        self.assertEqual(len(result['tasks']['active']), 1)
+
+        task = result['tasks']['active'][0]
+        self.assertEqual(task['id'], active.id)
+        self.assertEqual(task['progress'], 0.5)
+        self.assertNotIn('epoch', task)
+
+    def test_one_aggregation_per_collection(self):
+        self.create_dataset('u1', 'RECEIVED', 'classification', 100)
+        self.create_dataset('u1', 'PENDING', 'classification')
+
+        aggregate = mongomock.collection.Collection.aggregate
+
+        with mock.patch.object(mongomock.collection.Collection, 'aggregate', autospec=True,
+                               side_effect=aggregate) as patched:
+            result = summary.summarize(metadata.DatasetMetadata, 'u1', size=True)
+
+        self.assertEqual(patched.call_count, 1)
+        self.assertEqual(result, {
+            'total': 2,
+            'status': {'RECEIVED': 1, 'PENDING': 1},
+            'category': {'classification': 2},
+            'size': 100
+        })
+
+    def test_summary_cached(self):
+        self.create_dataset('u1', 'RECEIVED')
+        self.assertEqual(metadata.get_summary({'user_id': 'u1'})['datasets']['total'], 1)
+
+        self.create_dataset('u1', 'RECEIVED')
+        self.assertEqual(metadata.get_summary({'user_id': 'u1'})['datasets']['total'], 1)
+        self.assertEqual(metadata.get_summary({'user_id': 'u1'}, cached=False)['datasets']['total'], 2)
+
+    def test_summary_cache_size(self):
+        cache = summary.SummaryCache(size=2, ttl=60)
+
+        for user_id in ['u1', 'u2', 'u3']:
+            cache.set(user_id, {})
+
+        self.assertIsNone(cache.get('u1'))
+        self.assertEqual(cache.get('u3'), {})
+
+    def test_summary_no_user(self):
+        with self.assertRaises(KeyError):
+            metadata.get_summary({})
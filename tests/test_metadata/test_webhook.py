@@ -0,0 +1,180 @@
+import unittest
+import uuid
+
+from mongoengine import connect
+
+import metadata
+from metadata import webhook
+
+
+class TestWebhookOutbox(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+    def tearDown(self):
+        metadata.TaskMetadata.objects.all().delete()
+        metadata.WebhookMetadata.objects.all().delete()
+        metadata.WebhookDelivery.objects.all().delete()
+
+    def create_task(self, owner='u1'):
+        with metadata.TaskMetadata().save_context() as task:
+            task.id = str(uuid.uuid4())
+            task.owner = owner
+            task.command = metadata.task.MODEL_TRAIN
+
+        return task
+
+    def create_webhook(self, owner='u1', task=None, events=None):
+        hook = metadata.WebhookMetadata(owner=owner, url='http://localhost/hook', task=task)
+
+        if events:
+            hook.events = events
+
+        hook.save()
+
+        return hook
+
+    def set_status(self, task, status):
+        with task.save_context():
+            task.status = status
+
+    def test_final_status_enqueued(self):
+        hook = self.create_webhook()
+        task = self.create_task()
+
+        self.set_status(task, metadata.task.STARTED)
+        self.assertEqual(metadata.WebhookDelivery.objects.count(), 0)
+
+        self.set_status(task, metadata.task.SUCCESS)
+
+        delivery = metadata.WebhookDelivery.objects.get()
+        self.assertEqual(delivery.webhook, hook.id)
+        self.assertEqual(delivery.status, webhook.PENDING)
+        self.assertEqual(delivery.event['task'], task.id)
+        self.assertEqual(delivery.event['status'], metadata.task.SUCCESS)
+        self.assertEqual(delivery.event['previous_status'], metadata.task.STARTED)
+
+    def test_status_not_changed(self):
+        self.create_webhook(events=[metadata.task.STARTED])
+        task = self.create_task()
+
+        self.set_status(task, metadata.task.STARTED)
+        self.set_status(task, metadata.task.STARTED)
+
+        task = metadata.TaskMetadata.objects.get(id=task.id)
+        with task.save_context():
+            task.config = {'epochs': 1}
+
+        self.assertEqual(metadata.WebhookDelivery.objects.count(), 1)
+
+    def test_task_and_owner_webhooks(self):
+        self.create_webhook(owner='u2')
+        task = self.create_task()
+        other = self.create_task()
+        self.create_webhook(task=task.id)
+        self.create_webhook()
+
+        self.set_status(task, metadata.task.FAILURE)
+        self.set_status(other, metadata.task.FAILURE)
+
+        self.assertEqual(metadata.WebhookDelivery.objects(event__task=task.id).count(), 2)
+        self.assertEqual(metadata.WebhookDelivery.objects(event__task=other.id).count(), 1)
+
+    def test_claim_and_backoff(self):
+        self.create_webhook()
+        task = self.create_task()
+        self.set_status(task, metadata.task.SUCCESS)
+
+        deliveries = webhook.claim_deliveries(now=1e10)
+        self.assertEqual(len(deliveries), 1)
+
+        # claimed delivery is not claimed again
+        self.assertEqual(webhook.claim_deliveries(now=1e10), [])
+
+        webhook.mark_failed(deliveries, 'HTTP Error 500', now=1e10)
+
+        delivery = metadata.WebhookDelivery.objects.get()
+        self.assertEqual(delivery.attempts, 1)
+        self.assertEqual(delivery.next_attempt, 1e10 + webhook.RETRY_DELAY)
+        self.assertEqual(delivery.last_error, 'HTTP Error 500')
+
+        self.assertEqual(webhook.claim_deliveries(now=1e10 + 1), [])
+        deliveries = webhook.claim_deliveries(now=1e10 + webhook.RETRY_DELAY)
+        self.assertEqual(len(deliveries), 1)
+
+        webhook.mark_delivered(deliveries)
+
+        delivery = metadata.WebhookDelivery.objects.get()
+        self.assertEqual(delivery.status, webhook.DELIVERED)
+        self.assertEqual(delivery.attempts, 2)
+        self.assertIsNotNone(delivery.finished)
+
+    def test_expired_claim(self):
+        self.create_webhook()
+        task = self.create_task()
+        self.set_status(task, metadata.task.SUCCESS)
+
+        deliveries = webhook.claim_deliveries(now=1e10)
+        self.assertEqual(webhook.extend_claim(deliveries, now=1e10 + 30), deliveries)
+
+        # claim is extended, other worker does not claim deliveries
+        self.assertEqual(webhook.claim_deliveries(now=1e10 + 30 + webhook.CLAIM_TIMEOUT - 1), [])
+
+        # claim is expired, deliveries belong to other worker
+        others = webhook.claim_deliveries(now=1e10 + 30 + webhook.CLAIM_TIMEOUT)
+        self.assertEqual(len(others), 1)
+        self.assertEqual(webhook.extend_claim(deliveries), [])
+
+        webhook.mark_delivered(deliveries)
+        webhook.mark_failed(deliveries, 'timeout')
+
+        delivery = metadata.WebhookDelivery.objects.get()
+        self.assertEqual(delivery.status, webhook.PENDING)
+        self.assertEqual(delivery.attempts, 0)
+        self.assertEqual(delivery.claim, others[0].claim)
+
+    def test_failed_after_max_attempts(self):
+        self.create_webhook()
+        task = self.create_task()
+        self.set_status(task, metadata.task.SUCCESS)
+
+        for _ in range(webhook.MAX_ATTEMPTS):
+            deliveries = webhook.claim_deliveries(now=1e12)
+            webhook.mark_failed(deliveries, 'timeout', now=0)
+
+        delivery = metadata.WebhookDelivery.objects.get()
+        self.assertEqual(delivery.status, webhook.FAILED)
+        self.assertIsNotNone(delivery.finished)
+        self.assertEqual(webhook.claim_deliveries(now=1e12), [])
+
+    def test_finished_deliveries_expire(self):
+        indexes = metadata.WebhookDelivery._meta['index_specs']
+        ttl = [index for index in indexes if index['fields'] == [('finished', 1)]]
+
+        self.assertEqual(ttl[0]['expireAfterSeconds'], webhook.DELIVERY_EXPIRE)
+
+        self.create_webhook()
+        self.set_status(self.create_task(), metadata.task.SUCCESS)
+
+        # pending delivery does not expire
+        self.assertIsNone(metadata.WebhookDelivery.objects.get().finished)
+
+    def test_delete_webhook(self):
+        hook = self.create_webhook()
+        other = self.create_webhook()
+        task = self.create_task()
+        self.set_status(task, metadata.task.SUCCESS)
+
+        webhook.mark_delivered([delivery for delivery in webhook.claim_deliveries(now=1e10) if delivery.webhook == hook.id])
+        self.set_status(task, metadata.task.FAILURE)
+
+        metadata.delete_webhook(hook)
+
+        self.assertEqual(metadata.WebhookDelivery.objects(webhook=hook.id, status=webhook.PENDING).count(), 0)
+        self.assertEqual(metadata.WebhookDelivery.objects(webhook=hook.id, status=webhook.DELIVERED).count(), 1)
+        self.assertEqual(metadata.WebhookDelivery.objects(webhook=other.id).count(), 2)
+
+    def test_retry_delay(self):
+        self.assertEqual(webhook.get_retry_delay(1), webhook.RETRY_DELAY)
+        self.assertEqual(webhook.get_retry_delay(3), 4 * webhook.RETRY_DELAY)
+        self.assertEqual(webhook.get_retry_delay(100), webhook.MAX_RETRY_DELAY)
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy
+import gevent
+
+from serving.batcher import BatchScheduler
+
+
+class ModelMeta:
+    def __init__(self, id):
+        self.id = id
+
+
+class SumPool:
+    """Pool which predicts sum of sample and remembers batch sizes"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, model_meta, x):
+        self.batch_sizes.append(x.shape[0])
+        return x.sum(axis=1)
+
+
+class TestBatchScheduler(unittest.TestCase):
+    def test_single_request(self):
+        pool = SumPool()
+        scheduler = BatchScheduler(pool, max_batch_size=8, max_batch_delay=0.01)
+
+        y = scheduler.predict(ModelMeta('m1'), numpy.ones((2, 3)))
+
+        self.assertEqual(y.tolist(), [3.0, 3.0])
+
+    def test_concurrent_requests_batched(self):
+        pool = SumPool()
+        scheduler = BatchScheduler(pool, max_batch_size=8, max_batch_delay=0.05)
+        model = ModelMeta('m1')
+
+        jobs = [gevent.spawn(scheduler.predict, model, numpy.full((1, 2), i)) for i in range(4)]
+        gevent.joinall(jobs)
+
+        self.assertEqual(pool.batch_sizes, [4])
+        self.assertEqual([job.value.tolist() for job in jobs], [[2 * i] for i in range(4)])
+
+    def test_max_batch_size(self):
+        pool = SumPool()
+        scheduler = BatchScheduler(pool, max_batch_size=2, max_batch_delay=0.05)
+        model = ModelMeta('m1')
+
+        jobs = [gevent.spawn(scheduler.predict, model, numpy.ones((1, 2))) for _ in range(5)]
+        gevent.joinall(jobs)
+
+        self.assertEqual(pool.batch_sizes, [2, 2, 1])
+
+    def test_different_models_not_batched(self):
+        pool = SumPool()
+        scheduler = BatchScheduler(pool, max_batch_size=8, max_batch_delay=0.05)
+
+        jobs = [gevent.spawn(scheduler.predict, ModelMeta(id), numpy.ones((1, 2))) for id in ('m1', 'm2')]
+        gevent.joinall(jobs)
+
+        self.assertEqual(pool.batch_sizes, [1, 1])
+
+    def test_error_propagated(self):
+        class FailPool:
+            def predict(self, model_meta, x):
+                raise ValueError('invalid input')
+
+        scheduler = BatchScheduler(FailPool(), max_batch_size=8, max_batch_delay=0.01)
+
+        with self.assertRaises(ValueError):
+            scheduler.predict(ModelMeta('m1'), numpy.ones((1, 2)))
@@ -0,0 +1,90 @@
+import os
+import unittest
+import tempfile
+
+import numpy
+from keras import models
+from keras import layers
+from mongoengine import connect
+
+import metadata
+import storage
+from serving.pool import ModelPool
+
+
+class TestModelPool(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        test_dir = tempfile.mkdtemp('test_home')
+        storage.from_config({
+            'home': test_dir
+        })
+
+    def tearDown(self):
+        metadata.ModelMetadata.objects.all().delete()
+
+    def create_model(self, model_meta=None, units=2):
+        model_meta = model_meta or metadata.ModelMetadata()
+
+        input = layers.Input(shape=(4,))
+        output = layers.Dense(units)(input)
+        model = models.Model(inputs=input, outputs=output)
+        model.save(storage.get_model_path(model_meta.url))
+
+        return model_meta
+
+    def test_predict(self):
+        pool = ModelPool(2)
+        m1 = self.create_model()
+
+        y = pool.predict(m1, numpy.zeros((3, 4)))
+
+        self.assertEqual(y.shape, (3, 2))
+
+    def test_hit_and_miss(self):
+        pool = ModelPool(2)
+        m1 = self.create_model()
+
+        pool.get(m1)
+        pool.get(m1)
+
+        metrics = pool.metrics()
+        self.assertEqual(metrics['misses'], 1)
+        self.assertEqual(metrics['hits'], 1)
+        self.assertEqual(metrics['hit_rate'], 0.5)
+
+    def test_evict_least_recently_used(self):
+        pool = ModelPool(2)
+        m1, m2, m3 = [self.create_model() for _ in range(3)]
+
+        pool.get(m1)
+        pool.get(m2)
+        pool.get(m1)
+        pool.get(m3)
+
+        self.assertEqual(len(pool), 2)
+        self.assertIn(m1.id, pool)
+        self.assertNotIn(m2.id, pool)
+        self.assertEqual(pool.metrics()['evictions'], 1)
+
+    def test_reload_rewritten_model(self):
+        pool = ModelPool(2)
+        m1 = self.create_model()
+
+        self.assertEqual(pool.predict(m1, numpy.zeros((1, 4))).shape, (1, 2))
+
+        # retrained model is saved at the same url
+        self.create_model(m1, units=3)
+        path = storage.get_model_path(m1.url)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+
+        self.assertEqual(pool.predict(m1, numpy.zeros((1, 4))).shape, (1, 3))
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(pool.metrics()['misses'], 2)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            ModelPool(0)
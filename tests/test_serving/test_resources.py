@@ -0,0 +1,125 @@
+import io
+import tempfile
+from unittest import mock
+
+import jwt
+import numpy
+from falcon import testing
+from keras import models
+from keras import layers
+from mongoengine import connect
+
+import metadata
+import serving
+import storage
+from serving import resources
+
+
+class TestModelInferResource(testing.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        test_dir = tempfile.mkdtemp('test_home')
+        storage.from_config({
+            'home': test_dir
+        })
+
+        config = {
+            'auth_key_file': 'config/auth.key',
+            'max_batch_delay': 0
+        }
+        self.SECRET_KEY = open(config['auth_key_file']).read()
+        self.app = serving.main(config)
+
+    def tearDown(self):
+        metadata.ModelMetadata.objects.all().delete()
+
+    def get_auth_headers(self, user_id):
+        token = jwt.encode({'user_id': user_id}, self.SECRET_KEY, algorithm='HS256').decode('utf-8')
+        return {'Authorization': 'Bearer {token}'.format(token=token)}
+
+    def create_model(self, status=metadata.model.READY):
+        model_meta = metadata.ModelMetadata()
+        model_meta.base.owner = 'u1'
+        model_meta.status = status
+
+        input = layers.Input(shape=(4,))
+        output = layers.Dense(2)(input)
+        model = models.Model(inputs=input, outputs=output)
+        model.save(storage.get_model_path(model_meta.url))
+
+        # references are not needed for inference
+        metadata.ModelMetadata._get_collection().insert_one(model_meta.to_mongo())
+
+        return model_meta
+
+    def infer(self, model_meta_id, user_id='u1', **kwargs):
+        url = '/api/v1/model/{id}/infer'.format(id=model_meta_id)
+        headers = self.get_auth_headers(user_id)
+        headers.update(kwargs.pop('headers', {}))
+
+        return self.simulate_post(url, headers=headers, **kwargs)
+
+    def test_infer_json(self):
+        model_meta = self.create_model()
+
+        resp = self.infer(model_meta.id, json={'x': [[0, 0, 0, 0]] * 3})
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(numpy.asarray(resp.json['y']).shape, (3, 2))
+
+    def test_infer_npy(self):
+        model_meta = self.create_model()
+
+        buffer = io.BytesIO()
+        numpy.save(buffer, numpy.zeros((2, 4), dtype=numpy.float32))
+        headers = {'Content-Type': resources.NPY_CONTENT_TYPE, 'Accept': resources.NPY_CONTENT_TYPE}
+
+        resp = self.infer(model_meta.id, body=buffer.getvalue(), headers=headers)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(numpy.load(io.BytesIO(resp.content)).shape, (2, 2))
+
+    def test_not_found(self):
+        model_meta = self.create_model()
+
+        self.assertEqual(self.infer('unknown', json={'x': [[0, 0, 0, 0]]}).status_code, 404)
+        self.assertEqual(self.infer(model_meta.id, user_id='u2', json={'x': [[0, 0, 0, 0]]}).status_code, 404)
+
+    def test_not_trained(self):
+        model_meta = self.create_model(status=metadata.model.PENDING)
+
+        resp = self.infer(model_meta.id, json={'x': [[0, 0, 0, 0]]})
+
+        self.assertEqual(resp.status_code, 409)
+
+    def test_too_large(self):
+        model_meta = self.create_model()
+
+        with mock.patch.object(resources, 'MAX_INFER_SIZE', 10):
+            resp = self.infer(model_meta.id, json={'x': [[0, 0, 0, 0]]})
+
+        self.assertEqual(resp.status_code, 413)
+
+    def test_bad_tensor(self):
+        model_meta = self.create_model()
+
+        bodies = [
+            {'json': {'y': [[0, 0, 0, 0]]}},
+            {'json': {'x': [['a', 'b']]}},
+            {'json': {'x': []}},
+            {'body': b'not npy', 'headers': {'Content-Type': resources.NPY_CONTENT_TYPE}}
+        ]
+
+        for kwargs in bodies:
+            resp = self.infer(model_meta.id, **kwargs)
+            self.assertEqual(resp.status_code, 400, kwargs)
+
+    def test_unsupported_media_type(self):
+        model_meta = self.create_model()
+
+        resp = self.infer(model_meta.id, body=b'x', headers={'Content-Type': 'text/plain'})
+
+        self.assertEqual(resp.status_code, 415)
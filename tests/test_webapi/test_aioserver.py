@@ -0,0 +1,219 @@
+import json
+import socket
+import asyncio
+import threading
+import http.client
+import unittest
+
+import jwt
+import falcon
+from mongoengine import connect
+
+import webapi
+import metadata
+from metadata import feed
+
+from webapi import aioserver
+
+
+class EchoResource:
+    def on_post(self, req, resp, name):
+        resp.media = {'body': req.stream.read(req.content_length or 0).decode('utf-8'), 'path': req.path}
+
+
+class StreamResource:
+    def on_get(self, req, resp):
+        resp.stream = iter([b'first ', b'', b'second'])
+
+
+class BlockResource:
+    def __init__(self):
+        self.event = threading.Event()
+
+    def on_get(self, req, resp):
+        self.event.wait(5)
+        resp.media = {'released': self.event.is_set()}
+
+
+class ErrorResource:
+    def on_get(self, req, resp):
+        raise falcon.HTTPBadRequest(title='Bad Request', description='error')
+
+
+class TestAsyncioWSGIServer(unittest.TestCase):
+    def setUp(self):
+        self.block_resource = BlockResource()
+
+        api = falcon.API()
+        api.add_route('/echo/{name}', EchoResource())
+        api.add_route('/stream', StreamResource())
+        api.add_route('/block', self.block_resource)
+        api.add_route('/error', ErrorResource())
+
+        self.loop = asyncio.new_event_loop()
+        self.server = aioserver.AsyncioWSGIServer(api, threads=4, keep_alive_timeout=5, max_body_size=1024)
+        self.loop.run_until_complete(self.server.start('127.0.0.1', 0))
+
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.block_resource.event.set()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.run_until_complete(self.server.close())
+        self.loop.close()
+
+    def get_connection(self):
+        return http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=5)
+
+    def test_keep_alive(self):
+        connection = self.get_connection()
+
+        for i in range(3):
+            connection.request('POST', '/echo/a%20b', body=json.dumps({'i': i}), headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            data = json.loads(response.read().decode('utf-8'))
+
+            self.assertEqual(response.status, 200)
+            self.assertEqual(data, {'body': json.dumps({'i': i}), 'path': '/echo/a b'})
+
+        connection.close()
+
+    def test_chunked_request_and_response(self):
+        connection = self.get_connection()
+
+        connection.request('POST', '/echo/chunked', body=iter([b'abc', b'def']), encode_chunked=True)
+        response = connection.getresponse()
+        self.assertEqual(json.loads(response.read().decode('utf-8'))['body'], 'abcdef')
+
+        connection.request('GET', '/stream')
+        response = connection.getresponse()
+        self.assertEqual(response.getheader('Transfer-Encoding'), 'chunked')
+        self.assertEqual(response.read(), b'first second')
+
+        connection.close()
+
+    def test_error_response(self):
+        connection = self.get_connection()
+
+        connection.request('GET', '/error')
+        response = connection.getresponse()
+        self.assertEqual(response.status, 400)
+        response.read()
+
+        connection.request('GET', '/unknown')
+        response = connection.getresponse()
+        self.assertEqual(response.status, 404)
+
+        connection.close()
+
+    def test_body_too_large(self):
+        connection = self.get_connection()
+
+        connection.request('POST', '/echo/large', body=b'x' * 2048)
+        response = connection.getresponse()
+        self.assertEqual(response.status, 413)
+
+        connection.close()
+
+    def test_malformed_request(self):
+        with socket.create_connection(('127.0.0.1', self.server.port), timeout=5) as sock:
+            sock.sendall(b'GARBAGE\r\n\r\n')
+            self.assertTrue(sock.recv(1024).startswith(b'HTTP/1.1 400'))
+
+    def test_blocked_request_not_block_server(self):
+        blocked = self.get_connection()
+        blocked.request('GET', '/block')
+
+        connection = self.get_connection()
+        connection.request('POST', '/echo/free', body=b'')
+        self.assertEqual(connection.getresponse().status, 200)
+        connection.close()
+
+        self.block_resource.event.set()
+        response = blocked.getresponse()
+        self.assertEqual(json.loads(response.read().decode('utf-8')), {'released': True})
+        blocked.close()
+
+
+class TestAsyncioWebAPI(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+        metadata.Counter.objects.delete()
+
+        config = {
+            "auth_key_file": "config/auth.key",
+            "metadata_config": {},
+        }
+        api = webapi.main(config)
+
+        with open(config['auth_key_file']) as f:
+            self.secret_key = f.read()
+
+        self.loop = asyncio.new_event_loop()
+        self.server = aioserver.AsyncioWSGIServer(api, threads=2)
+        self.loop.run_until_complete(self.server.start('127.0.0.1', 0))
+
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.run_until_complete(self.server.close())
+        self.loop.close()
+
+        metadata.TaskMetadata.objects.all().delete()
+        metadata.TASK_FEED.poll_interval = feed.DEFAULT_POLL_INTERVAL
+
+    def test_event_streams_do_not_hold_threads(self):
+        metadata.TASK_FEED.source = feed.POLL
+        metadata.TASK_FEED.poll_interval = 0.01
+
+        with metadata.TaskMetadata().save_context() as task:
+            task.owner = 'u1'
+            task.command = metadata.task.MODEL_TRAIN
+
+        token = jwt.encode({'user_id': 'u1'}, self.secret_key, algorithm='HS256').decode('utf-8')
+        headers = {'Authorization': 'Bearer ' + token}
+        url = '/api/v1/task/{id}/events'.format(id=task.id)
+
+        # more open streams than threads of server
+        streams = []
+        for _ in range(4):
+            connection = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=5)
+            connection.request('GET', url, headers=headers)
+            response = connection.getresponse()
+            self.assertEqual(response.status, 200)
+            streams.append((connection, response))
+
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=5)
+        connection.request('GET', '/api/v1/task/' + task.id, headers=headers)
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(response.read().decode('utf-8'))['status'], metadata.task.PENDING)
+        connection.close()
+
+        metadata.TaskMetadata.objects(id=task.id).update_one(set__status=metadata.task.SUCCESS)
+
+        for connection, response in streams:
+            body = response.read().decode('utf-8')
+            self.assertTrue(body.rstrip().endswith('"status":"SUCCESS"}'), body)
+            connection.close()
+
+        self.assertEqual(metadata.TASK_FEED.subscribed(), [])
+
+    def test_get_number(self):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=5)
+
+        connection.request('GET', '/api/v1/datasets/number')
+        response = connection.getresponse()
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(response.read().decode('utf-8')), 0)
+
+        connection.request('GET', '/api/v1/datasets/bulk')
+        self.assertEqual(connection.getresponse().status, 401)
+
+        connection.close()
@@ -13,7 +13,7 @@ class TestArchitectures(TestInitAPI):
         self.assertEqual(result.status, falcon.HTTP_200)
 
         # validate schema
-        self.assertEqual(list(result.json.keys()), ['ids'])
+        self.assertEqual(sorted(result.json.keys()), ['ids', 'next'])
 
     def test_schema_auth(self):
         self.create_arch_metadata(True, 'u1')
@@ -26,7 +26,7 @@ class TestArchitectures(TestInitAPI):
         self.assertEqual(result.status, falcon.HTTP_200)
 
         # validate schema
-        self.assertEqual(list(result.json.keys()), ['ids'])
+        self.assertEqual(sorted(result.json.keys()), ['ids', 'next'])
 
     def test_many_public_architectures_no_auth(self):
         user_id = 'u1'
@@ -0,0 +1,156 @@
+import time
+import unittest
+from unittest import mock
+
+import jwt
+import falcon
+from falcon import testing
+
+from webapi.authbackend import TokenCache, CachedJWTAuthBackend
+from webapi.authmiddleware import NeuroseedAuthMiddleware
+
+SECRET_KEY = 'secret'
+
+
+class UserResource:
+    def on_get(self, req, resp):
+        resp.media = {'user': req.context['user']}
+
+
+class OptionalResource(UserResource):
+    auth = {
+        'optional_methods': ['GET']
+    }
+
+
+class ExemptResource:
+    auth = {
+        'exempt_methods': ['GET']
+    }
+
+    def on_get(self, req, resp):
+        resp.media = {'user': req.context.get('user', None)}
+
+
+class TestTokenCache(unittest.TestCase):
+    def test_get_set(self):
+        cache = TokenCache()
+        cache.set(b'key', 'u1')
+
+        self.assertEqual(cache.get(b'key'), 'u1')
+        self.assertIsNone(cache.get(b'other'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_exp(self):
+        cache = TokenCache()
+        cache.set(b'key', 'u1', exp=time.time() - 1)
+
+        self.assertIsNone(cache.get(b'key'))
+        self.assertEqual(len(cache), 0)
+
+    def test_evict_least_recent(self):
+        cache = TokenCache(size=2)
+        cache.set(b'a', 'u1')
+        cache.set(b'b', 'u2')
+        cache.get(b'a')
+        cache.set(b'c', 'u3')
+
+        self.assertEqual(cache.get(b'a'), 'u1')
+        self.assertIsNone(cache.get(b'b'))
+        self.assertEqual(cache.get(b'c'), 'u3')
+
+
+class TestAuthMiddleware(testing.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.loaded = []
+
+        def user_loader(payload):
+            self.loaded.append(payload)
+            return payload['user_id']
+
+        self.backend = CachedJWTAuthBackend(
+            user_loader,
+            SECRET_KEY,
+            required_claims=['user_id'],
+            auth_header_prefix='Bearer')
+        self.auth = NeuroseedAuthMiddleware(self.backend)
+
+        self.app = falcon.API(middleware=[self.auth])
+        self.app.add_route('/user', UserResource())
+        self.app.add_route('/optional', OptionalResource())
+        self.app.add_route('/route', UserResource())
+        self.app.add_route('/exempt', ExemptResource())
+        self.auth.optional_routes.add('/route')
+
+    def get_headers(self, payload):
+        token = jwt.encode(payload, SECRET_KEY, 'HS256').decode()
+        return {'Authorization': 'Bearer ' + token}
+
+    def test_token_verified_once(self):
+        headers = self.get_headers({'user_id': 'u1'})
+
+        for _ in range(3):
+            result = self.simulate_get('/user', headers=headers)
+            self.assertEqual(result.status, falcon.HTTP_200)
+            self.assertEqual(result.json, {'user': 'u1'})
+
+        self.assertEqual(len(self.loaded), 1)
+        self.assertEqual(self.backend.cache.hits, 2)
+
+    def test_cached_until_exp(self):
+        now = time.time()
+        headers = self.get_headers({'user_id': 'u1', 'exp': int(now) + 60})
+
+        self.simulate_get('/user', headers=headers)
+        self.simulate_get('/user', headers=headers)
+        self.assertEqual(len(self.loaded), 1)
+
+        with mock.patch('webapi.authbackend.time.time', return_value=now + 120):
+            result = self.simulate_get('/user', headers=headers)
+
+        # verified again after exp
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(len(self.loaded), 2)
+
+    def test_expired_token(self):
+        headers = self.get_headers({'user_id': 'u1', 'exp': int(time.time()) - 10})
+
+        result = self.simulate_get('/user', headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_401)
+        self.assertEqual(len(self.backend.cache), 0)
+
+    def test_invalid_token_not_cached(self):
+        token = jwt.encode({'user_id': 'u1'}, 'other', 'HS256').decode()
+        headers = {'Authorization': 'Bearer ' + token}
+
+        for _ in range(2):
+            result = self.simulate_get('/user', headers=headers)
+            self.assertEqual(result.status, falcon.HTTP_401)
+
+        self.assertEqual(len(self.backend.cache), 0)
+
+    def test_no_token(self):
+        result = self.simulate_get('/user')
+
+        self.assertEqual(result.status, falcon.HTTP_401)
+
+    def test_optional(self):
+        result = self.simulate_get('/optional')
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json, {'user': None})
+
+        result = self.simulate_get('/route')
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json, {'user': None})
+
+        result = self.simulate_get('/optional', headers=self.get_headers({'user_id': 'u1'}))
+        self.assertEqual(result.json, {'user': 'u1'})
+
+    def test_exempt(self):
+        result = self.simulate_get('/exempt', headers=self.get_headers({'user_id': 'u1'}))
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json, {'user': None})
@@ -0,0 +1,112 @@
+import gzip
+import json
+import unittest
+import zlib
+
+import falcon
+from falcon import testing
+
+from webapi import compression
+from webapi.compression import CompressionMiddleware, select_encoding
+from webapi.serializers import JSONHandler
+
+from .test_tasks import TestInitAPI
+
+LARGE = {'items': ['item {i}'.format(i=i) for i in range(1000)]}
+
+
+class ListResource:
+    def on_get(self, req, resp):
+        resp.media = LARGE
+
+
+class SmallResource:
+    def on_get(self, req, resp):
+        resp.media = {'id': 1}
+
+
+class TestSelectEncoding(unittest.TestCase):
+    def test_select(self):
+        self.assertEqual(select_encoding('gzip, deflate'), 'gzip')
+        self.assertEqual(select_encoding('deflate'), 'deflate')
+        self.assertEqual(select_encoding('gzip;q=0.5, deflate'), 'deflate')
+        self.assertEqual(select_encoding('gzip;q=0, *'), 'deflate')
+        self.assertEqual(select_encoding('br'), None)
+        self.assertEqual(select_encoding('identity'), None)
+        self.assertEqual(select_encoding(None), None)
+
+
+class TestCompressionMiddleware(testing.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.app = falcon.API(middleware=[CompressionMiddleware()])
+        self.app.add_route('/list', ListResource())
+        self.app.add_route('/small', SmallResource())
+
+    def test_gzip(self):
+        result = self.simulate_get('/list', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        self.assertEqual(result.headers['content-encoding'], 'gzip')
+        self.assertEqual(result.headers['vary'], 'Accept-Encoding')
+        self.assertEqual(json.loads(gzip.decompress(result.content).decode()), LARGE)
+
+    def test_deflate(self):
+        result = self.simulate_get('/list', headers={'Accept-Encoding': 'deflate'})
+
+        self.assertEqual(result.headers['content-encoding'], 'deflate')
+        self.assertEqual(json.loads(zlib.decompress(result.content).decode()), LARGE)
+
+    def test_not_accepted(self):
+        result = self.simulate_get('/list')
+
+        self.assertNotIn('content-encoding', result.headers)
+        self.assertEqual(result.json, LARGE)
+
+    def test_small_not_compressed(self):
+        result = self.simulate_get('/small', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertNotIn('content-encoding', result.headers)
+        self.assertEqual(result.json, {'id': 1})
+
+    def test_error_response(self):
+        result = self.simulate_get('/missing', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+
+class TestJSONHandler(unittest.TestCase):
+    def test_fallback(self):
+        handler = JSONHandler(libraries=[])
+
+        self.assertEqual(handler.library, 'json')
+        self.assertEqual(handler.serialize({'a': [1, 'б']}), '{"a":[1,"б"]}'.encode('utf-8'))
+        self.assertEqual(handler.deserialize(b'{"a": 1}'), {'a': 1})
+
+        with self.assertRaises(falcon.HTTPBadRequest):
+            handler.deserialize(b'{')
+
+    def test_fast_encoder_error(self):
+        handler = JSONHandler(libraries=[])
+
+        def dumps(media):
+            raise OverflowError('Invalid Nan value when encoding double')
+
+        handler._fast_dumps = dumps
+
+        self.assertEqual(handler.serialize({'loss': float('nan')}), b'{"loss":NaN}')
+
+
+class TestCompressionAPI(TestInitAPI):
+    def test_schema_etag(self):
+        headers = {'Accept-Encoding': 'gzip'}
+        result = self.simulate_get('/api/v1/schema/architecture', headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.headers['content-encoding'], 'gzip')
+        self.assertTrue(result.headers['etag'].startswith('W/"'))
+
+        headers['If-None-Match'] = result.headers['etag']
+        result = self.simulate_get('/api/v1/schema/architecture', headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_304)
@@ -0,0 +1,81 @@
+import falcon
+
+import metadata
+
+from .test_dataset import TestInitAPI
+
+
+class TestBulkDatasets(TestInitAPI):
+    URL = '/api/v1/datasets/bulk'
+
+    def test_bulk_no_auth(self):
+        result = self.simulate_post(self.URL, json={'items': [{'title': 'dataset'}]})
+
+        self.assertEqual(result.status, falcon.HTTP_401)
+
+    def test_bulk_create(self):
+        headers = self.get_auth_headers(self.create_token('u1'))
+        items = [{'title': 'dataset {n}'.format(n=n)} for n in range(50)] + [{'description': 'no title'}]
+
+        result = self.simulate_post(self.URL, json={'items': items}, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['errors'], 1)
+
+        statuses = [item['status'] for item in result.json['items']]
+        self.assertEqual(statuses, ['created'] * 50 + ['invalid'])
+
+        ids = [item['id'] for item in result.json['items'][:50]]
+        datasets = metadata.DatasetMetadata.objects(id__in=ids)
+        self.assertEqual(datasets.count(), 50)
+        self.assertTrue(all(dataset.base.owner == 'u1' and dataset.url == dataset.id for dataset in datasets))
+
+    def test_bulk_create_too_many(self):
+        headers = self.get_auth_headers(self.create_token('u1'))
+        items = [{'title': 'dataset'}] * (metadata.MAX_BULK_SIZE + 1)
+
+        result = self.simulate_post(self.URL, json={'items': items}, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_400)
+
+    def test_bulk_update(self):
+        d1 = self.create_dataset_metadata(False, 'u1')
+        d2 = self.create_dataset_metadata(False, 'u2')
+
+        headers = self.get_auth_headers(self.create_token('u1'))
+        items = [
+            {'id': d1.id, 'title': 'new title'},
+            {'id': d2.id, 'title': 'not my dataset'},
+            {'id': d1.id, 'category': 'unknown'}
+        ]
+
+        result = self.simulate_patch(self.URL, json={'items': items}, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        statuses = [item['status'] for item in result.json['items']]
+        self.assertEqual(statuses, ['updated', 'not_found', 'invalid'])
+
+        d1.reload()
+        self.assertEqual(d1.base.title, 'new title')
+
+        d2.reload()
+        self.assertEqual(d2.base.title, 'title')
+
+    def test_bulk_delete(self):
+        d1 = self.create_dataset_metadata(False, 'u1')
+        d2 = self.create_dataset_metadata(False, 'u1')
+        d2.status = metadata.dataset.PUBLISHED
+        d2.save()
+        d3 = self.create_dataset_metadata(False, 'u2')
+
+        headers = self.get_auth_headers(self.create_token('u1'))
+        ids = [d1.id, d2.id, d3.id]
+
+        result = self.simulate_delete(self.URL, json={'ids': ids}, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        statuses = [item['status'] for item in result.json['items']]
+        self.assertEqual(statuses, ['deleted', 'conflict', 'not_found'])
+
+        remaining = {dataset.id for dataset in metadata.DatasetMetadata.objects(id__in=ids)}
+        self.assertEqual(remaining, {d2.id, d3.id})
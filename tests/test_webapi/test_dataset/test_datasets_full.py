@@ -85,3 +85,50 @@ class TestDatasetssFull(TestInitAPI):
         query_string = 'from=1&number=-3'
         result = self.simulate_get('/api/v1/datasets/full', query_string=query_string)
         self.assertEqual(result.status, falcon.HTTP_400)
+
+    def test_query_cursor(self):
+        number = 25
+        ids = {self.create_dataset_metadata(True, 'u1').id for _ in range(number)}
+
+        received = []
+        query_string = 'number=10'
+
+        while True:
+            result = self.simulate_get('/api/v1/datasets/full', query_string=query_string)
+            self.assertEqual(result.status, falcon.HTTP_200)
+
+            received += [dataset['id'] for dataset in result.json['datasets']]
+
+            if not result.json['next']:
+                break
+
+            query_string = 'number=10&after={cursor}'.format(cursor=result.json['next'])
+
+        self.assertEqual(len(received), number)
+        self.assertEqual(set(received), ids)
+
+    def test_query_cursor_stable_on_insert(self):
+        [self.create_dataset_metadata(True, 'u1') for _ in range(10)]
+
+        result = self.simulate_get('/api/v1/datasets/full', query_string='number=5')
+        first_page = [dataset['id'] for dataset in result.json['datasets']]
+        cursor = result.json['next']
+
+        self.create_dataset_metadata(True, 'u1')
+
+        query_string = 'number=100&after={cursor}'.format(cursor=cursor)
+        result = self.simulate_get('/api/v1/datasets/full', query_string=query_string)
+        second_page = [dataset['id'] for dataset in result.json['datasets']]
+
+        self.assertFalse(set(first_page) & set(second_page))
+        self.assertIsNone(result.json['next'])
+
+    def test_query_invalid_cursor(self):
+        result = self.simulate_get('/api/v1/datasets/full', query_string='after=not-a-cursor')
+
+        self.assertEqual(result.status, falcon.HTTP_400)
+
+    def test_query_max_page_size(self):
+        result = self.simulate_get('/api/v1/datasets/full', query_string='number=100000')
+
+        self.assertEqual(result.status, falcon.HTTP_200)
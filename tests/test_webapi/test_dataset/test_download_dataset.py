@@ -0,0 +1,138 @@
+import falcon
+import h5py
+
+import manager
+import storage
+
+from .test_dataset import TestInitAPI
+
+
+class TestDownloadDataset(TestInitAPI):
+    def create_uploaded_dataset(self, is_public, owner):
+        dataset = self.create_dataset_metadata(is_public, owner)
+
+        test_file_path = storage.get_tmp_path('test')
+        with h5py.File(test_file_path, 'w') as f:
+            _ = f.create_dataset('x', shape=(10,))
+            _ = f.create_dataset('y', shape=(10,))
+
+        with open(test_file_path, 'rb') as f:
+            manager.save_dataset(dataset, f)
+
+        return dataset
+
+    def get_file_content(self, dataset):
+        with open(storage.get_dataset_path(dataset.url), 'rb') as f:
+            return f.read()
+
+    def test_download_public_dataset(self):
+        d1 = self.create_uploaded_dataset(True, 'u1')
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        result = self.simulate_get(url)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.content, self.get_file_content(d1))
+        self.assertEqual(result.headers['etag'], '"{hash}"'.format(hash=d1.base.hash))
+        self.assertEqual(result.headers['accept-ranges'], 'bytes')
+        self.assertIn('last-modified', result.headers)
+
+    def test_download_private_dataset_no_auth(self):
+        d1 = self.create_uploaded_dataset(False, 'u1')
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        result = self.simulate_get(url)
+
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+    def test_download_private_dataset_auth(self):
+        d1 = self.create_uploaded_dataset(False, 'u1')
+
+        token = self.create_token('u1')
+        headers = self.get_auth_headers(token)
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        result = self.simulate_get(url, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+
+    def test_download_not_uploaded_dataset(self):
+        d1 = self.create_dataset_metadata(True, 'u1')
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        result = self.simulate_get(url)
+
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+    def test_download_range(self):
+        d1 = self.create_uploaded_dataset(True, 'u1')
+        content = self.get_file_content(d1)
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        result = self.simulate_get(url, headers={'Range': 'bytes=10-19'})
+
+        self.assertEqual(result.status, falcon.HTTP_206)
+        self.assertEqual(result.content, content[10:20])
+        self.assertEqual(result.headers['content-range'], 'bytes 10-19/{size}'.format(size=len(content)))
+
+    def test_download_suffix_range(self):
+        d1 = self.create_uploaded_dataset(True, 'u1')
+        content = self.get_file_content(d1)
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        result = self.simulate_get(url, headers={'Range': 'bytes=-5'})
+
+        self.assertEqual(result.status, falcon.HTTP_206)
+        self.assertEqual(result.content, content[-5:])
+
+    def test_download_invalid_range(self):
+        d1 = self.create_uploaded_dataset(True, 'u1')
+        content = self.get_file_content(d1)
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        range = 'bytes={start}-'.format(start=len(content))
+        result = self.simulate_get(url, headers={'Range': range})
+
+        self.assertEqual(result.status, falcon.HTTP_416)
+
+    def test_download_not_modified(self):
+        d1 = self.create_uploaded_dataset(True, 'u1')
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        etag = self.simulate_get(url).headers['etag']
+        result = self.simulate_get(url, headers={'If-None-Match': etag})
+
+        self.assertEqual(result.status, falcon.HTTP_304)
+        self.assertEqual(result.content, b'')
+
+    def test_download_if_range_changed(self):
+        d1 = self.create_uploaded_dataset(True, 'u1')
+        content = self.get_file_content(d1)
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        headers = {
+            'Range': 'bytes=0-9',
+            'If-Range': '"old-hash"'
+        }
+        result = self.simulate_get(url, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.content, content)
+
+    def test_download_if_range_weak(self):
+        d1 = self.create_uploaded_dataset(True, 'u1')
+        content = self.get_file_content(d1)
+
+        url = '/api/v1/dataset/{id}/file'.format(id=d1.id)
+        etag = self.simulate_get(url).headers['etag']
+
+        result = self.simulate_get(url, headers={'Range': 'bytes=0-9', 'If-Range': etag})
+        self.assertEqual(result.status, falcon.HTTP_206)
+
+        # If-Range needs strong comparison, weak validator gets full file
+        result = self.simulate_get(url, headers={'Range': 'bytes=0-9', 'If-Range': 'W/' + etag})
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.content, content)
+
+        # If-None-Match uses weak comparison
+        result = self.simulate_get(url, headers={'If-None-Match': 'W/' + etag})
+        self.assertEqual(result.status, falcon.HTTP_304)
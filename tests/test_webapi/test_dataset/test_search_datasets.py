@@ -0,0 +1,55 @@
+import falcon
+
+import metadata
+
+from .test_dataset import TestInitAPI
+
+
+class TestSearchDatasets(TestInitAPI):
+    URL = '/api/v1/datasets/search'
+
+    def test_search_no_auth(self):
+        self.create_dataset_metadata(True, 'u1')
+        self.create_dataset_metadata(False, 'u1')
+
+        result = self.simulate_get(self.URL)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(len(result.json['datasets']), 1)
+        self.assertNotIn('facets', result.json)
+
+    def test_search_facets(self):
+        d1 = self.create_dataset_metadata(True, 'u1')
+        self.create_dataset_metadata(False, 'u1')
+        self.create_dataset_metadata(True, 'u2')
+
+        headers = self.get_auth_headers(self.create_token('u1'))
+        params = {'owner': 'u1', 'is_public': 'true', 'facets': 'owner,is_public', 'fields': 'id,title'}
+
+        result = self.simulate_get(self.URL, params=params, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['datasets'], [{'id': d1.id, 'title': 'title'}])
+        self.assertEqual(result.json['facets']['owner'], [{'value': 'u1', 'count': 1}, {'value': 'u2', 'count': 1}])
+        self.assertEqual(result.json['facets']['is_public'], [{'value': False, 'count': 1}, {'value': True, 'count': 1}])
+
+    def test_search_pages(self):
+        for _ in range(3):
+            self.create_dataset_metadata(True, 'u1')
+
+        params = {'sort': '-date', 'number': 2}
+        result = self.simulate_get(self.URL, params=params)
+
+        self.assertEqual(len(result.json['datasets']), 2)
+        self.assertIsNotNone(result.json['next'])
+
+        params['after'] = result.json['next']
+        result = self.simulate_get(self.URL, params=params)
+
+        self.assertEqual(len(result.json['datasets']), 1)
+        self.assertIsNone(result.json['next'])
+
+    def test_search_bad_params(self):
+        for params in ({'sort': 'title'}, {'sort': 'relevance'}, {'facets': 'title'}, {'is_public': 'maybe'}):
+            result = self.simulate_get(self.URL, params=params)
+            self.assertEqual(result.status, falcon.HTTP_400, params)
@@ -31,6 +31,7 @@ class TestInitAPI(testing.TestCase):
         super().setUp()
 
         connect('metaddata', host='mongomock://localhost', alias='metadata')
+        metadata.Counter.objects.delete()
 
         test_dir = tempfile.mkdtemp('test_home')
         storage.from_config({
@@ -0,0 +1,122 @@
+import json
+import logging
+import threading
+import unittest
+
+import falcon
+from falcon import testing
+
+from webapi.loggingmiddleware import AccessLogMiddleware
+from webapi.logqueue import RecordQueue, start_queue_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.add(threading.get_ident())
+
+
+class ItemResource:
+    def on_get(self, req, resp, id):
+        resp.media = {'id': id}
+
+
+class ErrorResource:
+    def on_get(self, req, resp):
+        raise falcon.HTTPServiceUnavailable('Unavailable', 'Service unavailable', 1)
+
+
+class TestQueueLogging(unittest.TestCase):
+    def test_records_written_by_listener_thread(self):
+        logger = logging.getLogger('test.logqueue')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+
+        handler = ListHandler()
+        listener = start_queue_logging(logger, [handler])
+
+        try:
+            for i in range(10):
+                logger.info('message {i}'.format(i=i))
+        finally:
+            listener.stop()
+            logger.handlers.clear()
+
+        self.assertEqual([record.getMessage() for record in handler.records],
+                         ['message {i}'.format(i=i) for i in range(10)])
+        self.assertNotIn(threading.get_ident(), handler.threads)
+
+    def test_queue_drops_oldest(self):
+        record_queue = RecordQueue(size=2)
+
+        for i in range(3):
+            record_queue.put_nowait(i)
+
+        self.assertEqual(len(record_queue), 2)
+        self.assertEqual(record_queue.get(block=False), 1)
+
+
+class TestAccessLog(testing.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.handler = ListHandler()
+        self.logger = logging.getLogger('test.access')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+
+        self.middleware = AccessLogMiddleware(self.logger, route_sample_rates={'/item/{id}': 0.0})
+
+        self.app = falcon.API(middleware=[self.middleware])
+        self.app.add_route('/item/{id}', ItemResource())
+        self.app.add_route('/error', ErrorResource())
+        self.app.add_route('/other/{id}', ItemResource())
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        super().tearDown()
+
+    def get_records(self):
+        return [json.loads(record.getMessage()) for record in self.handler.records]
+
+    def test_record(self):
+        self.simulate_get('/other/1')
+
+        records = self.get_records()
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(len(self.handler.records[0].getMessage().splitlines()), 1)
+        self.assertEqual(records[0]['method'], 'GET')
+        self.assertEqual(records[0]['route'], '/other/{id}')
+        self.assertEqual(records[0]['path'], '/other/1')
+        self.assertEqual(records[0]['status'], 200)
+        self.assertGreaterEqual(records[0]['latency_ms'], 0)
+        self.assertEqual(records[0]['sample_rate'], 1.0)
+
+    def test_route_sampling(self):
+        for i in range(5):
+            self.simulate_get('/item/{i}'.format(i=i))
+
+        self.assertEqual(self.get_records(), [])
+
+    def test_errors_logged_always(self):
+        self.middleware.sample_rate = 0.0
+
+        self.simulate_get('/error')
+
+        records = self.get_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['status'], 503)
+
+    def test_slow_logged_always(self):
+        self.middleware.slow_request_time = 0.0
+
+        self.simulate_get('/item/1')
+
+        self.assertEqual(len(self.get_records()), 1)
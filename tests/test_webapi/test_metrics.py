@@ -0,0 +1,132 @@
+import unittest
+from types import SimpleNamespace
+
+import falcon
+from falcon import testing
+
+from webapi import metrics
+
+from .test_tasks import TestInitAPI
+
+
+class ItemResource:
+    def on_get(self, req, resp, id):
+        # mongo command of request
+        metrics.MongoCommandListener().succeeded(SimpleNamespace(command_name='find', duration_micros=2000))
+        resp.media = {'id': id}
+
+    def on_post(self, req, resp, id):
+        resp.media = {'size': len(req.bounded_stream.read())}
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = metrics.Registry()
+
+    def test_counter(self):
+        counter = self.registry.counter('requests_total', 'Requests', ('route',))
+        counter.inc('/a')
+        counter.inc('/a', amount=2)
+
+        self.assertEqual(counter.get('/a'), 3)
+        self.assertIn('requests_total{route="/a"} 3.0', self.registry.expose())
+
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+    def test_histogram(self):
+        histogram = self.registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        text = self.registry.expose()
+
+        self.assertIn('# TYPE latency_seconds histogram', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1.0', text)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 2.0', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3.0', text)
+        self.assertIn('latency_seconds_count 3.0', text)
+        self.assertEqual(histogram.get(), (3, 5.55))
+
+    def test_label_escaping(self):
+        gauge = self.registry.gauge('value', 'Value', ('name',))
+        gauge.inc('a"b')
+
+        self.assertIn('value{name="a\\"b"} 1.0', self.registry.expose())
+
+
+class TestTaskPublishTimer(unittest.TestCase):
+    def test_publish_duration(self):
+        metrics.TASK_SEND_DURATION.clear()
+        timer = metrics.TaskPublishTimer()
+
+        timer.before(sender='model.train', headers={'id': 't1'})
+        timer.after(sender='model.train', headers={'id': 't1'})
+
+        self.assertEqual(metrics.TASK_SEND_DURATION.get('model.train')[0], 1)
+        self.assertEqual(len(timer), 0)
+
+    def test_failed_publishes_are_evicted(self):
+        timer = metrics.TaskPublishTimer(size=3, expire=60)
+
+        # publishes without after_task_publish
+        for id in ['t1', 't2', 't3', 't4']:
+            timer.before(sender='model.train', headers={'id': id})
+
+        self.assertEqual(list(timer._starts), ['t2', 't3', 't4'])
+
+        timer.expire = 0
+        timer.before(sender='model.train', headers={'id': 't5'})
+
+        self.assertEqual(len(timer), 0)
+
+
+class TestMetricsMiddleware(testing.TestCase):
+    def setUp(self):
+        super().setUp()
+        metrics.REGISTRY.clear()
+
+        self.app = falcon.API(middleware=[metrics.MetricsMiddleware()])
+        self.app.add_route('/item/{id}', ItemResource())
+        self.app.add_route('/metrics', metrics.MetricsResource())
+
+    def test_request_metrics(self):
+        self.simulate_get('/item/1')
+        self.simulate_get('/item/2')
+        self.simulate_get('/missing')
+
+        self.assertEqual(metrics.REQUESTS.get('GET', '/item/{id}', '200'), 2)
+        self.assertEqual(metrics.REQUESTS.get('GET', metrics.UNMATCHED_ROUTE, '404'), 1)
+        self.assertEqual(metrics.REQUEST_DURATION.get('GET', '/item/{id}')[0], 2)
+        self.assertEqual(metrics.REQUESTS_IN_FLIGHT.get(), 0)
+
+        self.assertEqual(metrics.REQUEST_MONGO_COMMANDS.get('/item/{id}'), (2, 2.0))
+        self.assertAlmostEqual(metrics.REQUEST_MONGO_DURATION.get('/item/{id}')[1], 0.004)
+        self.assertEqual(metrics.MONGO_COMMANDS.get('find', 'success'), 2)
+
+    def test_upload_metrics(self):
+        self.simulate_post('/item/1', body=b'x' * 100, headers={'Content-Type': 'multipart/form-data; boundary=b'})
+
+        self.assertEqual(metrics.UPLOAD_BYTES.get('/item/{id}'), 100)
+        self.assertEqual(metrics.UPLOAD_THROUGHPUT.get('/item/{id}')[0], 1)
+
+    def test_metrics_resource(self):
+        self.simulate_get('/item/1')
+
+        result = self.simulate_get('/metrics')
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertTrue(result.headers['content-type'].startswith('text/plain'))
+        self.assertIn('webapi_requests_total{method="GET",route="/item/{id}",status="200"} 1.0', result.text)
+        self.assertIn('# TYPE webapi_request_duration_seconds histogram', result.text)
+
+
+class TestMetricsRoute(TestInitAPI):
+    def test_metrics_no_auth(self):
+        self.simulate_get('/api/v1/tasks')
+
+        result = self.simulate_get('/metrics')
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertIn('route="/api/v1/tasks"', result.text)
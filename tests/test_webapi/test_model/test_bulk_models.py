@@ -0,0 +1,33 @@
+import falcon
+
+import metadata
+
+from .test_model import TestInitAPI
+
+
+class TestBulkModels(TestInitAPI):
+    URL = '/api/v1/models/bulk'
+
+    def test_bulk_create(self):
+        dataset = self.create_dataset_metadata(False, 'u1')
+        architecture = self.create_arch_metadata(False, 'u1')
+        others_dataset = self.create_dataset_metadata(False, 'u2')
+
+        headers = self.get_auth_headers(self.create_token('u1'))
+        items = [
+            {'title': 'model 1', 'dataset': dataset.id, 'architecture': architecture.id},
+            {'title': 'model 2', 'dataset': others_dataset.id, 'architecture': architecture.id},
+            {'title': 'model 3', 'dataset': dataset.id, 'architecture': architecture.id}
+        ]
+
+        result = self.simulate_post(self.URL, json={'items': items}, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        statuses = [item['status'] for item in result.json['items']]
+        self.assertEqual(statuses, ['created', 'not_found', 'created'])
+
+        model = metadata.ModelMetadata.objects.get(id=result.json['items'][0]['id'])
+        self.assertEqual(model.base.owner, 'u1')
+        self.assertEqual(model.base.dataset.id, dataset.id)
+        self.assertEqual(model.base.dataset_title, dataset.base.title)
+        self.assertEqual(model.base.architecture_title, architecture.title)
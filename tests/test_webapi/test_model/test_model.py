@@ -24,6 +24,7 @@ class TestInitAPI(testing.TestCase):
         super().setUp()
 
         connect('metaddata', host='mongomock://localhost', alias='metadata')
+        metadata.Counter.objects.delete()
         config = {
             "auth_key_file": "config/auth.key",
             "celery_config": "config/celery_config.json",
@@ -73,3 +73,29 @@ class TestModelsFull(TestInitAPI):
         query_string = 'from=1&number=-3'
         result = self.simulate_get('/api/v1/models/full', query_string=query_string)
         self.assertEqual(result.status, falcon.HTTP_400)
+
+    def test_denormalized_fields(self):
+        m1 = self.create_model_metadata(True, 'u1')
+
+        result = self.simulate_get('/api/v1/models/full')
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['models'][0]['dataset_title'], m1.base.dataset.base.title)
+        self.assertEqual(result.json['models'][0]['architecture_title'], m1.base.architecture.title)
+
+    def test_query_expand(self):
+        m1 = self.create_model_metadata(True, 'u1')
+
+        query_string = 'expand=dataset,architecture'
+        result = self.simulate_get('/api/v1/models/full', query_string=query_string)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+
+        model = result.json['models'][0]
+        self.assertEqual(model['dataset']['id'], m1.base.dataset.id)
+        self.assertEqual(model['architecture']['title'], m1.base.architecture.title)
+
+    def test_query_expand_unknown(self):
+        result = self.simulate_get('/api/v1/models/full', query_string='expand=owner')
+
+        self.assertEqual(result.status, falcon.HTTP_400)
@@ -0,0 +1,129 @@
+import io
+import uuid
+
+import falcon
+import h5py
+import numpy
+
+import metadata
+import storage
+
+from .test_model import TestInitAPI
+
+
+class TestPredictResultQuery(TestInitAPI):
+    def tearDown(self):
+        super().tearDown()
+        metadata.TaskMetadata.objects.all().delete()
+
+    def create_predict_task(self, owner, y):
+        result_name = str(uuid.uuid4())
+
+        with storage.open_dataset(result_name, 'w', prefix='tmp') as h5:
+            h5.create_dataset('y', data=y)
+
+        task = metadata.TaskMetadata()
+        task.owner = owner
+        task.command = metadata.task.MODEL_PREDICT
+        task.status = metadata.task.SUCCESS
+        task.history = {'result': result_name}
+        task.save()
+
+        return task
+
+    def query(self, task, user_id='u1', **params):
+        token = self.create_token(user_id)
+        headers = self.get_auth_headers(token)
+        url = '/api/v1/model/predict/{tid}/result/query'.format(tid=task.id)
+
+        return self.simulate_get(url, headers=headers, params=params)
+
+    def test_query_slice(self):
+        y = numpy.random.rand(50, 4).astype(numpy.float32)
+        task = self.create_predict_task('u1', y)
+
+        result = self.query(task, **{'from': 10, 'number': 5})
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['total'], 50)
+        self.assertEqual(result.json['from'], 10)
+        numpy.testing.assert_allclose(result.json['y'], y[10:15], rtol=1e-6)
+
+    def test_query_slice_out_of_range(self):
+        task = self.create_predict_task('u1', numpy.zeros((5, 2)))
+
+        result = self.query(task, **{'from': 10})
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['y'], [])
+
+    def test_query_argmax(self):
+        y = numpy.random.rand(20, 6)
+        task = self.create_predict_task('u1', y)
+
+        result = self.query(task, reduce='argmax')
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['y'], numpy.argmax(y, axis=-1).tolist())
+
+    def test_query_topk(self):
+        y = numpy.random.rand(20, 6)
+        task = self.create_predict_task('u1', y)
+
+        result = self.query(task, reduce='topk', k=2)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['indices'], numpy.argsort(-y, axis=-1)[:, :2].tolist())
+        numpy.testing.assert_allclose(result.json['values'], -numpy.sort(-y, axis=-1)[:, :2])
+
+    def test_query_npy(self):
+        y = numpy.random.rand(20, 3)
+        task = self.create_predict_task('u1', y)
+
+        result = self.query(task, format='npy', number=3)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.headers['x-total-count'], '20')
+        numpy.testing.assert_array_equal(numpy.load(io.BytesIO(result.content)), y[:3])
+
+    def test_query_npz_topk(self):
+        y = numpy.random.rand(20, 3)
+        task = self.create_predict_task('u1', y)
+
+        result = self.query(task, format='npz', reduce='topk', k=1)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        arrays = numpy.load(io.BytesIO(result.content))
+        numpy.testing.assert_array_equal(arrays['indices'][:, 0], numpy.argmax(y, axis=-1))
+
+    def test_query_npy_topk(self):
+        task = self.create_predict_task('u1', numpy.zeros((5, 2)))
+
+        result = self.query(task, format='npy', reduce='topk')
+
+        self.assertEqual(result.status, falcon.HTTP_400)
+
+    def test_query_bad_params(self):
+        task = self.create_predict_task('u1', numpy.zeros((5, 2)))
+
+        self.assertEqual(self.query(task, number=-1).status, falcon.HTTP_400)
+        self.assertEqual(self.query(task, number=100000).status, falcon.HTTP_400)
+        self.assertEqual(self.query(task, reduce='mean').status, falcon.HTTP_400)
+        self.assertEqual(self.query(task, format='csv').status, falcon.HTTP_400)
+
+    def test_query_other_user(self):
+        task = self.create_predict_task('u1', numpy.zeros((5, 2)))
+
+        result = self.query(task, user_id='u2')
+
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+    def test_query_not_completed(self):
+        task = metadata.TaskMetadata()
+        task.owner = 'u1'
+        task.command = metadata.task.MODEL_PREDICT
+        task.save()
+
+        result = self.query(task)
+
+        self.assertEqual(result.status, falcon.HTTP_404)
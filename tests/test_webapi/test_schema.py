@@ -0,0 +1,58 @@
+import json
+
+import falcon
+from falcon import testing
+
+import webapi
+from webapi.apiv1.schema import dataset
+from webapi.apiv1.schema import layers
+
+
+class TestSchema(testing.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        config = {
+            "auth_key_file": "config/auth.key",
+            "metadata_config": {},
+        }
+        self.app = webapi.main(config)
+
+    def test_schema_etag(self):
+        result = self.simulate_get('/api/v1/schema/dataset')
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json, json.loads(json.dumps(dataset.CREATE_DATASET_SCHEMA)))
+
+        etag = result.headers['etag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn('max-age', result.headers['cache-control'])
+
+        result = self.simulate_get('/api/v1/schema/dataset', headers={'If-None-Match': etag})
+
+        self.assertEqual(result.status, falcon.HTTP_304)
+        self.assertEqual(result.content, b'')
+
+        result = self.simulate_get('/api/v1/schema/dataset', headers={'If-None-Match': '"other"'})
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+
+    def test_versioned_schema(self):
+        result = self.simulate_get('/api/v1/schema/model/layers')
+        url = result.headers['content-location']
+
+        index = self.simulate_get('/api/v1/schema')
+        self.assertEqual(index.json['model/layers'], url)
+        self.assertEqual(len(index.json), 8)
+
+        result = self.simulate_get(url)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(len(result.json), len(layers.LAYERS))
+        self.assertIn('immutable', result.headers['cache-control'])
+        self.assertEqual(result.headers['etag'], '"{hash}"'.format(hash=url.rsplit('/', 1)[1]))
+
+    def test_unknown_version(self):
+        result = self.simulate_get('/api/v1/schema/content/unknown')
+
+        self.assertEqual(result.status, falcon.HTTP_404)
@@ -0,0 +1,30 @@
+import falcon
+
+import metadata
+from metadata import summary
+
+from .test_tasks import TestInitAPI
+
+
+class TestSummary(TestInitAPI):
+    def setUp(self):
+        super().setUp()
+        summary.SUMMARY_CACHE.clear()
+
+    def test_summary_no_auth(self):
+        result = self.simulate_get('/api/v1/summary')
+
+        self.assertEqual(result.status, falcon.HTTP_401)
+
+    def test_summary(self):
+        self.create_task_metadata('u1')
+        self.create_task_metadata('u2')
+
+        headers = self.get_auth_headers(self.create_token('u1'))
+        result = self.simulate_get('/api/v1/summary', headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(set(result.json), {'datasets', 'architectures', 'models', 'tasks', 'storage'})
+        self.assertEqual(result.json['tasks']['total'], 1)
+        self.assertEqual(result.json['tasks']['status'], {metadata.task.PENDING: 1})
+        self.assertEqual(len(result.json['tasks']['active']), 1)
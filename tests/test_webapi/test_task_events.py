@@ -0,0 +1,121 @@
+import threading
+import time
+
+import falcon
+
+import metadata
+from metadata import feed
+from webapi.apiv1.resources import task as task_resource
+
+from .test_tasks import TestInitAPI
+
+
+def parse_events(text):
+    events = []
+
+    for block in text.split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if line and not line.startswith(':'))
+
+        if 'event' in lines:
+            events.append((lines['event'], lines['data']))
+
+    return events
+
+
+class TestStateEvents(TestInitAPI):
+    def test_get_state_events(self):
+        events = task_resource.get_state_events(
+            't1',
+            {'status': 'STARTED', 'epochs': 10, 'current_epoch': 1},
+            {'status': 'STARTED', 'epochs': 10, 'current_epoch': 5})
+
+        self.assertEqual(events, [('progress', {'id': 't1', 'current_epoch': 5, 'progress': 0.5})])
+
+        events = task_resource.get_state_events('t1', {'status': 'STARTED'}, {'status': 'SUCCESS'})
+
+        self.assertEqual(events, [('status', {'id': 't1', 'status': 'SUCCESS'})])
+
+    def test_iter_task_events(self):
+        task_feed = feed.TaskFeed(source=feed.POLL)
+        subscription = feed.Subscription('t1')
+        task_feed._subscriptions['t1'] = {subscription}
+
+        subscription.put({'status': 'STARTED', 'epochs': 2, 'current_epoch': 1})
+        events = task_resource.iter_task_events(task_feed, subscription, {'status': 'PENDING'}, heartbeat=0.01)
+
+        self.assertTrue(next(events).startswith(b'retry: '))
+        self.assertIn(b'"status":"PENDING"', next(events))
+        self.assertIn(b'event: progress', next(events))
+        self.assertIn(b'"status":"STARTED"', next(events))
+        self.assertEqual(next(events), b': keep-alive\n\n')
+
+        subscription.put(feed.DELETED)
+        self.assertIn(b'event: deleted', next(events))
+
+        with self.assertRaises(StopIteration):
+            next(events)
+
+        self.assertEqual(task_feed.subscribed(), [])
+
+
+class TestTaskEvents(TestInitAPI):
+    def setUp(self):
+        super().setUp()
+        metadata.TASK_FEED.source = feed.POLL
+        metadata.TASK_FEED.poll_interval = 0.01
+
+    def tearDown(self):
+        metadata.TASK_FEED.poll_interval = feed.DEFAULT_POLL_INTERVAL
+        super().tearDown()
+
+    def test_no_auth(self):
+        task = self.create_task_metadata('u1')
+
+        result = self.simulate_get('/api/v1/task/{id}/events'.format(id=task.id))
+
+        self.assertEqual(result.status, falcon.HTTP_401)
+
+    def test_not_found(self):
+        task = self.create_task_metadata('u1')
+        headers = self.get_auth_headers(self.create_token('u2'))
+
+        result = self.simulate_get('/api/v1/task/{id}/events'.format(id=task.id), headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_404)
+        self.assertEqual(metadata.TASK_FEED.subscribed(), [])
+
+    def test_finished_task(self):
+        task = self.create_task_metadata('u1')
+        with task.save_context():
+            task.status = metadata.task.SUCCESS
+
+        headers = self.get_auth_headers(self.create_token('u1'))
+        result = self.simulate_get('/api/v1/task/{id}/events'.format(id=task.id), headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertTrue(result.headers['content-type'].startswith('text/event-stream'))
+        self.assertEqual(parse_events(result.text), [('status', '{"id":"%s","status":"SUCCESS"}' % task.id)])
+
+    def test_progress_stream(self):
+        task = self.create_task_metadata('u1')
+
+        def run_task():
+            time.sleep(0.05)
+            metadata.set_progress(task.id, epochs=2, current_epoch=1)
+            time.sleep(0.05)
+            metadata.TaskMetadata.objects(id=task.id).update_one(set__status=metadata.task.SUCCESS)
+
+        thread = threading.Thread(target=run_task)
+        thread.start()
+
+        headers = self.get_auth_headers(self.create_token('u1'))
+        result = self.simulate_get('/api/v1/task/{id}/events'.format(id=task.id), headers=headers)
+        thread.join()
+
+        events = [event for event, data in parse_events(result.text)]
+
+        self.assertEqual(events[0], 'status')
+        self.assertIn('progress', events)
+        self.assertEqual(events[-1], 'status')
+        self.assertIn('"status":"SUCCESS"', parse_events(result.text)[-1][1])
+        self.assertEqual(metadata.TASK_FEED.subscribed(), [])
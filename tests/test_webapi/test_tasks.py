@@ -24,6 +24,7 @@ class TestInitAPI(testing.TestCase):
         super().setUp()
 
         connect('metaddata', host='mongomock://localhost', alias='metadata')
+        metadata.Counter.objects.delete()
         config = {
             "auth_key_file": "config/auth.key",
             "celery_config": "config/celery_config.json",
@@ -63,7 +64,7 @@ class TestModels(TestInitAPI):
         result = self.simulate_get('/api/v1/tasks', headers=headers)
 
         self.assertEqual(result.status, falcon.HTTP_200)
-        self.assertEqual(list(result.json.keys()), ['ids'])
+        self.assertEqual(sorted(result.json.keys()), ['ids', 'next'])
 
     def test_many_tasks_auth(self):
         user_id = 'u1'
@@ -106,6 +107,17 @@ class TestModels(TestInitAPI):
         # validate code
         self.assertEqual(result.status, falcon.HTTP_401)
 
+    def test_get_task_fields(self):
+        t1 = self.create_task_metadata('u1')
+
+        token = self.create_token('u1')
+        headers = self.get_auth_headers(token)
+        url = '/api/v1/task/{id}'.format(id=t1.id)
+        result = self.simulate_get(url, query_string='fields=command', headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json, {'command': metadata.task.MODEL_TRAIN})
+
     def test_get_task_does_not_exist(self):
         token = self.create_token('u1')
         headers = self.get_auth_headers(token)
@@ -243,6 +255,27 @@ class TestTasksFull(TestInitAPI):
         result = self.simulate_get('/api/v1/tasks/full', query_string=query_string, headers=headers)
         self.assertEqual(result.status, falcon.HTTP_400)
 
+    def test_query_fields(self):
+        t1 = self.create_task_metadata('u1')
+
+        token = self.create_token('u1')
+        headers = self.get_auth_headers(token)
+
+        query_string = 'fields=id,status'
+        result = self.simulate_get('/api/v1/tasks/full', query_string=query_string, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['tasks'], [{'id': t1.id, 'status': t1.status}])
+
+    def test_query_unknown_fields(self):
+        token = self.create_token('u1')
+        headers = self.get_auth_headers(token)
+
+        query_string = 'fields=id,history'
+        result = self.simulate_get('/api/v1/tasks/full', query_string=query_string, headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_400)
+
 
 class TestTasksNumber(TestInitAPI):
     def test_get_number_of_empty(self):
@@ -293,3 +326,44 @@ class TestTasksNumber(TestInitAPI):
         self.assertEqual(result.status, falcon.HTTP_200)
 
         self.assertEqual(result.json, number)
+
+    def test_get_task_history(self):
+        task = self.create_task_metadata('u1')
+        points = [{'step': step, 'loss': 1.0 / (step + 1)} for step in range(10)]
+        metadata.append_history(task.id, 'epoch', points)
+
+        token = self.create_token('u1')
+        headers = self.get_auth_headers(token)
+        url = '/api/v1/task/{id}/history'.format(id=task.id)
+        result = self.simulate_get(url, query_string='from=2&to=5', headers=headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['kind'], 'epoch')
+        self.assertEqual(result.json['points'], points[2:5])
+
+        result = self.simulate_get(url, query_string='kind=unknown', headers=headers)
+        self.assertEqual(result.status, falcon.HTTP_400)
+
+        # other user
+        token = self.create_token('u2')
+        headers = self.get_auth_headers(token)
+        result = self.simulate_get(url, headers=headers)
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+        metadata.delete_history(task.id)
+
+    def test_get_number_by_status(self):
+        tasks = [self.create_task_metadata('u1') for _ in range(3)]
+
+        with tasks[0].save_context():
+            tasks[0].status = metadata.task.SUCCESS
+
+        token = self.create_token('u1')
+        headers = self.get_auth_headers(token)
+
+        result = self.simulate_get('/api/v1/tasks/number', query_string='status=SUCCESS', headers=headers)
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json, 1)
+
+        result = self.simulate_get('/api/v1/tasks/number', query_string='status=UNKNOWN', headers=headers)
+        self.assertEqual(result.status, falcon.HTTP_400)
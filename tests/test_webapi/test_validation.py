@@ -0,0 +1,78 @@
+import unittest
+
+from jsonschema import Draft4Validator
+
+from webapi.apiv1 import validation
+from webapi.apiv1.schema.architecture import CREATE_ARCHITECTURE_SCHEMA
+from webapi.apiv1.schema.layers import LAYERS
+
+
+def create_architecture(layers):
+    return {
+        'title': 'title',
+        'architecture': {
+            'layers': layers
+        }
+    }
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self):
+        self.validator = validation.compile_validator(CREATE_ARCHITECTURE_SCHEMA)
+        self.original = Draft4Validator(CREATE_ARCHITECTURE_SCHEMA)
+
+    def test_discriminate_layers(self):
+        schema = validation.discriminate(CREATE_ARCHITECTURE_SCHEMA)
+        items = schema['properties']['architecture']['properties']['layers']['items']
+
+        self.assertNotIn('oneOf', items)
+        self.assertEqual(len(items['discriminator']), len(LAYERS))
+        self.assertIs(items['discriminator']['Dense']['properties']['config']['properties']['units']['minimum'], 1)
+
+        # published schema is not changed
+        self.assertIn('oneOf', CREATE_ARCHITECTURE_SCHEMA['properties']['architecture']['properties']['layers']['items'])
+
+    def test_not_discriminate_other_one_of(self):
+        schema = {'oneOf': [{'type': 'string'}, {'type': 'integer'}]}
+
+        self.assertEqual(validation.discriminate(schema), schema)
+
+    def test_valid_architecture(self):
+        instance = create_architecture([
+            {'name': 'Dense', 'config': {'units': 3}},
+            {'name': 'Dropout', 'config': {'rate': 0.5}},
+            {'name': 'Flatten', 'config': {}}
+        ])
+
+        self.assertIsNone(validation.get_error(self.validator, instance))
+        self.assertTrue(self.original.is_valid(instance))
+
+    def test_error_path(self):
+        layers = [{'name': 'Dense', 'config': {'units': 3}}] * 3 + [{'name': 'Dense', 'config': {'units': 0}}]
+        error = validation.get_error(self.validator, create_architecture(layers))
+
+        self.assertEqual(error, 'architecture.layers[3].config.units: 0 is less than the minimum of 1')
+
+    def test_unknown_layer(self):
+        instance = create_architecture([{'name': 'Unknown', 'config': {}}])
+        error = validation.get_error(self.validator, instance)
+
+        self.assertTrue(error.startswith("architecture.layers[0].name: 'Unknown' is not one of"))
+        self.assertFalse(self.original.is_valid(instance))
+
+    def test_same_validity_as_one_of(self):
+        instances = [
+            create_architecture([{'name': 'Dense'}]),
+            create_architecture([{'config': {'units': 1}}]),
+            create_architecture(['Dense']),
+            create_architecture([{'name': 'Dense', 'config': {'units': 1}, 'extra': 1}]),
+            create_architecture([{'name': 'Conv2D', 'config': {'filters': 1, 'kernel_size': [3, 3]}}])
+        ]
+
+        for instance in instances:
+            valid = validation.get_error(self.validator, instance) is None
+            self.assertEqual(valid, self.original.is_valid(instance), instance)
+
+    def test_format_path(self):
+        self.assertEqual(validation.format_path(['a', 0, 'b']), 'a[0].b')
+        self.assertEqual(validation.format_path([]), '')
@@ -0,0 +1,126 @@
+import falcon
+
+import metadata
+from metadata import webhook
+
+from .test_tasks import TestInitAPI
+
+
+class TestWebhooks(TestInitAPI):
+    def setUp(self):
+        super().setUp()
+
+        self.headers = self.get_auth_headers(self.create_token('u1'))
+
+    def tearDown(self):
+        super().tearDown()
+
+        metadata.WebhookMetadata.objects.all().delete()
+        metadata.WebhookDelivery.objects.all().delete()
+
+    def create_webhook(self, json=None):
+        json = json or {'url': 'https://example.com/hook'}
+
+        return self.simulate_post('/api/v1/webhook', json=json, headers=self.headers)
+
+    def test_create_no_auth(self):
+        result = self.simulate_post('/api/v1/webhook', json={'url': 'https://example.com/hook'})
+
+        self.assertEqual(result.status, falcon.HTTP_401)
+
+    def test_create(self):
+        result = self.create_webhook()
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['url'], 'https://example.com/hook')
+        self.assertIsNone(result.json['task'])
+        self.assertEqual(result.json['events'], webhook.DEFAULT_EVENTS)
+        self.assertTrue(result.json['secret'])
+
+        # secret is returned only on creation
+        result = self.simulate_get('/api/v1/webhook/' + result.json['id'], headers=self.headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertNotIn('secret', result.json)
+
+    def test_create_invalid_schema(self):
+        result = self.create_webhook({'url': 'ftp://example.com/hook'})
+        self.assertEqual(result.status, falcon.HTTP_400)
+
+        result = self.create_webhook({'url': 'https://example.com/hook', 'events': ['DONE']})
+        self.assertEqual(result.status, falcon.HTTP_400)
+
+    def test_create_for_task(self):
+        task = self.create_task_metadata('u1')
+        json = {'url': 'https://example.com/hook', 'task': task.id, 'events': ['STARTED']}
+
+        result = self.create_webhook(json)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(result.json['task'], task.id)
+        self.assertEqual(result.json['events'], ['STARTED'])
+
+    def test_create_for_others_task(self):
+        task = self.create_task_metadata('u2')
+
+        result = self.create_webhook({'url': 'https://example.com/hook', 'task': task.id})
+
+        self.assertEqual(result.status, falcon.HTTP_404)
+        self.assertEqual(metadata.WebhookMetadata.objects.count(), 0)
+
+    def test_get_others(self):
+        webhook_id = self.create_webhook().json['id']
+        headers = self.get_auth_headers(self.create_token('u2'))
+
+        result = self.simulate_get('/api/v1/webhook/' + webhook_id, headers=headers)
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+        result = self.simulate_delete('/api/v1/webhook/' + webhook_id, headers=headers)
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+        result = self.simulate_get('/api/v1/webhooks', headers=headers)
+        self.assertEqual(result.json['webhooks'], [])
+
+    def test_list_and_delete(self):
+        ids = [self.create_webhook().json['id'] for _ in range(2)]
+
+        result = self.simulate_get('/api/v1/webhooks', headers=self.headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        self.assertEqual(sorted(hook['id'] for hook in result.json['webhooks']), sorted(ids))
+
+        result = self.simulate_delete('/api/v1/webhook/' + ids[0], headers=self.headers)
+        self.assertEqual(result.status, falcon.HTTP_200)
+
+        result = self.simulate_get('/api/v1/webhook/' + ids[0], headers=self.headers)
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+    def test_deliveries(self):
+        webhook_id = self.create_webhook().json['id']
+        task = self.create_task_metadata('u1')
+
+        with task.save_context():
+            task.status = metadata.task.SUCCESS
+
+        result = self.simulate_get('/api/v1/webhook/{id}/deliveries'.format(id=webhook_id), headers=self.headers)
+
+        self.assertEqual(result.status, falcon.HTTP_200)
+        deliveries = result.json['deliveries']
+        self.assertEqual(len(deliveries), 1)
+        self.assertEqual(deliveries[0]['status'], webhook.PENDING)
+        self.assertEqual(deliveries[0]['event']['task'], task.id)
+        self.assertEqual(deliveries[0]['event']['status'], metadata.task.SUCCESS)
+
+    def test_wrong_route_form(self):
+        webhook_id = self.create_webhook().json['id']
+
+        result = self.simulate_get('/api/v1/webhook', headers=self.headers)
+        self.assertEqual(result.status, falcon.HTTP_404)
+
+        result = self.simulate_delete('/api/v1/webhook', headers=self.headers)
+        self.assertEqual(result.status, falcon.HTTP_405)
+
+        result = self.simulate_post('/api/v1/webhook/' + webhook_id, json={'url': 'https://example.com/hook'},
+                                    headers=self.headers)
+        self.assertEqual(result.status, falcon.HTTP_405)
+        self.assertEqual(metadata.WebhookMetadata.objects.count(), 1)
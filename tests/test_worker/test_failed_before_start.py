@@ -0,0 +1,32 @@
+import unittest
+
+from mongoengine import connect
+
+import metadata
+from worker.tasks.train_model import train_on_task
+# renamed, functions with test_ prefix are collected by test runners
+from worker.tasks.test_model import test_on_task as evaluate_on_task
+from worker.tasks.predict_model import predict_on_task
+
+
+class TestFailedBeforeStart(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+    def tearDown(self):
+        metadata.TaskMetadata.objects.all().delete()
+
+    def test_failed_task_is_not_run(self):
+        for run in (train_on_task, evaluate_on_task, predict_on_task):
+            # publish timed out in web api, config is not read
+            with metadata.TaskMetadata().save_context() as task:
+                task.owner = 'u1'
+                task.command = metadata.task.MODEL_TRAIN
+                task.status = metadata.task.FAILURE
+                task.history['error'] = 'Can not send task'
+
+            run(task.id)
+
+            task.reload()
+            self.assertEqual(task.status, metadata.task.FAILURE)
+            self.assertEqual(task.history['error'], 'Can not send task')
@@ -0,0 +1,65 @@
+import unittest
+
+from mongoengine import connect
+
+import metadata
+from metadata import history
+from worker.tasks.history_callback import HistoryCallback
+
+
+class TestHistoryCallback(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        with metadata.TaskMetadata().save_context() as task:
+            task.owner = 'u1'
+            task.command = metadata.task.MODEL_TRAIN
+
+        self.task = task
+
+    def tearDown(self):
+        metadata.TaskMetadata.objects.all().delete()
+        metadata.HistoryBucket.objects.all().delete()
+
+    def train(self, callback, epochs, batches_in_epoch):
+        for epoch in range(epochs):
+            callback.on_epoch_begin(epoch)
+
+            for batch in range(batches_in_epoch):
+                callback.on_batch_end(batch, {'batch': batch, 'size': 32, 'loss': 1.0})
+
+            callback.on_epoch_end(epoch, {'loss': 1.0, 'val_loss': 2.0})
+
+        callback.on_train_end()
+
+    def test_train(self):
+        callback = HistoryCallback(self.task, epochs=2, batches_in_epoch=15, examples=450,
+                                   save_metrics_on_batch=True)
+        self.train(callback, 2, 15)
+
+        task = metadata.TaskMetadata.objects.get(id=self.task.id)
+        self.assertEqual(task.history['current_epoch'], 2)
+        self.assertEqual(task.history['current_batch'], 30)
+        self.assertEqual(task.history['current_example'], 450)
+        self.assertNotIn('epoch', task.history)
+
+        epochs = history.get_history(task.id, history.EPOCH)
+        self.assertEqual([point['step'] for point in epochs], [0, 1])
+        self.assertEqual(epochs[0]['val_loss'], 2.0)
+
+        batches = history.get_history(task.id, history.BATCH)
+        self.assertEqual([point['step'] for point in batches], list(range(30)))
+        self.assertNotIn('size', batches[0])
+
+        self.assertEqual(history.get_task_history(task)['epoch']['loss'], [1.0, 1.0])
+
+    def test_progress_not_overwritten_by_task_save(self):
+        callback = HistoryCallback(self.task, epochs=1, batches_in_epoch=10, examples=100)
+        self.train(callback, 1, 10)
+
+        with self.task.save_context():
+            self.task.status = metadata.task.SUCCESS
+
+        task = metadata.TaskMetadata.objects.get(id=self.task.id)
+        self.assertEqual(task.status, metadata.task.SUCCESS)
+        self.assertEqual(task.history['current_epoch'], 1)
@@ -0,0 +1,91 @@
+import os
+import time
+import unittest
+import tempfile
+
+import numpy
+from keras import models
+from keras import layers
+
+from worker.model_cache import ModelCache
+
+
+def save_dense_model(path, units=2):
+    input = layers.Input(shape=(4,))
+    output = layers.Dense(units)(input)
+    model = models.Model(inputs=input, outputs=output)
+    model.compile(loss='mean_squared_error', optimizer='SGD')
+    model.save(path)
+
+    return model
+
+
+class TestModelCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp('test_model_cache')
+
+    def get_path(self, name):
+        return os.path.join(self.dir, name + '.hdf5')
+
+    def test_cache_hit(self):
+        cache = ModelCache()
+        path = self.get_path('m1')
+        save_dense_model(path)
+
+        m1 = cache.get('m1', path)
+        m2 = cache.get('m1', path)
+
+        self.assertIs(m1, m2)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_predict_in_context(self):
+        cache = ModelCache()
+        path = self.get_path('m1')
+        save_dense_model(path)
+
+        with cache.get('m1', path).as_default() as model:
+            y = model.predict(numpy.zeros((3, 4)))
+
+        self.assertEqual(y.shape, (3, 2))
+
+    def test_reload_on_changed_file(self):
+        cache = ModelCache()
+        path = self.get_path('m1')
+        save_dense_model(path, units=2)
+
+        m1 = cache.get('m1', path)
+
+        time.sleep(0.01)
+        save_dense_model(path, units=3)
+
+        m2 = cache.get('m1', path)
+
+        self.assertIsNot(m1, m2)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(m2.model.output_shape, (None, 3))
+
+    def test_memory_budget(self):
+        path1 = self.get_path('m1')
+        path2 = self.get_path('m2')
+        save_dense_model(path1)
+        save_dense_model(path2)
+
+        cache = ModelCache()
+        cache.memory_budget = cache.get('m1', path1).memory
+
+        cache.get('m2', path2)
+
+        self.assertNotIn('m1', cache)
+        self.assertIn('m2', cache)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_explicit_evict(self):
+        cache = ModelCache()
+        path = self.get_path('m1')
+        save_dense_model(path)
+
+        cache.get('m1', path)
+        cache.evict('m1')
+
+        self.assertEqual(len(cache), 0)
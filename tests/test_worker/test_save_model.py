@@ -0,0 +1,61 @@
+import os
+import unittest
+import tempfile
+
+from keras import models
+from keras import layers
+from mongoengine import connect
+
+import metadata
+import storage
+from worker.tasks.train_model import save_model
+
+
+class TestSaveModel(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        storage.from_config({
+            'home': tempfile.mkdtemp('test_home')
+        })
+
+    def tearDown(self):
+        metadata.DatasetMetadata.objects.all().delete()
+        metadata.ArchitectureMetadata.objects.all().delete()
+        metadata.ModelMetadata.objects.all().delete()
+
+    def create_model_metadata(self):
+        with metadata.DatasetMetadata().save_context() as dataset:
+            dataset.base.owner = 'u1'
+            dataset.base.title = 'title'
+
+        with metadata.ArchitectureMetadata().save_context() as architecture:
+            architecture.owner = 'u1'
+            architecture.title = 'title'
+            architecture.architecture = {'layers': []}
+
+        with metadata.ModelMetadata().save_context() as model_meta:
+            model_meta.base.owner = 'u1'
+            model_meta.base.title = 'title'
+            model_meta.base.date = 1
+            model_meta.base.dataset = dataset
+            model_meta.base.architecture = architecture
+
+        return model_meta
+
+    def test_file_fields(self):
+        model_meta = self.create_model_metadata()
+
+        input = layers.Input(shape=(4,))
+        output = layers.Dense(2)(input)
+        model = models.Model(inputs=input, outputs=output)
+
+        save_model(model, model_meta)
+
+        model_meta = metadata.ModelMetadata.objects.get(id=model_meta.id)
+        path = storage.get_model_path(model_meta.url)
+
+        # creation date is not changed by training
+        self.assertEqual(model_meta.base.date, 1)
+        self.assertEqual(model_meta.base.size, os.path.getsize(path))
+        self.assertEqual(model_meta.base.hash, storage.get_file_hash(path))
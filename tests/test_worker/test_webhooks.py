@@ -0,0 +1,160 @@
+import hashlib
+import hmac
+import http.server
+import json
+import threading
+import unittest
+
+from mongoengine import connect
+
+import metadata
+from metadata import webhook
+from worker.tasks import webhooks
+from worker.tasks.webhooks import deliver_webhooks, sign_payload
+
+
+class WebhookHandler(http.server.BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests.append((dict(self.headers), body))
+
+        self.send_response(self.server.status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDeliverWebhooks(unittest.TestCase):
+    def setUp(self):
+        connect('metaddata', host='mongomock://localhost', alias='metadata')
+
+        # receiver of tests runs on loopback
+        webhooks.configure_allowed_networks(['127.0.0.1/32'])
+
+        self.server = http.server.HTTPServer(('127.0.0.1', 0), WebhookHandler)
+        self.server.requests = []
+        self.server.status = 200
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        url = 'http://127.0.0.1:{port}/hook'.format(port=self.server.server_address[1])
+        self.webhook = metadata.WebhookMetadata(owner='u1', url=url)
+        self.webhook.save()
+
+    def tearDown(self):
+        webhooks.configure_allowed_networks([])
+
+        self.server.shutdown()
+        self.server.server_close()
+
+        metadata.TaskMetadata.objects.all().delete()
+        metadata.WebhookMetadata.objects.all().delete()
+        metadata.WebhookDelivery.objects.all().delete()
+
+    def finish_task(self, status=metadata.task.SUCCESS):
+        with metadata.TaskMetadata().save_context() as task:
+            task.owner = 'u1'
+            task.command = metadata.task.MODEL_TRAIN
+
+        with task.save_context():
+            task.status = status
+
+        return task
+
+    def test_batch_is_signed(self):
+        tasks = [self.finish_task(), self.finish_task(metadata.task.FAILURE)]
+
+        report = deliver_webhooks()
+        self.assertEqual(report, {'delivered': 2, 'failed': 0})
+
+        # one request for all events of webhook
+        self.assertEqual(len(self.server.requests), 1)
+        headers, body = self.server.requests[0]
+
+        timestamp = headers['X-Neuroseed-Timestamp']
+        message = timestamp.encode('utf-8') + b'.' + body
+        expected = 'sha256=' + hmac.new(self.webhook.secret.encode('utf-8'), message, hashlib.sha256).hexdigest()
+        self.assertEqual(headers['X-Neuroseed-Signature'], expected)
+
+        events = json.loads(body.decode('utf-8'))['events']
+        self.assertEqual([event['task'] for event in events], [task.id for task in tasks])
+        self.assertEqual(events[1]['status'], metadata.task.FAILURE)
+
+        self.assertEqual(metadata.WebhookDelivery.objects(status=webhook.DELIVERED).count(), 2)
+        self.assertEqual(deliver_webhooks(), {'delivered': 0, 'failed': 0})
+
+    def test_server_error_is_retried(self):
+        self.server.status = 500
+        self.finish_task()
+
+        self.assertEqual(deliver_webhooks(), {'delivered': 0, 'failed': 1})
+
+        delivery = metadata.WebhookDelivery.objects.get()
+        self.assertEqual(delivery.status, webhook.PENDING)
+        self.assertEqual(delivery.attempts, 1)
+        self.assertIn('500', delivery.last_error)
+
+        # retry is not due yet
+        self.assertEqual(deliver_webhooks(), {'delivered': 0, 'failed': 0})
+
+    def test_loopback_is_refused(self):
+        webhooks.configure_allowed_networks([])
+        self.finish_task()
+
+        self.assertEqual(deliver_webhooks(), {'delivered': 0, 'failed': 1})
+        self.assertEqual(self.server.requests, [])
+
+        delivery = metadata.WebhookDelivery.objects.get()
+        self.assertEqual(delivery.status, webhook.FAILED)
+        self.assertIn('not allowed', delivery.last_error)
+
+    def test_check_address(self):
+        webhooks.configure_allowed_networks([])
+
+        for address in ['127.0.0.1', '100.64.0.1', '10.0.0.5', '172.17.0.2', '192.168.1.1', '169.254.169.254',
+                        '0.0.0.0', '::1', 'fe80::1%eth0', 'fd00::1', '240.0.0.1']:
+            with self.assertRaises(webhooks.UnsafeAddressError):
+                webhooks.check_address(address)
+
+        webhooks.check_address('93.184.216.34')
+        webhooks.check_address('2606:2800:220:1:248:1893:25c8:1946')
+
+        webhooks.configure_allowed_networks(['10.0.0.0/8'])
+        webhooks.check_address('10.0.0.5')
+
+    def test_expired_claim_is_not_sent(self):
+        other = metadata.WebhookMetadata(owner='u1', url=self.webhook.url)
+        other.save()
+        self.finish_task()
+
+        sent = []
+
+        def slow_send(url, secret, events):
+            sent.append(events[0]['webhook'])
+
+            # claim of not sent deliveries is expired and other worker claims them
+            metadata.WebhookDelivery.objects(webhook__ne=events[0]['webhook']).update(set__claim='other')
+
+        report = deliver_webhooks(send=slow_send)
+
+        self.assertEqual(report, {'delivered': 1, 'failed': 0})
+        self.assertEqual(len(sent), 1)
+
+        delivery = metadata.WebhookDelivery.objects.get(status=webhook.PENDING)
+        self.assertNotEqual(delivery.webhook, sent[0])
+        self.assertEqual(delivery.claim, 'other')
+
+    def test_deleted_webhook(self):
+        self.finish_task()
+        self.webhook.delete()
+
+        self.assertEqual(deliver_webhooks(), {'delivered': 0, 'failed': 1})
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual(metadata.WebhookDelivery.objects.get().status, webhook.FAILED)
+
+    def test_sign_payload(self):
+        signature = sign_payload('secret', '1', b'{}')
+        self.assertEqual(signature, 'sha256=' + hmac.new(b'secret', b'1.{}', hashlib.sha256).hexdigest())
@@ -0,0 +1,29 @@
+import sys
+import unittest
+from unittest import mock
+
+import worker
+
+
+class TestWorkerMain(unittest.TestCase):
+    def run_main(self, **config):
+        config.update({
+            'log_level': 'info',
+            'celery_config': {},
+            'metadata_config': {},
+            'storage_config': {}
+        })
+        worker.from_config(config)
+
+        with mock.patch.object(sys, 'argv', ['celery_worker.py']), \
+                mock.patch('worker.metadata.from_config'), \
+                mock.patch('worker.storage.from_config'), \
+                mock.patch.object(worker.app, 'worker_main'):
+            worker.main()
+            return list(sys.argv)
+
+    def test_beat_is_opt_in(self):
+        self.assertNotIn('--beat', self.run_main())
+        self.assertNotIn('--beat', self.run_main(beat=False))
+        self.assertIn('--beat', self.run_main(beat=True))
+        self.assertIn('reconcile-counters', worker.app.conf.beat_schedule)
@@ -0,0 +1,71 @@
+"""Benchmark of large list response: falcon JSON handler vs JSONHandler and compression
+
+Usage (from project root):
+    python -m utils.benchmarks.json_responses [items]
+"""
+
+import sys
+import time
+import uuid
+
+from falcon.media import JSONHandler as FalconJSONHandler
+
+from webapi import compression
+from webapi.serializers import JSONHandler
+
+REPEAT = 20
+
+
+def create_models(number):
+    models = []
+
+    for i in range(number):
+        models.append({
+            'id': str(uuid.uuid4()),
+            'title': 'model {i}'.format(i=i),
+            'description': 'benchmark model',
+            'category': 'classification',
+            'status': 'RECEIVED',
+            'owner': 'user',
+            'is_public': bool(i % 2),
+            'labels': ['cifar10', 'benchmark'],
+            'date': '2018-01-01 00:00:{:02d}'.format(i % 60),
+            'size': 1000 * i,
+            'history': {'loss': [1.0 / (epoch + 1) for epoch in range(10)]}
+        })
+
+    return {'models': models}
+
+
+def measure(function, *args):
+    best = None
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main(number=1000):
+    media = create_models(int(number))
+
+    falcon_handler = FalconJSONHandler()
+    handler = JSONHandler()
+
+    falcon_data = falcon_handler.serialize(media)
+    data = handler.serialize(media)
+    gzip_data = compression.compress(data, compression.GZIP)
+
+    print('Items:', number, 'library:', handler.library)
+    print('falcon json: {:.2f} ms, {} bytes'.format(1000 * measure(falcon_handler.serialize, media), len(falcon_data)))
+    print('JSONHandler: {:.2f} ms, {} bytes'.format(1000 * measure(handler.serialize, media), len(data)))
+    print('gzip:        {:.2f} ms, {} bytes'.format(
+        1000 * measure(compression.compress, data, compression.GZIP), len(gzip_data)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,80 @@
+"""Benchmark of metadata list reads: mongoengine documents vs raw flatten path
+
+Usage (from project root):
+    python -m utils.benchmarks.metadata_list [mongo_url] [number]
+
+Documents are written to 'benchmark' database, which is dropped after run.
+Without mongo_url in-memory mongomock is used.
+"""
+
+import sys
+import time
+
+from mongoengine import connect
+
+import metadata
+
+REPEAT = 5
+
+
+def create_tasks(number):
+    tasks = []
+
+    for i in range(number):
+        task = metadata.TaskMetadata()
+        task.owner = 'benchmark'
+        task.command = metadata.task.MODEL_TRAIN
+        task.config = {'epochs': 10, 'batch_size': 32}
+        task.history = {'epoch': [{'loss': 1.0 / (epoch + 1), 'acc': 0.1 * epoch} for epoch in range(10)]}
+        tasks.append(task)
+
+    metadata.TaskMetadata.objects.insert(tasks, load_bulk=False)
+
+
+def read_documents(context, filter):
+    return [task.to_dict() for task in metadata.get_tasks(context, filter)]
+
+
+def read_raw(context, filter):
+    return metadata.flatten_all(metadata.get_tasks(context, filter))
+
+
+def measure(function, *args):
+    best = None
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+
+
+def main(mongo_url='mongomock://localhost', number=1000):
+    number = int(number)
+    connect('benchmark', host=mongo_url, alias='metadata')
+
+    metadata.TaskMetadata.drop_collection()
+    create_tasks(number)
+
+    try:
+        context = {'user_id': 'benchmark'}
+        filter = {'number': number}
+
+        documents_time, documents = measure(read_documents, context, filter)
+        raw_time, raw = measure(read_raw, context, filter)
+
+        assert documents == raw, 'raw flatten differs from to_dict'
+
+        print('Tasks:', number)
+        print('Documents: {:.1f} ms, {:.0f} rows/s'.format(1000 * documents_time, number / documents_time))
+        print('Raw:       {:.1f} ms, {:.0f} rows/s'.format(1000 * raw_time, number / raw_time))
+        print('Speedup:   {:.1f}x'.format(documents_time / raw_time))
+    finally:
+        metadata.TaskMetadata.drop_collection()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
@@ -0,0 +1,64 @@
+"""Benchmark of architecture validation: jsonschema.validate with oneOf vs compiled validator
+
+Usage (from project root):
+    python -m utils.benchmarks.schema_validation [layers]
+"""
+
+import sys
+import time
+
+import jsonschema
+
+from webapi.apiv1 import validation
+from webapi.apiv1.schema.architecture import CREATE_ARCHITECTURE_SCHEMA
+
+REPEAT = 20
+
+
+def create_architecture(number):
+    layers = []
+
+    for i in range(number):
+        if i % 2:
+            layers.append({'name': 'Dropout', 'config': {'rate': 0.5}})
+        else:
+            layers.append({'name': 'Dense', 'config': {'units': 32, 'activation': 'relu'}})
+
+    return {'title': 'benchmark', 'architecture': {'layers': layers}}
+
+
+def validate_one_of(instance):
+    # as falcon.media.validators.jsonschema does on each request
+    jsonschema.validate(instance, CREATE_ARCHITECTURE_SCHEMA, format_checker=jsonschema.FormatChecker())
+
+
+def measure(function, *args):
+    best = None
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main(number=100):
+    instance = create_architecture(int(number))
+    validator = validation.compile_validator(CREATE_ARCHITECTURE_SCHEMA)
+
+    assert validation.get_error(validator, instance) is None
+
+    one_of_time = measure(validate_one_of, instance)
+    compiled_time = measure(validation.get_error, validator, instance)
+
+    print('Layers:', number)
+    print('oneOf:    {:.2f} ms'.format(1000 * one_of_time))
+    print('Compiled: {:.2f} ms'.format(1000 * compiled_time))
+    print('Speedup:  {:.1f}x'.format(one_of_time / compiled_time))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
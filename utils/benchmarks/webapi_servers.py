@@ -0,0 +1,147 @@
+"""Benchmark of web api serving modes: gevent pywsgi vs asyncio server
+
+Usage (from project root):
+    python -m utils.benchmarks.webapi_servers [connections] [requests]
+
+Each mode serves the same falcon application in a separate process:
+    /io   - 10 ms wait, like request to mongo or broker
+    /cpu  - sha256 of 4 MB in C code, like hashing of uploaded file
+Client opens all keep-alive connections at once, each sends requests
+one after another. Failed connections show connection capacity.
+"""
+
+import sys
+import time
+import socket
+import asyncio
+import hashlib
+import subprocess
+
+import falcon
+
+MODES = ['gevent', 'asyncio']
+ROUTES = ['/io', '/cpu']
+START_PORT = 18080
+CPU_DATA = b'x' * 4 * 1024 * 1024
+
+
+class IOResource:
+    def on_get(self, req, resp):
+        time.sleep(0.01)
+        resp.media = {'ok': True}
+
+
+class CPUResource:
+    def on_get(self, req, resp):
+        resp.media = {'hash': hashlib.sha256(CPU_DATA).hexdigest()}
+
+
+def create_api():
+    api = falcon.API()
+    api.add_route('/io', IOResource())
+    api.add_route('/cpu', CPUResource())
+
+    return api
+
+
+def serve(mode, port):
+    port = int(port)
+
+    if mode == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+        from gevent import pywsgi
+
+        pywsgi.WSGIServer(('127.0.0.1', port), create_api(), log=None).serve_forever()
+    else:
+        from webapi import aioserver
+
+        aioserver.serve_forever(create_api(), {'host': '127.0.0.1', 'port': port})
+
+
+async def run_connection(port, path, requests, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    request = 'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.format(path=path).encode('latin-1')
+
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            writer.write(request)
+
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+def run_client(port, path, connections, requests):
+    loop = asyncio.get_event_loop()
+    latencies = []
+
+    jobs = [run_connection(port, path, requests, latencies) for _ in range(connections)]
+
+    start = time.perf_counter()
+    results = loop.run_until_complete(asyncio.gather(*jobs, return_exceptions=True))
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for result in results if isinstance(result, Exception))
+
+    return elapsed, latencies, failed
+
+
+def wait_port(port, timeout=10):
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+
+    raise RuntimeError('server on port {port} is not started'.format(port=port))
+
+
+def percentile(values, p):
+    if not values:
+        return float('nan')
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def main(connections=200, requests=20):
+    connections = int(connections)
+    requests = int(requests)
+
+    print('Connections: {}, requests per connection: {}'.format(connections, requests))
+
+    for index, mode in enumerate(MODES):
+        port = START_PORT + index
+        server = subprocess.Popen([sys.executable, '-m', 'utils.benchmarks.webapi_servers', 'serve', mode, str(port)])
+
+        try:
+            wait_port(port)
+
+            for path in ROUTES:
+                elapsed, latencies, failed = run_client(port, path, connections, requests)
+
+                print('{:8} {:5} {:8.0f} req/s  p50 {:7.1f} ms  p99 {:7.1f} ms  failed connections {}'.format(
+                    mode, path, len(latencies) / elapsed,
+                    1000 * percentile(latencies, 0.5), 1000 * percentile(latencies, 0.99), failed))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['serve']:
+        serve(*sys.argv[2:4])
+    else:
+        main(*sys.argv[1:3])
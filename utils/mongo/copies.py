@@ -0,0 +1,25 @@
+"""Fill copies of dataset and architecture fields in models
+
+Run once after update to v0.6.0, lists of models read category,
+dataset_title and architecture_title stored in model documents.
+
+Usage (from project root):
+    python -m utils.mongo.copies
+"""
+
+import metadata
+
+METADATA_CONFIG = 'config/metadata_config.json'
+
+
+def main():
+    metadata.from_config(METADATA_CONFIG)
+
+    changed = metadata.fill_copied_fields()
+
+    print('Collection: models')
+    print('\tFilled documents:', changed)
+
+
+if __name__ == '__main__':
+    main()
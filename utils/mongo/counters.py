@@ -0,0 +1,26 @@
+"""Recompute counters of metadata documents
+
+Run once after update to v0.6.0 to fill counters of existing documents,
+worker reconciles counters periodically.
+
+Usage (from project root):
+    python -m utils.mongo.counters
+"""
+
+import metadata
+
+METADATA_CONFIG = 'config/metadata_config.json'
+
+
+def main():
+    metadata.from_config(METADATA_CONFIG)
+
+    report = metadata.reconcile_counters()
+
+    for collection, changed in sorted(report.items()):
+        print('Collection:', collection)
+        print('\tChanged counters:', changed)
+
+
+if __name__ == '__main__':
+    main()
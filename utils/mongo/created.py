@@ -0,0 +1,26 @@
+"""Fill creation date of datasets and models
+
+Run once after update to v0.6.0, lists of datasets and models are
+paginated by created field, which is set when document is created.
+
+Usage (from project root):
+    python -m utils.mongo.created
+"""
+
+import metadata
+
+METADATA_CONFIG = 'config/metadata_config.json'
+
+
+def main():
+    metadata.from_config(METADATA_CONFIG)
+
+    report = metadata.fill_created()
+
+    for collection, changed in sorted(report.items()):
+        print('Collection:', collection)
+        print('\tFilled documents:', changed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Create and check indexes of metadata collections
+
+Usage (from project root):
+    python -m utils.mongo.indexes create
+    python -m utils.mongo.indexes check
+"""
+
+import sys
+
+import metadata
+
+METADATA_CONFIG = 'config/metadata_config.json'
+
+
+def format_key(key):
+    return ', '.join('{field}: {direction}'.format(field=field, direction=direction) for field, direction in key)
+
+
+def print_report(report):
+    ok = True
+
+    for collection, result in sorted(report.items()):
+        print('Collection:', collection)
+
+        for key in result['missing']:
+            print('\tMissing index:', format_key(key))
+            ok = False
+
+        for name in result['extra']:
+            print('\tNot declared index:', name)
+
+        for name in result['unused']:
+            print('\tUnused index:', name)
+
+        if not any(result.values()):
+            print('\tOk.')
+
+    return ok
+
+
+def main(command='check'):
+    metadata.from_config(METADATA_CONFIG)
+
+    if command == 'create':
+        metadata.create_indexes()
+        print('Indexes created')
+    elif command != 'check':
+        print('Unknown command:', command)
+        sys.exit(2)
+
+    report = metadata.check_indexes()
+    if not print_report(report):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
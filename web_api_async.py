@@ -0,0 +1,9 @@
+import webapi
+from webapi import aioserver
+
+webapi.init_logging()
+config = webapi.from_config('config/web_api_config.json')
+api = webapi.main(config)
+
+if __name__ == '__main__':
+    aioserver.serve_forever(api, config)
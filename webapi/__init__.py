@@ -2,16 +2,19 @@ import logging
 import json
 
 import falcon
-from falcon_auth import JWTAuthBackend
 from falcon_cors import CORS
 
 import metadata
 import manager
 import storage
 from . import apiv1
+from .authbackend import CachedJWTAuthBackend
 from .authmiddleware import NeuroseedAuthMiddleware
-from .loggingmiddleware import LoggingMidleware
+from .loggingmiddleware import AccessLogMiddleware, SLOW_REQUEST_TIME
 from . import serializers
+from . import metrics
+from . import compression
+from .compression import CompressionMiddleware
 from .helpers import init_logging
 from .version import __version__
 
@@ -31,6 +34,10 @@ def from_config(config_file=None):
     elif config_file is None:
         return {}
 
+    if config.get('use_metrics', True):
+        # before mongo clients are created
+        metrics.register_listeners()
+
     celery_config = config.get('celery_config', None)
     if celery_config:
         manager.from_config(celery_config)
@@ -60,7 +67,7 @@ def get_auth_middleware(secret_key=None, key_file=None):
         raise TypeError('type of secret_key or key_file must be str')
 
     user_loader = lambda payload: payload['user_id']
-    jwt_auth_backend = JWTAuthBackend(
+    jwt_auth_backend = CachedJWTAuthBackend(
         user_loader,
         secret_key,
         required_claims=['user_id'],
@@ -99,16 +106,40 @@ def main(config):
 
     use_extend_logging = config.get('use_extend_logging', True)
     if use_extend_logging:
-        logging.debug('Use extend falcon logging')
-        logging_middleware = LoggingMidleware(logger)
-        middlewares.append(logging_middleware)
+        logging.debug('Use access log')
+        access_log_config = config.get('access_log', {})
+        logging_middleware = AccessLogMiddleware(
+            logging.getLogger('webapi.access'),
+            sample_rate=access_log_config.get('sample_rate', 1.0),
+            route_sample_rates=access_log_config.get('routes', None),
+            slow_request_time=access_log_config.get('slow_request_time', SLOW_REQUEST_TIME))
+        # first middleware, latency includes auth and other middlewares
+        middlewares.insert(0, logging_middleware)
+
+    use_metrics = config.get('use_metrics', True)
+    if use_metrics:
+        logging.debug('Use metrics')
+        middlewares.insert(0, metrics.MetricsMiddleware())
+
+    use_compression = config.get('use_compression', True)
+    if use_compression:
+        logging.debug('Use response compression')
+        middlewares.append(CompressionMiddleware(min_size=config.get('compression_min_size', compression.MIN_SIZE)))
 
     api = falcon.API(middleware=middlewares)
 
     api.set_error_serializer(serializers.falcon_error_serializer)
 
+    json_handler = serializers.JSONHandler()
+    for media_type in (falcon.MEDIA_JSON, falcon.DEFAULT_MEDIA_TYPE):
+        api.req_options.media_handlers[media_type] = json_handler
+        api.resp_options.media_handlers[media_type] = json_handler
+
     apiv1.configure_api_v1(api, auth_middleware, config)
 
+    if use_metrics:
+        api.add_route('/metrics', metrics.MetricsResource())
+
     return api
 
 
@@ -0,0 +1,453 @@
+"""Asyncio HTTP/1.1 server for WSGI application of web api
+
+Event loop accepts connections, reads requests and writes responses.
+Application is called in a pool of threads, so blocking calls of resources
+(mongo, broker, h5py, hashing) do not stop other connections. Number of
+threads limits number of requests processed at once, not number of open
+connections. Server is used without gevent monkey patching.
+
+Response bodies with __aiter__ (event streams) are iterated on event loop
+instead of pool, so long open streams do not take threads of application.
+
+Usage:
+    python3 web_api_async.py
+"""
+
+import sys
+import asyncio
+import logging
+import tempfile
+import email.utils
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = [
+    'AsyncioWSGIServer',
+    'serve_forever'
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREADS = 32
+DEFAULT_KEEP_ALIVE_TIMEOUT = 75  # seconds
+MAX_HEADER_SIZE = 64 * 1024  # bytes
+BODY_MEMORY_SIZE = 1024 * 1024  # bytes of request body kept in memory
+READ_BLOCK_SIZE = 64 * 1024  # bytes
+
+BODILESS_STATUSES = ('1', '204', '304')
+
+STATUS_REASONS = {
+    400: 'Bad Request',
+    411: 'Length Required',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+    501: 'Not Implemented',
+    505: 'HTTP Version Not Supported'
+}
+
+
+class ProtocolError(Exception):
+    """Request can not be read, connection is closed after error response"""
+
+    def __init__(self, status, message=''):
+        super().__init__(message)
+        self.status = status
+
+
+def current_task():
+    """Return running task, asyncio.current_task is added in python 3.7, Task.current_task is removed in 3.9"""
+
+    if hasattr(asyncio, 'current_task'):
+        return asyncio.current_task()
+
+    return asyncio.Task.current_task()
+
+
+class Request:
+    __slots__ = ('method', 'target', 'version', 'headers')
+
+    def __init__(self, method, target, version, headers):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+
+    def get_header(self, name, default=None):
+        values = self.headers.get(name, None)
+        return ','.join(values) if values else default
+
+    @property
+    def keep_alive(self):
+        connection = self.get_header('connection', '').lower()
+
+        if self.version == 'HTTP/1.0':
+            return 'keep-alive' in connection
+
+        return 'close' not in connection
+
+
+def parse_head(data):
+    """Return Request parsed from request line and headers"""
+
+    lines = data.decode('latin-1').split('\r\n')
+
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise ProtocolError(400, 'malformed request line')
+
+    if version not in ('HTTP/1.0', 'HTTP/1.1'):
+        raise ProtocolError(505, 'unsupported version ' + version)
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+
+        name, separator, value = line.partition(':')
+        if not separator or not name or name != name.strip():
+            raise ProtocolError(400, 'malformed header')
+
+        headers.setdefault(name.lower(), []).append(value.strip())
+
+    return Request(method, target, version, headers)
+
+
+class AsyncioWSGIServer:
+    """HTTP/1.1 server with keep-alive, chunked bodies and 100-continue
+
+    Args:
+        app: WSGI application
+        threads (int): number of threads which call application
+        keep_alive_timeout (float): seconds to wait for next request on connection
+        max_body_size (int): max bytes of request body, None is unlimited
+    """
+
+    def __init__(self, app, threads=DEFAULT_THREADS, keep_alive_timeout=DEFAULT_KEEP_ALIVE_TIMEOUT,
+                 max_body_size=None):
+        self.app = app
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_body_size = max_body_size
+        self.loop = None  # loop which runs start()
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+
+        self.server = None
+        self.connections = set()
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def start(self, host, port):
+        # in coroutine returns running loop, loop= arguments are removed in python 3.10
+        self.loop = asyncio.get_event_loop()
+        self.server = await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_HEADER_SIZE)
+
+        return self.server
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+        tasks = list(self.connections)
+        for task in tasks:
+            task.cancel()
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+        self.executor.shutdown(wait=False)
+
+    async def handle_connection(self, reader, writer):
+        task = current_task()
+        self.connections.add(task)
+
+        try:
+            keep_alive = True
+            while keep_alive:
+                keep_alive = await self.handle_request(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        except ProtocolError as err:
+            logger.debug('Bad request: {err}'.format(err=err))
+            await self.write_error(writer, err.status)
+        except Exception as err:
+            logger.exception('Unhandled error of connection: {err}'.format(err=err))
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+    async def read_head(self, reader):
+        try:
+            return await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keep_alive_timeout)
+        except asyncio.LimitOverrunError:
+            raise ProtocolError(431, 'headers are too large')
+
+    async def read_body(self, request, reader, writer):
+        """Return file with request body and its length"""
+
+        body = tempfile.SpooledTemporaryFile(max_size=BODY_MEMORY_SIZE)
+
+        if request.get_header('expect', '').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+
+        transfer_encoding = request.get_header('transfer-encoding', '').lower()
+
+        if transfer_encoding == 'chunked':
+            length = await self.read_chunked(reader, body)
+        elif transfer_encoding:
+            raise ProtocolError(501, 'unsupported transfer encoding')
+        else:
+            length = request.get_header('content-length', '0')
+
+            if not length.isdigit():
+                raise ProtocolError(400, 'malformed content-length')
+
+            length = int(length)
+            self.check_body_size(length)
+
+            remaining = length
+            while remaining:
+                data = await reader.read(min(remaining, READ_BLOCK_SIZE))
+                if not data:
+                    raise asyncio.IncompleteReadError(b'', remaining)
+
+                body.write(data)
+                remaining -= len(data)
+
+        body.seek(0)
+
+        return body, length
+
+    async def read_chunked(self, reader, body):
+        length = 0
+
+        while True:
+            line = await reader.readline()
+
+            try:
+                size = int(line.split(b';', 1)[0].strip(), 16)
+            except ValueError:
+                raise ProtocolError(400, 'malformed chunk size')
+
+            if size == 0:
+                break
+
+            length += size
+            self.check_body_size(length)
+
+            body.write(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+        # skip trailers
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+
+        return length
+
+    def check_body_size(self, length):
+        if self.max_body_size is not None and length > self.max_body_size:
+            raise ProtocolError(413, 'request body is too large')
+
+    def get_environ(self, request, body, length, writer):
+        path, _, query = request.target.partition('?')
+
+        server_name, server_port = writer.get_extra_info('sockname')[:2]
+        peer = writer.get_extra_info('peername') or ('', 0)
+
+        environ = {
+            'REQUEST_METHOD': request.method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': urllib.parse.unquote(path, encoding='latin-1'),
+            'QUERY_STRING': query,
+            'SERVER_NAME': server_name,
+            'SERVER_PORT': str(server_port),
+            'SERVER_PROTOCOL': request.version,
+            'REMOTE_ADDR': peer[0],
+            'REMOTE_PORT': str(peer[1]),
+            'CONTENT_LENGTH': str(length),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False
+        }
+
+        for name, values in request.headers.items():
+            if name in ('content-length', 'transfer-encoding'):
+                continue
+
+            key = name.upper().replace('-', '_')
+            if key != 'CONTENT_TYPE':
+                key = 'HTTP_' + key
+
+            environ[key] = ','.join(values)
+
+        return environ
+
+    def call_application(self, environ):
+        """Call application in thread, return status, headers, first chunks and rest of body"""
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response:
+                raise exc_info[1].with_traceback(exc_info[2])
+
+            response['status'] = status
+            response['headers'] = headers
+
+        body = self.app(environ, start_response)
+
+        if isinstance(body, (list, tuple)):
+            return response['status'], response['headers'], list(body), None
+
+        if hasattr(body, '__aiter__'):
+            return response['status'], response['headers'], [], (body, body.__aiter__())
+
+        # start_response can be called before first chunk
+        iterator = iter(body)
+        chunks = []
+        for chunk in iterator:
+            if chunk:
+                chunks.append(chunk)
+                break
+
+        return response['status'], response['headers'], chunks, (body, iterator)
+
+    def close_body(self, body):
+        if hasattr(body, 'close'):
+            body.close()
+
+    async def handle_request(self, reader, writer):
+        """Read request, call application and write response
+
+        Returns:
+            True if connection is kept alive
+        """
+
+        request = parse_head(await self.read_head(reader))
+        body, length = await self.read_body(request, reader, writer)
+        environ = self.get_environ(request, body, length, writer)
+
+        try:
+            status, headers, chunks, rest = await self.loop.run_in_executor(
+                self.executor, self.call_application, environ)
+        except Exception as err:
+            logger.exception('Unhandled error of application: {err}'.format(err=err))
+            await self.write_error(writer, 500)
+            return False
+        finally:
+            body.close()
+
+        try:
+            return await self.write_response(request, writer, status, headers, chunks, rest)
+        finally:
+            if rest is not None:
+                if hasattr(rest[1], 'aclose'):
+                    await rest[1].aclose()
+
+                await self.loop.run_in_executor(self.executor, self.close_body, rest[0])
+
+    async def write_response(self, request, writer, status, headers, chunks, rest):
+        names = {name.lower() for name, _ in headers}
+        has_body = request.method != 'HEAD' and not status.startswith(BODILESS_STATUSES)
+
+        keep_alive = request.keep_alive
+        chunked = False
+
+        if has_body and 'content-length' not in names:
+            if rest is None:
+                headers = headers + [('Content-Length', str(sum(len(chunk) for chunk in chunks)))]
+            elif request.version == 'HTTP/1.1':
+                headers = headers + [('Transfer-Encoding', 'chunked')]
+                chunked = True
+            else:
+                # end of body is end of connection
+                keep_alive = False
+
+        if request.version == 'HTTP/1.0' and keep_alive:
+            headers = headers + [('Connection', 'keep-alive')]
+        elif not keep_alive:
+            headers = headers + [('Connection', 'close')]
+
+        head = ['{version} {status}\r\n'.format(version=request.version, status=status)]
+        head.append('Date: {date}\r\n'.format(date=email.utils.formatdate(usegmt=True)))
+        head.extend('{name}: {value}\r\n'.format(name=name, value=value) for name, value in headers)
+        head.append('\r\n')
+
+        writer.write(''.join(head).encode('latin-1'))
+
+        if has_body:
+            for chunk in chunks:
+                self.write_chunk(writer, chunk, chunked)
+
+            await writer.drain()
+
+            if rest is not None and hasattr(rest[1], '__anext__'):
+                async for chunk in rest[1]:
+                    if chunk:
+                        self.write_chunk(writer, chunk, chunked)
+                        await writer.drain()
+            elif rest is not None:
+                while True:
+                    chunk = await self.loop.run_in_executor(self.executor, next, rest[1], None)
+                    if chunk is None:
+                        break
+
+                    if chunk:
+                        self.write_chunk(writer, chunk, chunked)
+                        await writer.drain()
+
+            if rest is not None and chunked:
+                writer.write(b'0\r\n\r\n')
+
+        await writer.drain()
+
+        return keep_alive
+
+    def write_chunk(self, writer, chunk, chunked):
+        if chunked:
+            writer.write('{size:x}\r\n'.format(size=len(chunk)).encode('latin-1'))
+            writer.write(chunk)
+            writer.write(b'\r\n')
+        else:
+            writer.write(chunk)
+
+    async def write_error(self, writer, status):
+        reason = STATUS_REASONS.get(status, '')
+        head = 'HTTP/1.1 {status} {reason}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'
+        writer.write(head.format(status=status, reason=reason).encode('latin-1'))
+
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+def serve_forever(api, config):
+    host = config['host']
+    port = config['port']
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    server = AsyncioWSGIServer(
+        api,
+        threads=config.get('threads', DEFAULT_THREADS),
+        keep_alive_timeout=config.get('keep_alive_timeout', DEFAULT_KEEP_ALIVE_TIMEOUT),
+        max_body_size=config.get('max_body_size', None))
+
+    loop.run_until_complete(server.start(host, port))
+    logging.debug('Start asyncio server on {}:{}'.format(host, port))
+
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.close())
@@ -13,43 +13,63 @@ def configure_api_v1(api, auth, config):
     api.add_route(BASE + 'dataset', dataset_resource)
     api.add_route(BASE + 'dataset/{id}', dataset_resource)
 
+    dataset_file_resource = DatasetFileResource()
+    api.add_route(BASE + 'dataset/{id}/file', dataset_file_resource)
+
     # list of datasets
     datasets_resource = DatasetsResource()
     api.add_route(BASE + 'datasets', datasets_resource)
-    auth.optional_routes.append(BASE + 'datasets')
+    auth.optional_routes.add(BASE + 'datasets')
 
     dataset_full_resource = DatasetsFullResource()
     api.add_route(BASE + 'datasets/full', dataset_full_resource)
-    auth.optional_routes.append(BASE + 'datasets/full')
+    auth.optional_routes.add(BASE + 'datasets/full')
 
     dataset_number_resource = DatasetsNumberResource()
     api.add_route(BASE + 'datasets/number', dataset_number_resource)
-    auth.optional_routes.append(BASE + 'datasets/number')
+    auth.optional_routes.add(BASE + 'datasets/number')
+
+    datasets_bulk_resource = DatasetsBulkResource()
+    api.add_route(BASE + 'datasets/bulk', datasets_bulk_resource)
+
+    datasets_search_resource = DatasetsSearchResource()
+    api.add_route(BASE + 'datasets/search', datasets_search_resource)
+    auth.optional_routes.add(BASE + 'datasets/search')
 
     # architecture operations
     architecture_resource = ArchitectureResource()
     api.add_route(BASE + 'architecture', architecture_resource)
     api.add_route(BASE + 'architecture/{id}', architecture_resource)
-    auth.optional_routes.append(BASE + 'architecture/{id}')
+    auth.optional_routes.add(BASE + 'architecture/{id}')
 
     # list of architectures
     architectures_resource = ArchitecturesResource()
     api.add_route(BASE + 'architectures', architectures_resource)
-    auth.optional_routes.append(BASE + 'architectures')
+    auth.optional_routes.add(BASE + 'architectures')
 
     architectures_full_resource = ArchitecturesFullResource()
     api.add_route(BASE + 'architectures/full', architectures_full_resource)
-    auth.optional_routes.append(BASE + 'architectures/full')
+    auth.optional_routes.add(BASE + 'architectures/full')
 
     architectures_number_resource = ArchitecturesNumberResource()
     api.add_route(BASE + 'architectures/number', architectures_number_resource)
-    auth.optional_routes.append(BASE + 'architectures/number')
+    auth.optional_routes.add(BASE + 'architectures/number')
+
+    architectures_bulk_resource = ArchitecturesBulkResource()
+    api.add_route(BASE + 'architectures/bulk', architectures_bulk_resource)
+
+    architectures_search_resource = ArchitecturesSearchResource()
+    api.add_route(BASE + 'architectures/search', architectures_search_resource)
+    auth.optional_routes.add(BASE + 'architectures/search')
 
     # model operation
     model_resource = ModelResource()
     api.add_route(BASE + 'model', model_resource)
     api.add_route(BASE + 'model/{id}', model_resource)
 
+    model_file_resource = ModelFileResource()
+    api.add_route(BASE + 'model/{id}/file', model_file_resource)
+
     # train
     model_train_resource = ModelTrainResource()
     api.add_route(BASE + 'model/{id}/train', model_train_resource)
@@ -80,24 +100,40 @@ def configure_api_v1(api, auth, config):
     model_predict_result_resource = ModelPredictResult()
     api.add_route(BASE + 'model/predict/{tid}/result', model_predict_result_resource)
 
+    model_predict_result_query_resource = ModelPredictResultQuery()
+    api.add_route(BASE + 'model/predict/{tid}/result/query', model_predict_result_query_resource)
+
     # list of models
     models_resource = ModelsResource()
     api.add_route(BASE + 'models', models_resource)
-    auth.optional_routes.append(BASE + 'models')
+    auth.optional_routes.add(BASE + 'models')
 
     models_full_resource = ModelsFullResource()
     api.add_route(BASE + 'models/full', models_full_resource)
-    auth.optional_routes.append(BASE + 'models/full')
+    auth.optional_routes.add(BASE + 'models/full')
 
     models_number_resource = ModelsNumberResource()
     api.add_route(BASE + 'models/number', models_number_resource)
-    auth.optional_routes.append(BASE + 'models/number')
+    auth.optional_routes.add(BASE + 'models/number')
+
+    models_bulk_resource = ModelsBulkResource()
+    api.add_route(BASE + 'models/bulk', models_bulk_resource)
+
+    models_search_resource = ModelsSearchResource()
+    api.add_route(BASE + 'models/search', models_search_resource)
+    auth.optional_routes.add(BASE + 'models/search')
 
     # task operation
     task_resource = TaskResource()
     api.add_route(BASE + 'task/{id}', task_resource)
     api.add_route(BASE + 'task', task_resource)
 
+    task_history_resource = TaskHistoryResource()
+    api.add_route(BASE + 'task/{id}/history', task_history_resource)
+
+    task_events_resource = TaskEventsResource()
+    api.add_route(BASE + 'task/{id}/events', task_events_resource)
+
     # tasks list
     tasks_resource = TasksResource()
     api.add_route(BASE + 'tasks', tasks_resource)
@@ -108,6 +144,28 @@ def configure_api_v1(api, auth, config):
     tasks_number_resource = TasksNumberResource()
     api.add_route(BASE + 'tasks/number', tasks_number_resource)
 
+    tasks_bulk_resource = TasksBulkResource()
+    api.add_route(BASE + 'tasks/bulk', tasks_bulk_resource)
+
+    # callbacks of task status changes
+    webhook_resource = WebhookResource()
+    api.add_route(BASE + 'webhook', webhook_resource)
+    api.add_route(BASE + 'webhook/{id}', webhook_resource)
+
+    webhook_deliveries_resource = WebhookDeliveriesResource()
+    api.add_route(BASE + 'webhook/{id}/deliveries', webhook_deliveries_resource)
+
+    webhooks_resource = WebhooksResource()
+    api.add_route(BASE + 'webhooks', webhooks_resource)
+
+    # dashboard summary of user
+    summary_resource = SummaryResource()
+    api.add_route(BASE + 'summary', summary_resource)
+
+    # metadata cache
+    metadata_cache_metrics_resource = MetadataCacheMetricsResource()
+    api.add_route(BASE + 'metadata/cache/metrics', metadata_cache_metrics_resource)
+
     # schema resource
     enable_new_layer = config.get('enable_new_layer', True)
     schema_model_layers_resource = SchemaModelLayersResource(enable_new_layer)
@@ -135,4 +193,18 @@ def configure_api_v1(api, auth, config):
     schema_task_resource = SchemaTaskResource()
     api.add_route(BASE + 'schema/task', schema_task_resource)
 
+    # content addressed schemas
+    schema_content_resource = SchemaContentResource(BASE + 'schema/content/', {
+        'model/layers': schema_model_layers_resource,
+        'dataset': schema_dataset_resource,
+        'architecture': schema_architecture_resource,
+        'model': schema_model_resource,
+        'model/train': schema_model_train_resource,
+        'model/test': schema_model_test_resource,
+        'model/predict': schema_model_predict_resource,
+        'task': schema_task_resource
+    })
+    api.add_route(BASE + 'schema', schema_content_resource)
+    api.add_route(BASE + 'schema/content/{hash}', schema_content_resource)
+
     logger.debug('api v1 initialized')
@@ -8,5 +8,11 @@ from .model import *
 
 from .task import *
 from .tasks import *
+from .webhook import *
+
+from .bulk import *
+from .search import *
+from .summary import *
+from .cache import *
 
 from .schema import *
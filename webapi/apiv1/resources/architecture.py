@@ -1,12 +1,14 @@
+import time
 import uuid
 import logging
 
 import falcon
-from falcon.media.validators import jsonschema
 
 import metadata
 import manager
+from .. import validation
 from ..schema.architecture import ARCHITECTURE_SCHEMA, CREATE_ARCHITECTURE_SCHEMA
+from . import projection
 
 __all__ = [
     'ArchitectureResource'
@@ -14,6 +16,8 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+RESULT_KEYS = ['id', 'is_public', 'owner', 'title', 'description', 'category', 'architecture']
+
 
 class ArchitectureResource:
     auth = {
@@ -30,9 +34,11 @@ class ArchitectureResource:
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
+        fields = projection.get_fields(req, RESULT_KEYS)
+
         try:
             context = {'user_id': user_id}
-            architecture = metadata.get_architecture(id, context)
+            architecture = metadata.get_architecture(id, context, fields)
         except metadata.DoesNotExist:
             logger.debug('Architecture {id} does not exist'.format(id=id))
 
@@ -43,8 +49,7 @@ class ArchitectureResource:
 
         resp.status = falcon.HTTP_200
         architecture_dict = architecture.to_dict()
-        result_keys = ['id', 'is_public', 'owner', 'title', 'description', 'category', 'architecture']
-        resp.media = {key: architecture_dict[key] for key in result_keys if key in architecture_dict}
+        resp.media = {key: architecture_dict[key] for key in fields if key in architecture_dict}
 
     def get_description(self, req, resp):
         raise falcon.HTTPNotFound(
@@ -58,7 +63,7 @@ class ArchitectureResource:
         else:
             self.create_architecture(req, resp)
 
-    @jsonschema.validate(ARCHITECTURE_SCHEMA)
+    @validation.validate(ARCHITECTURE_SCHEMA)
     def set_architecture(self, req, resp, id):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -81,7 +86,7 @@ class ArchitectureResource:
                 description="Architecture metadata does not exist"
             )
 
-    @jsonschema.validate(CREATE_ARCHITECTURE_SCHEMA)
+    @validation.validate(CREATE_ARCHITECTURE_SCHEMA)
     def create_architecture(self, req, resp):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -92,6 +97,7 @@ class ArchitectureResource:
             architecture.from_dict(req.media)
             architecture.id = id
             architecture.owner = user_id
+            architecture.date = int(time.time())
 
         logger.debug('User {uid} create architecture {did}'.format(uid=user_id, did=id))
 
@@ -100,7 +106,7 @@ class ArchitectureResource:
             'id': id
         }
 
-    @jsonschema.validate(ARCHITECTURE_SCHEMA)
+    @validation.validate(ARCHITECTURE_SCHEMA)
     def on_patch(self, req, resp, id):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
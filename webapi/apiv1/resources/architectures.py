@@ -2,6 +2,8 @@ import logging
 
 import falcon
 import metadata
+from . import pagination
+from . import projection
 
 __all__ = [
     'ArchitecturesResource',
@@ -11,19 +13,24 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+RESULT_KEYS = ['id', 'is_public', 'owner', 'title', 'description', 'category', 'architecture']
+
 
 class ArchitecturesResource:
     def on_get(self, req, resp):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
+        filter = pagination.get_page_filter(req)
+
         context = {'user_id': user_id}
-        architectures = metadata.get_architectures(context)
-        ids = [meta.id for meta in architectures]
+        architectures = metadata.flatten_all(metadata.get_architectures(context, filter, fields=['id']))
+        ids = [meta['id'] for meta in architectures]
 
         resp.status = falcon.HTTP_200
         resp.media = {
-            'ids': ids  # response schema v0.2.1
+            'ids': ids,  # response schema v0.2.1
+            'next': pagination.get_next_cursor(architectures, filter)
         }
 
 
@@ -32,39 +39,24 @@ class ArchitecturesFullResource:
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
-        from_ = int(req.params.get('from', 0))
-
-        if from_ < 0:
-            raise falcon.HTTPBadRequest(
-                title="Bad Request",
-                description="From must be greater than 0"
-            )
-
-        number = int(req.params.get('number', 99999))
-
-        if number < 0:
-            raise falcon.HTTPBadRequest(
-                title="Bad Request",
-                description="Number must be greater than 0"
-            )
+        filter = pagination.get_page_filter(req)
+        fields = projection.get_fields(req, RESULT_KEYS)
 
         context = {'user_id': user_id}
-        filter = {'from': from_, 'number': number}
-        architectures = metadata.get_architectures(context, filter)
-        architectures_meta = self.get_architecture_meta(architectures)
+        architectures = metadata.flatten_all(metadata.get_architectures(context, filter, fields))
+        architectures_meta = self.get_architecture_meta(architectures, fields)
 
         resp.status = falcon.HTTP_200
         resp.media = {
-            'architectures': architectures_meta  # response schema v0.2.2
+            'architectures': architectures_meta,  # response schema v0.2.2
+            'next': pagination.get_next_cursor(architectures, filter)
         }
 
     @staticmethod
-    def get_architecture_meta(architectures):
+    def get_architecture_meta(architectures, result_keys=RESULT_KEYS):
         architectures_meta = []
 
-        for architecture in architectures:
-            architecture_dict = architecture.to_dict()
-            result_keys = ['id', 'is_public', 'owner', 'title', 'description', 'category', 'architecture']
+        for architecture_dict in architectures:
             architecture_meta = {key: architecture_dict[key] for key in result_keys if key in architecture_dict}
             architectures_meta.append(architecture_meta)
 
@@ -77,7 +69,7 @@ class ArchitecturesNumberResource:
         logger.debug('Authorize user {id}'.format(id=user_id))
 
         context = {'user_id': user_id}
-        number = metadata.get_architectures(context).count()
+        number = metadata.count_visible(metadata.ArchitectureMetadata, context)
 
         resp.status = falcon.HTTP_200
         resp.media = number
@@ -0,0 +1,239 @@
+import time
+import uuid
+import logging
+
+import falcon
+
+import metadata
+import manager
+from metadata import bulk
+from .. import validation
+from ..schema.bulk import BULK_ITEMS_SCHEMA, BULK_IDS_SCHEMA, get_update_schema
+from ..schema.dataset import DATASET_SCHEMA, CREATE_DATASET_SCHEMA
+from ..schema.architecture import ARCHITECTURE_SCHEMA, CREATE_ARCHITECTURE_SCHEMA
+from ..schema.model import MODEL_SCHEMA, CREATE_MODEL_SCHEMA
+from ..schema.task import TASK_SCHEMA
+
+__all__ = [
+    'DatasetsBulkResource',
+    'ArchitecturesBulkResource',
+    'ModelsBulkResource',
+    'TasksBulkResource'
+]
+
+logger = logging.getLogger(__name__)
+
+
+def get_bulk_response(results):
+    return {
+        'items': results,
+        'errors': sum(1 for result in results if result['status'] not in (bulk.CREATED, bulk.UPDATED, bulk.DELETED))
+    }
+
+
+class BulkResource:
+    """Create, update and delete many resources in one request
+
+    POST body: {"items": [metadata, ...]}
+    PATCH body: {"items": [{"id": id, ...metadata}, ...]}
+    DELETE body: {"ids": [id, ...]}
+
+    Items are validated separately, valid ones are written with one bulk
+    operation. Response contains status of each item in order of request.
+    """
+
+    document_type = None
+    create_validator = None
+    update_validator = None
+
+    def create_documents(self, items, context):
+        """Return list of new documents or item results for invalid items"""
+
+        raise NotImplementedError
+
+    @validation.validate(BULK_ITEMS_SCHEMA)
+    def on_post(self, req, resp):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        context = {'user_id': user_id}
+        items = req.media['items']
+
+        results = [None] * len(items)
+        valid = []
+
+        for index, item in enumerate(items):
+            error = validation.get_error(self.create_validator, item)
+
+            if error:
+                results[index] = bulk.item_result(None, bulk.INVALID, error)
+            else:
+                valid.append(index)
+
+        documents = self.create_documents([items[index] for index in valid], context)
+
+        created = [(index, document) for index, document in zip(valid, documents) if not isinstance(document, dict)]
+        for index, document in zip(valid, documents):
+            if isinstance(document, dict):
+                results[index] = document
+
+        created_results = bulk.insert_documents([document for _, document in created])
+        for (index, _), result in zip(created, created_results):
+            results[index] = result
+
+        logger.debug('User {uid} create {n} {type}'.format(uid=user_id, n=len(created), type=self.document_type.__name__))
+
+        resp.status = falcon.HTTP_200
+        resp.media = get_bulk_response(results)
+
+    @validation.validate(BULK_ITEMS_SCHEMA)
+    def on_patch(self, req, resp):
+        if self.update_validator is None:
+            raise falcon.HTTPMethodNotAllowed(['POST', 'DELETE'])
+
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        context = {'user_id': user_id}
+        items = req.media['items']
+
+        results = [None] * len(items)
+        valid = []
+
+        for index, item in enumerate(items):
+            error = validation.get_error(self.update_validator, item)
+
+            if error:
+                results[index] = bulk.item_result(item.get('id', None), bulk.INVALID, error)
+            else:
+                valid.append(index)
+
+        updates = []
+        for index in valid:
+            data = dict(items[index])
+            updates.append((data.pop('id'), data))
+
+        for index, result in zip(valid, bulk.update_documents(self.document_type, updates, context)):
+            results[index] = result
+
+        resp.status = falcon.HTTP_200
+        resp.media = get_bulk_response(results)
+
+    @validation.validate(BULK_IDS_SCHEMA)
+    def on_delete(self, req, resp):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        context = {'user_id': user_id}
+        results = bulk.delete_documents(self.document_type, req.media['ids'], context)
+
+        self.on_deleted([result['id'] for result in results if result['status'] == bulk.DELETED])
+
+        resp.status = falcon.HTTP_200
+        resp.media = get_bulk_response(results)
+
+    def on_deleted(self, ids):
+        pass
+
+
+class DatasetsBulkResource(BulkResource):
+    document_type = metadata.DatasetMetadata
+    create_validator = validation.compile_validator(CREATE_DATASET_SCHEMA)
+    update_validator = validation.compile_validator(get_update_schema(DATASET_SCHEMA))
+
+    def create_documents(self, items, context):
+        date = int(time.time())
+        documents = []
+
+        for item in items:
+            dataset_meta = metadata.DatasetMetadata()
+            dataset_meta.from_flatten(item)
+            dataset_meta.id = str(uuid.uuid4())
+            dataset_meta.url = dataset_meta.id
+            dataset_meta.base.owner = context['user_id']
+            dataset_meta.base.date = date
+            documents.append(dataset_meta)
+
+        return documents
+
+
+class ArchitecturesBulkResource(BulkResource):
+    document_type = metadata.ArchitectureMetadata
+    create_validator = validation.compile_validator(CREATE_ARCHITECTURE_SCHEMA)
+    update_validator = validation.compile_validator(get_update_schema(ARCHITECTURE_SCHEMA))
+
+    def create_documents(self, items, context):
+        date = int(time.time())
+        documents = []
+
+        for item in items:
+            architecture = metadata.ArchitectureMetadata()
+            architecture.from_dict(item)
+            architecture.id = str(uuid.uuid4())
+            architecture.owner = context['user_id']
+            architecture.date = date
+            documents.append(architecture)
+
+        return documents
+
+
+class ModelsBulkResource(BulkResource):
+    document_type = metadata.ModelMetadata
+    create_validator = validation.compile_validator(CREATE_MODEL_SCHEMA)
+    update_validator = validation.compile_validator(get_update_schema(MODEL_SCHEMA))
+
+    def create_documents(self, items, context):
+        # resolve references of all items with one $in query per collection
+        dataset_ids = list({item['dataset'] for item in items})
+        datasets = metadata.get_datasets(context).filter(id__in=dataset_ids)
+        datasets = {dataset.id: dataset for dataset in datasets}
+
+        architecture_ids = list({item['architecture'] for item in items})
+        architectures = metadata.get_architectures(context).filter(id__in=architecture_ids)
+        architectures = {architecture.id: architecture for architecture in architectures}
+
+        date = int(time.time())
+        documents = []
+
+        for item in items:
+            if item['dataset'] not in datasets:
+                documents.append(bulk.item_result(None, bulk.NOT_FOUND, 'Dataset metadata does not exist'))
+                continue
+
+            if item['architecture'] not in architectures:
+                documents.append(bulk.item_result(None, bulk.NOT_FOUND, 'Architecture metadata does not exist'))
+                continue
+
+            data = dict(item, dataset=datasets[item['dataset']], architecture=architectures[item['architecture']])
+
+            model_meta = metadata.ModelMetadata()
+            model_meta.from_flatten(data)
+            model_meta.id = str(uuid.uuid4())
+            model_meta.url = model_meta.id
+            model_meta.base.owner = context['user_id']
+            model_meta.base.date = date
+            documents.append(model_meta)
+
+        return documents
+
+
+class TasksBulkResource(BulkResource):
+    document_type = metadata.TaskMetadata
+    create_validator = validation.compile_validator(TASK_SCHEMA)
+
+    def create_documents(self, items, context):
+        documents = []
+
+        for item in items:
+            task = metadata.TaskMetadata()
+            task.from_dict(item)
+            task.id = str(uuid.uuid4())
+            task.owner = context['user_id']
+            documents.append(task)
+
+        return documents
+
+    def on_deleted(self, ids):
+        if ids:
+            manager.revoke_all(ids)
+            metadata.delete_history(ids)
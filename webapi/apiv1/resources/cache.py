@@ -0,0 +1,13 @@
+import falcon
+
+import metadata
+
+__all__ = [
+    'MetadataCacheMetricsResource'
+]
+
+
+class MetadataCacheMetricsResource:
+    def on_get(self, req, resp):
+        resp.status = falcon.HTTP_200
+        resp.media = metadata.METADATA_CACHE.metrics()
@@ -1,20 +1,27 @@
+import time
 import logging
 import uuid
 import cgi
 
 import falcon
-from falcon.media.validators import jsonschema
 
 import metadata
 import manager
+import storage
+from ... import fileserving
+from .. import validation
 from ..schema.dataset import DATASET_SCHEMA, CREATE_DATASET_SCHEMA
+from . import projection
 
 __all__ = [
-    'DatasetResource'
+    'DatasetResource',
+    'DatasetFileResource'
 ]
 
 logger = logging.getLogger(__name__)
 
+RESULT_KEYS = ['id', 'status', 'is_public', 'owner', 'hash', 'size', 'date', 'title', 'description', 'category', 'labels']
+
 MAX_DATASET_SIZE = 1 * 10**9  # in bytes
 
 
@@ -33,9 +40,11 @@ class DatasetResource:
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
+        fields = projection.get_fields(req, RESULT_KEYS)
+
         try:
             context = {'user_id': user_id}
-            dataset_meta = manager.get_dataset(id, context)
+            dataset_meta = manager.get_dataset(id, context, fields)
         except metadata.DoesNotExist:
             logger.debug('Dataset {id} does not exist'.format(id=id))
 
@@ -46,8 +55,7 @@ class DatasetResource:
 
         resp.status = falcon.HTTP_200
         dataset_meta_dict = dataset_meta.to_dict()
-        result_keys = ['id', 'status', 'is_public', 'owner', 'hash', 'size', 'date', 'title', 'description', 'category', 'labels']
-        resp.media = {key: dataset_meta_dict[key] for key in result_keys if key in dataset_meta_dict}
+        resp.media = {key: dataset_meta_dict[key] for key in fields if key in dataset_meta_dict}
     
     def get_description(self, req, resp):
         raise falcon.HTTPNotFound(
@@ -131,7 +139,7 @@ class DatasetResource:
         elif dataset_meta.status == metadata.dataset.RECEIVED:
             self.dataset_already_uploaded(req, resp, id)
 
-    @jsonschema.validate(CREATE_DATASET_SCHEMA)
+    @validation.validate(CREATE_DATASET_SCHEMA)
     def create_dataset_meta(self, req, resp):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -141,6 +149,7 @@ class DatasetResource:
             dataset_meta.id = str(uuid.uuid4())
             dataset_meta.url = dataset_meta.id
             dataset_meta.base.owner = user_id
+            dataset_meta.base.date = int(time.time())
 
         logger.debug('User {uid} create dataset {did}'.format(uid=user_id, did=dataset_meta.id))
 
@@ -149,7 +158,7 @@ class DatasetResource:
             'id': dataset_meta.id
         }
 
-    @jsonschema.validate(DATASET_SCHEMA)
+    @validation.validate(DATASET_SCHEMA)
     def on_patch(self, req, resp, id):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -188,3 +197,34 @@ class DatasetResource:
             )
 
         resp.status = falcon.HTTP_200
+
+
+class DatasetFileResource:
+    auth = {
+        'optional_methods': ['GET']
+    }
+
+    def on_get(self, req, resp, id):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        try:
+            context = {'user_id': user_id}
+            dataset_meta = manager.get_dataset(id, context)
+        except metadata.DoesNotExist:
+            logger.debug('Dataset {id} does not exist'.format(id=id))
+
+            raise falcon.HTTPNotFound(
+                title="Dataset not found",
+                description="Dataset metadata does not exist"
+            )
+
+        if dataset_meta.status not in (metadata.dataset.RECEIVED, metadata.dataset.PUBLISHED):
+            raise falcon.HTTPNotFound(
+                title="Dataset not uploaded",
+                description="Dataset file is not uploaded"
+            )
+
+        dataset_path = storage.get_dataset_path(dataset_meta.url)
+        filename = '{id}.hdf5'.format(id=dataset_meta.id)
+        fileserving.serve_file(req, resp, dataset_path, etag=dataset_meta.base.hash, filename=filename)
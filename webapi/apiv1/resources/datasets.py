@@ -2,6 +2,8 @@ import logging
 
 import falcon
 import metadata
+from . import pagination
+from . import projection
 
 __all__ = [
     'DatasetsResource',
@@ -11,19 +13,24 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+RESULT_KEYS = ['id', 'status', 'is_public', 'owner', 'hash', 'size', 'date', 'title', 'description', 'category', 'labels']
+
 
 class DatasetsResource:
     def on_get(self, req, resp):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
+        filter = pagination.get_page_filter(req)
+
         context = {'user_id': user_id}
-        datasets = metadata.get_datasets(context)
-        ids = [meta.id for meta in datasets]
+        datasets = metadata.flatten_all(metadata.get_datasets(context, filter, fields=['id']))
+        ids = [meta['id'] for meta in datasets]
 
         resp.status = falcon.HTTP_200
         resp.media = {
-            'ids': ids  # response schema v0.2.1
+            'ids': ids,  # response schema v0.2.1
+            'next': pagination.get_next_cursor(datasets, filter, metadata.DatasetMetadata)
         }
 
 
@@ -32,39 +39,24 @@ class DatasetsFullResource:
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
-        from_ = int(req.params.get('from', 0))
-
-        if from_ < 0:
-            raise falcon.HTTPBadRequest(
-                title="Bad Request",
-                description="From must be greater than 0"
-            )
-
-        number = int(req.params.get('number', 99999))
-
-        if number < 0:
-            raise falcon.HTTPBadRequest(
-                title="Bad Request",
-                description="Number must be greater than 0"
-            )
+        filter = pagination.get_page_filter(req)
+        fields = projection.get_fields(req, RESULT_KEYS)
 
         context = {'user_id': user_id}
-        filter = {'from': from_, 'number': number}
-        datasets = metadata.get_datasets(context, filter)
-        datasets_meta = self.get_datasets_meta(datasets)
+        datasets = metadata.flatten_all(metadata.get_datasets(context, filter, fields))
+        datasets_meta = self.get_datasets_meta(datasets, fields)
 
         resp.status = falcon.HTTP_200
         resp.media = {
-            'datasets': datasets_meta  # response schema v0.2.2
+            'datasets': datasets_meta,  # response schema v0.2.2
+            'next': pagination.get_next_cursor(datasets, filter, metadata.DatasetMetadata)
         }
 
     @staticmethod
-    def get_datasets_meta(datasets):
+    def get_datasets_meta(datasets, result_keys=RESULT_KEYS):
         datasets_meta = []
 
-        for dataset in datasets:
-            dataset_meta_dict = dataset.to_dict()
-            result_keys = ['id', 'status', 'is_public', 'owner', 'hash', 'size', 'date', 'title', 'description', 'category', 'labels']
+        for dataset_meta_dict in datasets:
             dataset_meta = {key: dataset_meta_dict[key] for key in result_keys if key in dataset_meta_dict}
             datasets_meta.append(dataset_meta)
 
@@ -77,7 +69,7 @@ class DatasetsNumberResource:
         logger.debug('Authorize user {id}'.format(id=user_id))
 
         context = {'user_id': user_id}
-        number = metadata.get_datasets(context).count()
+        number = metadata.count_visible(metadata.DatasetMetadata, context)
 
         resp.status = falcon.HTTP_200
         resp.media = number
@@ -1,19 +1,27 @@
+import time
 import uuid
 import logging
 
 import falcon
-from falcon.media.validators import jsonschema
 
 import metadata
 import manager
+import storage
+from .... import fileserving
+from ... import validation
 from ...schema.model import MODEL_SCHEMA, CREATE_MODEL_SCHEMA
+from .. import projection
 
 __all__ = [
-    'ModelResource'
+    'ModelResource',
+    'ModelFileResource'
 ]
 
 logger = logging.getLogger(__name__)
 
+RESULT_KEYS = ['id', 'status', 'is_public', 'hash', 'owner', 'size', 'date', 'title', 'description',
+               'category', 'labels', 'metrics', 'architecture', 'dataset', 'architecture_title', 'dataset_title']
+
 
 class ModelResource:
     auth = {
@@ -30,9 +38,12 @@ class ModelResource:
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
+        fields = projection.get_fields(req, RESULT_KEYS)
+        expand = projection.get_expand(req, metadata.model.EXPANDED_REFERENCES)
+
         try:
             context = {'user_id': user_id}
-            model_meta = metadata.get_model(id, context)
+            model_meta = metadata.get_model(id, context, fields)
         except metadata.DoesNotExist:
             logger.debug('Model {id} does not exist'.format(id=id))
 
@@ -43,9 +54,8 @@ class ModelResource:
 
         resp.status = falcon.HTTP_200
         model_meta_dict = model_meta.to_dict()
-        result_keys = ['id', 'status', 'is_public', 'hash', 'owner', 'size', 'date', 'title', 'description',
-                       'category', 'labels', 'metrics', 'architecture', 'dataset']
-        resp.media = {key: model_meta_dict[key] for key in result_keys if key in model_meta_dict}
+        metadata.expand_references([model_meta_dict], expand, context)
+        resp.media = {key: model_meta_dict[key] for key in fields if key in model_meta_dict}
 
     def get_description(self, req, resp):
         raise falcon.HTTPNotFound(
@@ -65,7 +75,7 @@ class ModelResource:
             description="Can not update model metadata"
         )
 
-    @jsonschema.validate(CREATE_MODEL_SCHEMA)
+    @validation.validate(CREATE_MODEL_SCHEMA)
     def create_model_meta(self, req, resp):
         user_id = req.context['user']
         context = {'user_id': user_id}
@@ -99,6 +109,7 @@ class ModelResource:
             model_meta.id = str(uuid.uuid4())
             model_meta.url = model_meta.id
             model_meta.base.owner = user_id
+            model_meta.base.date = int(time.time())
 
         logger.debug('User {uid} create model {did}'.format(uid=user_id, did=model_meta.id))
 
@@ -107,7 +118,7 @@ class ModelResource:
             'id': model_meta.id
         }
 
-    @jsonschema.validate(MODEL_SCHEMA)
+    @validation.validate(MODEL_SCHEMA)
     def on_patch(self, req, resp, id):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -146,3 +157,34 @@ class ModelResource:
             )
 
         resp.status = falcon.HTTP_200
+
+
+class ModelFileResource:
+    auth = {
+        'optional_methods': ['GET']
+    }
+
+    def on_get(self, req, resp, id):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        try:
+            context = {'user_id': user_id}
+            model_meta = metadata.get_model(id, context)
+        except metadata.DoesNotExist:
+            logger.debug('Model {id} does not exist'.format(id=id))
+
+            raise falcon.HTTPNotFound(
+                title="Model not found",
+                description="Model metadata does not exist"
+            )
+
+        if model_meta.status not in (metadata.model.READY, metadata.model.PUBLISHED):
+            raise falcon.HTTPNotFound(
+                title="Model not trained",
+                description="Model file does not exist"
+            )
+
+        model_path = storage.get_model_path(model_meta.url)
+        filename = '{id}.hdf5'.format(id=model_meta.id)
+        fileserving.serve_file(req, resp, model_path, etag=model_meta.base.hash, filename=filename)
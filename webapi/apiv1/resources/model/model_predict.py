@@ -1,26 +1,42 @@
+import io
 import logging
-import os
 
+import numpy
 import falcon
-from falcon.media.validators import jsonschema
 
 import metadata
 import storage
+from ... import validation
 from ...schema.model_predict import MODEL_PREDICT_SCHEMA
 import manager
 from .... import errors
+from .... import fileserving
 
 __all__ = [
     'ModelPredictResource',
     'ModelPredictStatusResource',
-    'ModelPredictResult'
+    'ModelPredictResult',
+    'ModelPredictResultQuery'
 ]
 
 logger = logging.getLogger(__name__)
 
+JSON_FORMAT = 'json'
+NPY_FORMAT = 'npy'
+NPZ_FORMAT = 'npz'
+
+RESULT_FORMATS = [
+    JSON_FORMAT,
+    NPY_FORMAT,
+    NPZ_FORMAT
+]
+
+DEFAULT_RESULT_ROWS = 100
+MAX_RESULT_ROWS = 10000
+
 
 class ModelPredictResource:
-    @jsonschema.validate(MODEL_PREDICT_SCHEMA)
+    @validation.validate(MODEL_PREDICT_SCHEMA)
     def on_post(self, req, resp, id):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -107,9 +123,111 @@ class ModelPredictResult:
 
         temp_id = task.history['result']
         temp_path = storage.get_dataset_path(temp_id, prefix='tmp')
+        result_hash = task.history.get('result_hash', None)
 
-        resp.status = falcon.HTTP_200
+        filename = '{id}.hdf5'.format(id=tid)
+        fileserving.serve_file(req, resp, temp_path, etag=result_hash, filename=filename)
+
+
+class ModelPredictResultQuery:
+    def on_get(self, req, resp, tid):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        from_ = req.get_param_as_int('from') or 0
+
+        if from_ < 0:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="From must be greater than 0"
+            )
+
+        number = req.get_param_as_int('number')
+        number = DEFAULT_RESULT_ROWS if number is None else number
+
+        if number < 0 or number > MAX_RESULT_ROWS:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="Number must be between 0 and {max}".format(max=MAX_RESULT_ROWS)
+            )
+
+        reduce = req.get_param('reduce')
+
+        if reduce is not None and reduce not in manager.result.RESULT_REDUCTIONS:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="Reduce must be one of {reductions}".format(reductions=manager.result.RESULT_REDUCTIONS)
+            )
+
+        k = req.get_param_as_int('k') or 1
+
+        if k < 1:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="K must be greater than 0"
+            )
+
+        format = req.get_param('format') or JSON_FORMAT
 
-        resp.content_type = 'application/octet-stream'
-        resp.stream_len = os.path.getsize(temp_path)
-        resp.stream = open(temp_path, 'rb')
+        if format not in RESULT_FORMATS:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="Format must be one of {formats}".format(formats=RESULT_FORMATS)
+            )
+
+        try:
+            context = {'user_id': user_id}
+            task = metadata.get_task(tid, context)
+        except metadata.DoesNotExist:
+            logger.debug('Task {id} does not exist'.format(id=tid))
+
+            raise falcon.HTTPNotFound(
+                title="Task not found",
+                description="Task metadata does not exist"
+            )
+
+        if 'result' not in task.history:
+            raise falcon.HTTPNotFound(
+                title='Task is not completed',
+                description='Task is not completed'
+            )
+
+        try:
+            total, result = manager.read_predict_result(task, from_, number, reduce, k)
+        except OSError:
+            raise falcon.HTTPNotFound(
+                title="File not found",
+                description="Result file does not exist"
+            )
+
+        resp.status = falcon.HTTP_200
+        resp.set_header('X-Total-Count', str(total))
+
+        if format == JSON_FORMAT:
+            media = {key: value.tolist() for key, value in result.items()}
+            media.update({
+                'id': tid,
+                'from': from_,
+                'number': number,
+                'total': total
+            })
+
+            resp.media = media
+        elif format == NPY_FORMAT:
+            if len(result) != 1:
+                raise falcon.HTTPBadRequest(
+                    title="Bad Request",
+                    description="Format npy supports one array, use npz"
+                )
+
+            buffer = io.BytesIO()
+            numpy.save(buffer, next(iter(result.values())), allow_pickle=False)
+
+            resp.content_type = 'application/x-npy'
+            resp.data = buffer.getvalue()
+        else:
+            buffer = io.BytesIO()
+            numpy.savez_compressed(buffer, **result)
+
+            resp.content_type = 'application/x-npz'
+            resp.data = buffer.getvalue()
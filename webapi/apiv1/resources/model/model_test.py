@@ -1,9 +1,9 @@
 import logging
 
 import falcon
-from falcon.media.validators import jsonschema
 
 import metadata
+from ... import validation
 from ...schema.model_test import MODEL_TEST_SCHEMA
 import manager
 from .... import errors
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 
 
 class ModelTestResource:
-    @jsonschema.validate(MODEL_TEST_SCHEMA)
+    @validation.validate(MODEL_TEST_SCHEMA)
     def on_post(self, req, resp, id):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -1,10 +1,10 @@
 import logging
 
 import falcon
-from falcon.media.validators import jsonschema
 
 import metadata
 import manager
+from ... import validation
 from ...schema.model_train import MODEL_TRAIN_SCHEMA
 from .... import errors
 
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 
 
 class ModelTrainResource:
-    @jsonschema.validate(MODEL_TRAIN_SCHEMA)
+    @validation.validate(MODEL_TRAIN_SCHEMA)
     def on_post(self, req, resp, id):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -88,7 +88,7 @@ class ModelTrainStatusResource:
         resp.media = {
             'id': tid,
             'config': task.config,
-            'history': task.history
+            'history': metadata.get_task_history(task)
         }
 
 
@@ -112,4 +112,4 @@ class ModelTrainResult:
             resp.status = falcon.HTTP_201
         else:
             resp.status = falcon.HTTP_200
-        resp.media = task.history
+        resp.media = metadata.get_task_history(task)
@@ -3,6 +3,8 @@ import logging
 from mongoengine.queryset.visitor import Q
 import falcon
 import metadata
+from .. import pagination
+from .. import projection
 
 __all__ = [
     'ModelsResource',
@@ -12,19 +14,25 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+RESULT_KEYS = ['id', 'status', 'is_public', 'hash', 'owner', 'size', 'date', 'title', 'description',
+               'category', 'labels', 'metrics', 'architecture', 'dataset', 'architecture_title', 'dataset_title']
+
 
 class ModelsResource:
     def on_get(self, req, resp):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
+        filter = pagination.get_page_filter(req)
+
         context = {'user_id': user_id}
-        models = metadata.get_models(context)
-        ids = [meta.id for meta in models]
+        models = metadata.flatten_all(metadata.get_models(context, filter, fields=['id']))
+        ids = [meta['id'] for meta in models]
 
         resp.status = falcon.HTTP_200
         resp.media = {
-            'ids': ids  # response schema v0.2.1
+            'ids': ids,  # response schema v0.2.1
+            'next': pagination.get_next_cursor(models, filter, metadata.ModelMetadata)
         }
 
 
@@ -33,40 +41,26 @@ class ModelsFullResource:
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
-        from_ = int(req.params.get('from', 0))
-
-        if from_ < 0:
-            raise falcon.HTTPBadRequest(
-                title="Bad Request",
-                description="From must be greater than 0"
-            )
-
-        number = int(req.params.get('number', 99999))
-
-        if number < 0:
-            raise falcon.HTTPBadRequest(
-                title="Bad Request",
-                description="Number must be greater than 0"
-            )
+        filter = pagination.get_page_filter(req)
+        fields = projection.get_fields(req, RESULT_KEYS)
+        expand = projection.get_expand(req, metadata.model.EXPANDED_REFERENCES)
 
         context = {'user_id': user_id}
-        filter = {'from': from_, 'number': number}
-        models = metadata.get_models(context, filter)
-        models_meta = self.get_models_meta(models)
+        models = metadata.flatten_all(metadata.get_models(context, filter, fields))
+        models = metadata.expand_references(models, expand, context)
+        models_meta = self.get_models_meta(models, fields)
 
         resp.status = falcon.HTTP_200
         resp.media = {
-            'models': models_meta  # response schema v0.2.2
+            'models': models_meta,  # response schema v0.2.2
+            'next': pagination.get_next_cursor(models, filter, metadata.ModelMetadata)
         }
 
     @staticmethod
-    def get_models_meta(models):
+    def get_models_meta(models, result_keys=RESULT_KEYS):
         models_meta = []
 
-        for model in models:
-            model_meta_dict = model.to_dict()
-            result_keys = ['id', 'status', 'is_public', 'hash', 'owner', 'size', 'date', 'title', 'description',
-                           'category', 'labels', 'metrics', 'architecture', 'dataset']
+        for model_meta_dict in models:
             model_meta = {key: model_meta_dict[key] for key in result_keys if key in model_meta_dict}
             models_meta.append(model_meta)
 
@@ -79,7 +73,7 @@ class ModelsNumberResource:
         logger.debug('Authorize user {id}'.format(id=user_id))
 
         context = {'user_id': user_id}
-        number = metadata.get_models(context).count()
+        number = metadata.count_visible(metadata.ModelMetadata, context)
 
         resp.status = falcon.HTTP_200
         resp.media = number
@@ -0,0 +1,58 @@
+import falcon
+
+import metadata
+
+
+def get_page_filter(req):
+    """Return page filter from request params: from, number, after
+
+    Raises:
+        falcon.HTTPBadRequest - invalid params
+    """
+
+    from_ = int(req.params.get('from', 0))
+
+    if from_ < 0:
+        raise falcon.HTTPBadRequest(
+            title="Bad Request",
+            description="From must be greater than 0"
+        )
+
+    number = int(req.params.get('number', metadata.MAX_PAGE_SIZE))
+
+    if number < 0:
+        raise falcon.HTTPBadRequest(
+            title="Bad Request",
+            description="Number must be greater than 0"
+        )
+
+    filter = {'from': from_, 'number': number}
+
+    after = req.params.get('after', None)
+
+    if after:
+        try:
+            metadata.decode_cursor(after)
+        except ValueError:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="After is not valid cursor"
+            )
+
+        filter['after'] = after
+
+    return filter
+
+
+def get_next_cursor(metas, filter, document_type=None):
+    """Return cursor of next page or None if page is last
+
+    document_type is needed for flatten documents of types not paginated by date
+    """
+
+    number = min(filter['number'], metadata.MAX_PAGE_SIZE)
+
+    if number and len(metas) >= number:
+        return metadata.encode_cursor(metas[-1], document_type)
+
+    return None
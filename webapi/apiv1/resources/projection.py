@@ -0,0 +1,44 @@
+import falcon
+
+
+def get_fields(req, result_keys):
+    """Return fields requested by 'fields' param or all result keys
+
+    Raises:
+        falcon.HTTPBadRequest - unknown field
+    """
+
+    fields = req.get_param_as_list('fields')
+
+    if not fields:
+        return result_keys
+
+    unknown = [field for field in fields if field not in result_keys]
+
+    if unknown:
+        raise falcon.HTTPBadRequest(
+            title="Bad Request",
+            description="Unknown fields: {fields}".format(fields=', '.join(unknown))
+        )
+
+    return fields
+
+
+def get_expand(req, references):
+    """Return names of references requested by 'expand' param
+
+    Raises:
+        falcon.HTTPBadRequest - unknown reference
+    """
+
+    expand = req.get_param_as_list('expand') or []
+
+    unknown = [name for name in expand if name not in references]
+
+    if unknown:
+        raise falcon.HTTPBadRequest(
+            title="Bad Request",
+            description="Unknown references: {names}".format(names=', '.join(unknown))
+        )
+
+    return expand
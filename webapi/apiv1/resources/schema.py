@@ -1,5 +1,9 @@
+import json
+import hashlib
+
 import falcon
 
+from ...fileserving import etag_matches
 from ..schema import dataset
 from ..schema import architecture
 from ..schema import model
@@ -18,92 +22,144 @@ __all__ = [
     'SchemaModelTrainResource',
     'SchemaModelTestResource',
     'SchemaTaskResource',
-    'SchemaModelPredictResource'
+    'SchemaModelPredictResource',
+    'SchemaContentResource'
 ]
 
+HASH_LENGTH = 32  # hex digits of sha256
+
+# schema may change on deploy, clients revalidate by etag
+CACHE_CONTROL = ['public', 'max-age=300']
+# content of versioned url never changes
+IMMUTABLE_CACHE_CONTROL = ['public', 'max-age=31536000', 'immutable']
+
+
+class StaticDocument:
+    """JSON document serialized once, with hash of content"""
+
+    def __init__(self, document):
+        self.data = json.dumps(document, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        self.hash = hashlib.sha256(self.data).hexdigest()[:HASH_LENGTH]
+        self.etag = '"{hash}"'.format(hash=self.hash)
+
+
+def serve_document(req, resp, document, cache_control):
+    """Send serialized document with strong etag, 304 if client has it"""
 
-class SchemaModelLayersResource:
+    resp.etag = document.etag
+    resp.cache_control = cache_control
+
+    if_none_match = req.if_none_match
+    if if_none_match and etag_matches(if_none_match, document.etag):
+        resp.status = falcon.HTTP_304
+        return
+
+    resp.status = falcon.HTTP_200
+    resp.content_type = falcon.MEDIA_JSON
+    resp.data = document.data
+
+
+class SchemaResource:
     auth = {
         'exempt_methods': ['GET']
     }
 
-    def __init__(self, enable_new_layer=True):
-        self.enable_new_layer = enable_new_layer
+    schema = None
+
+    def __init__(self):
+        self.document = StaticDocument(self.get_schema())
+        self.content_location = None
+
+    def get_schema(self):
+        return self.schema
 
     def on_get(self, req, resp):
-        resp.status = falcon.HTTP_200
+        if self.content_location:
+            resp.set_header('Content-Location', self.content_location)
+
+        serve_document(req, resp, self.document, CACHE_CONTROL)
+
+
+class SchemaModelLayersResource(SchemaResource):
+    def __init__(self, enable_new_layer=True):
+        self.enable_new_layer = enable_new_layer
+        super().__init__()
 
+    def get_schema(self):
         if self.enable_new_layer:
-            resp.media = layers.LAYERS
+            return layers.LAYERS
         else:
-            resp.media = layers.OLD_LAYERS
+            return layers.OLD_LAYERS
 
 
-class SchemaDatasetResource:
-    auth = {
-        'exempt_methods': ['GET']
-    }
+class SchemaDatasetResource(SchemaResource):
+    schema = dataset.CREATE_DATASET_SCHEMA
 
-    def on_get(self, req, resp):
-        resp.status = falcon.HTTP_200
-        resp.media = dataset.CREATE_DATASET_SCHEMA
 
+class SchemaArchitectureResource(SchemaResource):
+    schema = architecture.CREATE_ARCHITECTURE_SCHEMA
 
-class SchemaArchitectureResource:
-    auth = {
-        'exempt_methods': ['GET']
-    }
 
-    def on_get(self, req, resp):
-        resp.status = falcon.HTTP_200
-        resp.media = architecture.CREATE_ARCHITECTURE_SCHEMA
+class SchemaModelResource(SchemaResource):
+    schema = model.CREATE_MODEL_SCHEMA
 
 
-class SchemaModelResource:
-    auth = {
-        'exempt_methods': ['GET']
-    }
+class SchemaTaskResource(SchemaResource):
+    schema = task.TASK_SCHEMA
 
-    def on_get(self, req, resp):
-        resp.status = falcon.HTTP_200
-        resp.media = model.CREATE_MODEL_SCHEMA
 
+class SchemaModelTrainResource(SchemaResource):
+    schema = model_train.MODEL_TRAIN_SCHEMA
 
-class SchemaTaskResource:
-    auth = {
-        'exempt_methods': ['GET']
-    }
 
-    def on_get(self, req, resp):
-        resp.status = falcon.HTTP_200
-        resp.media = task.TASK_SCHEMA
+class SchemaModelTestResource(SchemaResource):
+    schema = model_test.MODEL_TEST_SCHEMA
 
 
-class SchemaModelTrainResource:
-    auth = {
-        'exempt_methods': ['GET']
-    }
+class SchemaModelPredictResource(SchemaResource):
+    schema = model_predict.MODEL_PREDICT_SCHEMA
 
-    def on_get(self, req, resp):
-        resp.status = falcon.HTTP_200
-        resp.media = model_train.MODEL_TRAIN_SCHEMA
 
+class SchemaContentResource:
+    """Schemas by content hash, for caching forever
+
+    GET schema - names of schemas to versioned urls
+    GET schema/content/{hash} - schema with the hash
+    """
 
-class SchemaModelTestResource:
     auth = {
         'exempt_methods': ['GET']
     }
 
-    def on_get(self, req, resp):
-        resp.status = falcon.HTTP_200
-        resp.media = model_test.MODEL_TEST_SCHEMA
+    def __init__(self, base_url, resources):
+        """
+        Args:
+            base_url (str): url of versioned schemas, hash is appended
+            resources (dict): name of schema to SchemaResource
+        """
 
+        self.documents = {}
+        urls = {}
 
-class SchemaModelPredictResource:
-    auth = {
-        'exempt_methods': ['GET']
-    }
+        for name, resource in resources.items():
+            url = base_url + resource.document.hash
+            resource.content_location = url
+            urls[name] = url
+            self.documents[resource.document.hash] = resource.document
 
-    def on_get(self, req, resp):
-        resp.status = falcon.HTTP_200
-        resp.media = model_predict.MODEL_PREDICT_SCHEMA
+        self.index = StaticDocument(urls)
+
+    def on_get(self, req, resp, hash=None):
+        if hash is None:
+            serve_document(req, resp, self.index, CACHE_CONTROL)
+            return
+
+        document = self.documents.get(hash, None)
+
+        if document is None:
+            raise falcon.HTTPNotFound(
+                title="Schema not found",
+                description="Schema with this hash does not exist"
+            )
+
+        serve_document(req, resp, document, IMMUTABLE_CACHE_CONTROL)
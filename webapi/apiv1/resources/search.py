@@ -0,0 +1,131 @@
+import logging
+
+import falcon
+
+import metadata
+from metadata import search
+from . import pagination
+from . import projection
+from . import datasets
+from . import architectures
+from .model import models
+
+__all__ = [
+    'DatasetsSearchResource',
+    'ArchitecturesSearchResource',
+    'ModelsSearchResource'
+]
+
+logger = logging.getLogger(__name__)
+
+
+def get_facet_values(req):
+    """Return dict of facet name to value from request params
+
+    Raises:
+        falcon.HTTPBadRequest - invalid is_public param
+    """
+
+    facets = {}
+
+    for name in (search.CATEGORY, search.STATUS, search.OWNER):
+        value = req.get_param(name)
+
+        if value is not None:
+            facets[name] = value
+
+    is_public = req.get_param_as_bool(search.IS_PUBLIC)
+    if is_public is not None:
+        facets[search.IS_PUBLIC] = is_public
+
+    return facets
+
+
+def get_facet_names(req):
+    """Return names of facets to count, requested by 'facets' param
+
+    Raises:
+        falcon.HTTPBadRequest - unknown facet
+    """
+
+    names = req.get_param_as_list('facets') or []
+
+    unknown = [name for name in names if name not in metadata.SEARCH_FACETS]
+
+    if unknown:
+        raise falcon.HTTPBadRequest(
+            title="Bad Request",
+            description="Unknown facets: {names}".format(names=', '.join(unknown))
+        )
+
+    return names
+
+
+class SearchResource:
+    """Full-text search with facets
+
+    Params:
+        q: words searched in title, description and labels
+        category, status, owner, is_public: facet values
+        facets: comma separated names of facets to count
+        sort: date, -date or relevance
+        after, from, number, fields: as in */full
+    """
+
+    document_type = None
+    result_name = None
+    result_keys = None
+
+    def on_get(self, req, resp):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        text = req.get_param('q') or None
+        sort = req.get_param('sort') or search.DATE
+        facets = get_facet_values(req)
+        facet_names = get_facet_names(req)
+
+        filter = pagination.get_page_filter(req)
+        fields = projection.get_fields(req, self.result_keys)
+
+        context = {'user_id': user_id}
+
+        try:
+            metas = metadata.search_metadata(self.document_type, context, text, facets, sort, filter, fields)
+        except ValueError as err:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description=str(err)
+            )
+
+        metas = metadata.flatten_all(metas)
+
+        result = {
+            self.result_name: [{key: meta[key] for key in fields if key in meta} for meta in metas],
+            # position in relevance order is not cursor, from param is used
+            'next': pagination.get_next_cursor(metas, filter, self.document_type) if sort != search.RELEVANCE else None
+        }
+
+        if facet_names:
+            result['facets'] = metadata.count_facets(self.document_type, context, text, facets, facet_names)
+
+        resp.status = falcon.HTTP_200
+        resp.media = result
+
+
+class DatasetsSearchResource(SearchResource):
+    document_type = metadata.DatasetMetadata
+    result_name = 'datasets'
+    result_keys = datasets.RESULT_KEYS
+
+
+class ArchitecturesSearchResource(SearchResource):
+    document_type = metadata.ArchitectureMetadata
+    result_name = 'architectures'
+    result_keys = architectures.RESULT_KEYS
+
+
+class ModelsSearchResource(SearchResource):
+    document_type = metadata.ModelMetadata
+    result_name = 'models'
+    result_keys = models.RESULT_KEYS
@@ -0,0 +1,23 @@
+import logging
+
+import falcon
+
+import metadata
+
+__all__ = [
+    'SummaryResource'
+]
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryResource:
+    def on_get(self, req, resp):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        context = {'user_id': user_id}
+        summary = metadata.get_summary(context)
+
+        resp.status = falcon.HTTP_200
+        resp.media = summary
@@ -1,28 +1,160 @@
+import json
 import uuid
 import logging
 
 import falcon
-from falcon.media.validators import jsonschema
 
 import metadata
 import manager
+from .. import validation
 from ..schema.task import TASK_SCHEMA
+from . import projection
 
 __all__ = [
-    'TaskResource'
+    'TaskResource',
+    'TaskHistoryResource',
+    'TaskEventsResource'
 ]
 
 logger = logging.getLogger(__name__)
 
+RESULT_KEYS = ['id', 'status', 'command', 'date', 'config']
+
+FINAL_STATUSES = [
+    metadata.task.SUCCESS,
+    metadata.task.FAILURE,
+    metadata.task.REVOKED
+]
+
+HEARTBEAT_INTERVAL = 15  # seconds
+RECONNECT_TIME = 3000  # milliseconds, retry hint for EventSource
+
+
+def format_event(event, data):
+    return 'event: {event}\ndata: {data}\n\n'.format(
+        event=event,
+        data=json.dumps(data, separators=(',', ':'))).encode('utf-8')
+
+
+def get_state_events(task_id, old, new):
+    """Return list of (event, data) of changes between states of task"""
+
+    events = []
+
+    progress = {key: value for key, value in new.items() if key != 'status' and old.get(key) != value}
+
+    if progress:
+        progress['id'] = task_id
+        progress['progress'] = metadata.summary.get_progress(new)
+        events.append(('progress', progress))
+
+    # final status is last event of stream
+    if new.get('status') != old.get('status'):
+        events.append(('status', {'id': task_id, 'status': new.get('status')}))
+
+    return events
+
+
+def get_start_chunks(task_id, state):
+    chunks = ['retry: {time}\n\n'.format(time=RECONNECT_TIME).encode('utf-8')]
+    chunks.extend(format_event(event, data) for event, data in get_state_events(task_id, {}, state))
+
+    return chunks
+
+
+def get_update_chunks(task_id, state, new_state):
+    """Return chunks of new state (None after heartbeat timeout) and True if stream ends"""
+
+    if new_state is None:
+        return [b': keep-alive\n\n'], False
+
+    if new_state == metadata.feed.DELETED:
+        return [format_event('deleted', {'id': task_id})], True
+
+    chunks = [format_event(event, data) for event, data in get_state_events(task_id, state, new_state)]
+
+    return chunks, new_state.get('status') in FINAL_STATUSES
+
+
+def iter_task_events(feed, subscription, state, heartbeat=HEARTBEAT_INTERVAL):
+    """Yield server-sent events of task until final status, unsubscribe at end"""
+
+    task_id = subscription.task_id
+
+    try:
+        yield from get_start_chunks(task_id, state)
+        finished = state.get('status') in FINAL_STATUSES
+
+        while not finished:
+            new_state = subscription.get(timeout=heartbeat)
+            chunks, finished = get_update_chunks(task_id, state, new_state)
+            yield from chunks
+
+            state = new_state or state
+    finally:
+        feed.unsubscribe(subscription)
+
+
+async def aiter_task_events(feed, subscription, state, heartbeat=HEARTBEAT_INTERVAL):
+    """Async version of iter_task_events, waits for changes on event loop"""
+
+    task_id = subscription.task_id
+
+    try:
+        for chunk in get_start_chunks(task_id, state):
+            yield chunk
+
+        finished = state.get('status') in FINAL_STATUSES
+
+        while not finished:
+            new_state = await subscription.get_async(timeout=heartbeat)
+            chunks, finished = get_update_chunks(task_id, state, new_state)
+
+            for chunk in chunks:
+                yield chunk
+
+            state = new_state or state
+    finally:
+        feed.unsubscribe(subscription)
+
+
+class TaskEventStream:
+    """Response iterable of events, closed by WSGI server also if not started
+
+    Asyncio server iterates stream by __aiter__ on event loop, so open
+    streams do not hold threads of application pool.
+    """
+
+    def __init__(self, feed, subscription, state):
+        self.feed = feed
+        self.subscription = subscription
+        self.state = state
+        self.events = iter_task_events(feed, subscription, state)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.events)
+
+    def __aiter__(self):
+        return aiter_task_events(self.feed, self.subscription, self.state)
+
+    def close(self):
+        self.events.close()
+        self.feed.unsubscribe(self.subscription)
+
 
 class TaskResource:
     def on_get(self, req, resp, id):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
+        fields = projection.get_fields(req, RESULT_KEYS)
+
         try:
             context = {'user_id': user_id}
-            task = metadata.get_task(id, context)
+            task = metadata.get_task(id, context, fields)
         except metadata.DoesNotExist:
             logger.debug('Task {id} does not exist'.format(id=id))
             task = None
@@ -30,15 +162,14 @@ class TaskResource:
         if task:
             resp.status = falcon.HTTP_200
             task_dict = task.to_dict()
-            result_keys = ['id', 'status', 'command', 'date', 'config']
-            resp.media = {key: task_dict[key] for key in result_keys if key in task_dict}
+            resp.media = {key: task_dict[key] for key in fields if key in task_dict}
         else:
             raise falcon.HTTPNotFound(
                 title="Task not found",
                 description="Task metadata does not exist"
             )
 
-    @jsonschema.validate(TASK_SCHEMA)
+    @validation.validate(TASK_SCHEMA)
     def on_post(self, req, resp):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
@@ -72,6 +203,87 @@ class TaskResource:
 
         manager.terminate(id)
         task.delete()
+        metadata.delete_history(id)
 
         resp.status = falcon.HTTP_200
         resp.media = {}
+
+
+class TaskHistoryResource:
+    def on_get(self, req, resp, id):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        kind = req.get_param('kind') or metadata.history.EPOCH
+
+        if kind not in metadata.history.HISTORY_KINDS:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="Kind must be one of {kinds}".format(kinds=metadata.history.HISTORY_KINDS)
+            )
+
+        start = req.get_param_as_int('from') or 0
+        stop = req.get_param_as_int('to')
+
+        if start < 0 or (stop is not None and stop < start):
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="Range must satisfy 0 <= from <= to"
+            )
+
+        try:
+            context = {'user_id': user_id}
+            metadata.get_task(id, context, fields=['id'])
+        except metadata.DoesNotExist:
+            logger.debug('Task {id} does not exist'.format(id=id))
+
+            raise falcon.HTTPNotFound(
+                title="Task not found",
+                description="Task metadata does not exist"
+            )
+
+        resp.status = falcon.HTTP_200
+        resp.media = {
+            'id': id,
+            'kind': kind,
+            'points': metadata.get_history(id, kind, start, stop)
+        }
+
+
+class TaskEventsResource:
+    """Server-sent events of task: status and progress changes
+
+    Stream starts with current state and ends after final status.
+    Subscribers share one watcher of tasks (metadata.TASK_FEED).
+    """
+
+    def __init__(self, feed=None):
+        self.feed = feed or metadata.TASK_FEED
+
+    def on_get(self, req, resp, id):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        # subscribe before reading state, so no change is missed
+        subscription = self.feed.subscribe(id)
+
+        try:
+            context = {'user_id': user_id}
+            task = metadata.get_task(id, context, fields=['id', 'status', 'history'])
+        except metadata.DoesNotExist:
+            self.feed.unsubscribe(subscription)
+            logger.debug('Task {id} does not exist'.format(id=id))
+
+            raise falcon.HTTPNotFound(
+                title="Task not found",
+                description="Task metadata does not exist"
+            )
+
+        state = metadata.get_task_state(task.to_mongo().to_dict())
+
+        resp.status = falcon.HTTP_200
+        resp.content_type = 'text/event-stream'
+        resp.cache_control = ['no-cache']
+        # disable buffering of events by nginx
+        resp.set_header('X-Accel-Buffering', 'no')
+        resp.stream = TaskEventStream(self.feed, subscription, state)
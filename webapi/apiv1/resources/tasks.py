@@ -2,6 +2,8 @@ import logging
 
 import falcon
 import metadata
+from . import pagination
+from . import projection
 
 __all__ = [
     'TasksResource',
@@ -11,20 +13,24 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+RESULT_KEYS = ['id', 'status', 'command', 'date', 'config']
+
 
 class TasksResource:
     def on_get(self, req, resp):
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
-        context = {'user_id': user_id}
-        tasks = metadata.get_tasks(context)
+        filter = pagination.get_page_filter(req)
 
-        ids = [task.id for task in tasks]
+        context = {'user_id': user_id}
+        tasks = metadata.flatten_all(metadata.get_tasks(context, filter, fields=['id']))
+        ids = [task['id'] for task in tasks]
 
         resp.status = falcon.HTTP_200
         resp.media = {
-            'ids': ids  # response schema v0.2.1
+            'ids': ids,  # response schema v0.2.1
+            'next': pagination.get_next_cursor(tasks, filter)
         }
 
 
@@ -33,39 +39,24 @@ class TasksFullResource:
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
-        from_ = int(req.params.get('from', 0))
-
-        if from_ < 0:
-            raise falcon.HTTPBadRequest(
-                title="Bad Request",
-                description="From must be greater than 0"
-            )
-
-        number = int(req.params.get('number', 99999))
-
-        if number < 0:
-            raise falcon.HTTPBadRequest(
-                title="Bad Request",
-                description="Number must be greater than 0"
-            )
+        filter = pagination.get_page_filter(req)
+        fields = projection.get_fields(req, RESULT_KEYS)
 
         context = {'user_id': user_id}
-        filter = {'from': from_, 'number': number}
-        tasks = metadata.get_tasks(context, filter)
-        tasks_meta = self.get_tasks_meta(tasks)
+        tasks = metadata.flatten_all(metadata.get_tasks(context, filter, fields))
+        tasks_meta = self.get_tasks_meta(tasks, fields)
 
         resp.status = falcon.HTTP_200
         resp.media = {
-            'tasks': tasks_meta  # response schema v0.2.2
+            'tasks': tasks_meta,  # response schema v0.2.2
+            'next': pagination.get_next_cursor(tasks, filter)
         }
 
     @staticmethod
-    def get_tasks_meta(tasks):
+    def get_tasks_meta(tasks, result_keys=RESULT_KEYS):
         tasks_meta = []
 
-        for task in tasks:
-            task_dict = task.to_dict()
-            result_keys = ['id', 'status', 'command', 'date', 'config']
+        for task_dict in tasks:
             task_meta = {key: task_dict[key] for key in result_keys if key in task_dict}
             tasks_meta.append(task_meta)
 
@@ -77,8 +68,16 @@ class TasksNumberResource:
         user_id = req.context['user']
         logger.debug('Authorize user {id}'.format(id=user_id))
 
+        status = req.get_param('status')
+
+        if status is not None and status not in metadata.task.TASK_STATUS_CODES:
+            raise falcon.HTTPBadRequest(
+                title="Bad Request",
+                description="Status must be one of {codes}".format(codes=metadata.task.TASK_STATUS_CODES)
+            )
+
         context = {'user_id': user_id}
-        number = metadata.get_tasks(context).count()
+        number = metadata.count_owned(metadata.TaskMetadata, context, status)
 
         resp.status = falcon.HTTP_200
         resp.media = number
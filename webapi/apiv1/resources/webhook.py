@@ -0,0 +1,132 @@
+import logging
+
+import falcon
+
+import metadata
+from .. import validation
+from ..schema.webhook import CREATE_WEBHOOK_SCHEMA
+
+__all__ = [
+    'WebhookResource',
+    'WebhooksResource',
+    'WebhookDeliveriesResource'
+]
+
+logger = logging.getLogger(__name__)
+
+
+def get_user_webhook(id, user_id):
+    """
+    Raises:
+        falcon.HTTPNotFound - webhook does not exist or is not owned by user
+    """
+
+    try:
+        return metadata.get_webhook(id, {'user_id': user_id})
+    except metadata.DoesNotExist:
+        logger.debug('Webhook {id} does not exist'.format(id=id))
+
+        raise falcon.HTTPNotFound(
+            title="Webhook not found",
+            description="Webhook does not exist"
+        )
+
+
+class WebhookResource:
+    """Callback of task status changes
+
+    POST webhook - register url, secret for signature check is returned once
+    GET webhook/{id}
+    DELETE webhook/{id}
+    """
+
+    def on_get(self, req, resp, id=None):
+        if not id:
+            raise falcon.HTTPNotFound(
+                title="Webhook not found",
+                description="Webhook does not exist"
+            )
+
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        webhook = get_user_webhook(id, user_id)
+
+        resp.status = falcon.HTTP_200
+        resp.media = webhook.to_dict()
+
+    def on_post(self, req, resp, id=None):
+        if id:
+            # webhook is not changed, it is deleted and created again
+            raise falcon.HTTPMethodNotAllowed(['GET', 'DELETE'])
+
+        self.create_webhook(req, resp)
+
+    @validation.validate(CREATE_WEBHOOK_SCHEMA)
+    def create_webhook(self, req, resp):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        task_id = req.media.get('task', None)
+
+        if task_id:
+            try:
+                metadata.get_task(task_id, {'user_id': user_id}, fields=['id'])
+            except metadata.DoesNotExist:
+                raise falcon.HTTPNotFound(
+                    title="Task not found",
+                    description="Task metadata does not exist"
+                )
+
+        webhook = metadata.WebhookMetadata(
+            owner=user_id,
+            url=req.media['url'],
+            task=task_id,
+            events=req.media.get('events', metadata.webhook.DEFAULT_EVENTS))
+        webhook.save()
+
+        logger.debug('User {uid} create webhook {wid}'.format(uid=user_id, wid=webhook.id))
+
+        resp.status = falcon.HTTP_200
+        resp.media = webhook.to_dict(secret=True)
+
+    def on_delete(self, req, resp, id=None):
+        if not id:
+            raise falcon.HTTPMethodNotAllowed(['POST'])
+
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        webhook = get_user_webhook(id, user_id)
+        metadata.delete_webhook(webhook)
+
+        resp.status = falcon.HTTP_200
+        resp.media = {}
+
+
+class WebhooksResource:
+    def on_get(self, req, resp):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        webhooks = metadata.get_webhooks({'user_id': user_id})
+
+        resp.status = falcon.HTTP_200
+        resp.media = {
+            'webhooks': [webhook.to_dict() for webhook in webhooks]
+        }
+
+
+class WebhookDeliveriesResource:
+    """Last deliveries of webhook with status, attempts and error"""
+
+    def on_get(self, req, resp, id):
+        user_id = req.context['user']
+        logger.debug('Authorize user {id}'.format(id=user_id))
+
+        webhook = get_user_webhook(id, user_id)
+
+        resp.status = falcon.HTTP_200
+        resp.media = {
+            'deliveries': [delivery.to_dict() for delivery in metadata.get_deliveries(webhook.id)]
+        }
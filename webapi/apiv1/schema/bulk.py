@@ -0,0 +1,59 @@
+from metadata.bulk import MAX_BULK_SIZE
+
+BULK_ITEMS_SCHEMA = {
+    "type": "object",
+    "title": "Bulk items",
+    "description": "Items of bulk create or update, each item is validated separately",
+    "properties": {
+        "items": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": MAX_BULK_SIZE,
+            "items": {
+                "type": "object"
+            },
+            "title": "Items",
+            "description": "Resources metadata"
+        }
+    },
+    "required": ["items"],
+    "additionalProperties": False
+}
+
+BULK_IDS_SCHEMA = {
+    "type": "object",
+    "title": "Bulk ids",
+    "description": "Ids of bulk delete",
+    "properties": {
+        "ids": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": MAX_BULK_SIZE,
+            "items": {
+                "type": "string",
+                "minLength": 1,
+                "maxLength": 128
+            },
+            "title": "Ids",
+            "description": "Resources ids"
+        }
+    },
+    "required": ["ids"],
+    "additionalProperties": False
+}
+
+
+def get_update_schema(schema):
+    """Return schema of bulk update item: resource schema with required id"""
+
+    schema = schema.copy()
+    schema["properties"] = dict(schema["properties"], id={
+        "type": "string",
+        "minLength": 1,
+        "maxLength": 128,
+        "title": "Id",
+        "description": "Resource id"
+    })
+    schema["required"] = ["id"]
+
+    return schema
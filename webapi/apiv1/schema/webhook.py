@@ -0,0 +1,35 @@
+import metadata
+
+CREATE_WEBHOOK_SCHEMA = {
+    "type": "object",
+    "title": "Webhook",
+    "description": "Callback url for status changes of task or of all tasks of user",
+    "properties": {
+        "url": {
+            "type": "string",
+            "pattern": "^https?://[^\\s]+$",
+            "maxLength": 2048,
+            "title": "Url",
+            "description": "Url which receives POST with events, signed by secret of webhook"
+        },
+        "task": {
+            "type": "string",
+            "title": "Task",
+            "description": "Id of task, all tasks of user if not set"
+        },
+        "events": {
+            "type": "array",
+            "items": {
+                "type": "string",
+                "enum": metadata.task.TASK_STATUS_CODES
+            },
+            "minItems": 1,
+            "uniqueItems": True,
+            "title": "Events",
+            "description": "Task statuses which are sent",
+            "default": metadata.webhook.DEFAULT_EVENTS
+        }
+    },
+    "required": ["url"],
+    "additionalProperties": False
+}
@@ -0,0 +1,154 @@
+"""Validation of request media by JSON schema
+
+Validators are compiled once, when resources are defined. Subschemas of
+oneOf which are selected by constant 'name' property (architecture layers)
+are replaced by discriminator: item is validated only by subschema of its
+name, so errors point to the failing field of that subschema.
+Published schemas are not changed.
+"""
+
+import functools
+
+import falcon
+from jsonschema import Draft4Validator, FormatChecker, ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import extend
+
+__all__ = [
+    'compile_validator',
+    'get_error',
+    'validate'
+]
+
+DISCRIMINATOR = 'name'
+DISCRIMINATOR_KEYWORD = 'discriminator'
+
+
+def get_discriminated_schemas(subschemas):
+    """Return dict of name to subschema if each subschema requires constant name, else None"""
+
+    mapping = {}
+
+    for subschema in subschemas:
+        name_schema = subschema.get('properties', {}).get(DISCRIMINATOR, {})
+        pattern = name_schema.get('pattern', '')
+        name = pattern[1:-1]
+
+        if not (pattern.startswith('^') and pattern.endswith('$') and name.isidentifier()):
+            return None
+
+        if DISCRIMINATOR not in subschema.get('required', []) or name in mapping:
+            return None
+
+        mapping[name] = subschema
+
+    return mapping or None
+
+
+def discriminate(schema):
+    """Return copy of schema with oneOf of named subschemas replaced by discriminator"""
+
+    if isinstance(schema, list):
+        return [discriminate(item) for item in schema]
+
+    if not isinstance(schema, dict):
+        return schema
+
+    result = {key: discriminate(value) for key, value in schema.items()}
+
+    mapping = get_discriminated_schemas(schema['oneOf']) if isinstance(schema.get('oneOf'), list) else None
+
+    if mapping:
+        del result['oneOf']
+        result[DISCRIMINATOR_KEYWORD] = {name: discriminate(subschema) for name, subschema in mapping.items()}
+
+    return result
+
+
+def discriminator(validator, mapping, instance, schema):
+    if not validator.is_type(instance, 'object'):
+        yield ValidationError('{instance!r} is not of type object'.format(instance=instance))
+        return
+
+    if DISCRIMINATOR not in instance:
+        yield ValidationError('{name!r} is a required property'.format(name=DISCRIMINATOR))
+        return
+
+    name = instance[DISCRIMINATOR]
+    subschema = mapping.get(name, None) if isinstance(name, str) else None
+
+    if subschema is None:
+        yield ValidationError('{name!r} is not one of {names}'.format(name=name, names=sorted(mapping)), path=[DISCRIMINATOR])
+        return
+
+    for error in validator.descend(instance, subschema):
+        yield error
+
+
+DiscriminatorValidator = extend(Draft4Validator, {DISCRIMINATOR_KEYWORD: discriminator})
+
+
+def compile_validator(schema):
+    """Return validator of schema
+
+    Raises:
+        jsonschema.SchemaError - invalid schema
+    """
+
+    Draft4Validator.check_schema(schema)
+
+    return DiscriminatorValidator(discriminate(schema), format_checker=FormatChecker())
+
+
+def format_path(path):
+    """Return path of error as 'architecture.layers[3].config'"""
+
+    result = ''
+
+    for item in path:
+        if isinstance(item, int):
+            result += '[{index}]'.format(index=item)
+        else:
+            result += '.' + item if result else item
+
+    return result
+
+
+def get_error(validator, instance):
+    """Return message of most relevant error prefixed by path of failing field or None"""
+
+    error = best_match(validator.iter_errors(instance))
+
+    if error is None:
+        return None
+
+    path = format_path(error.absolute_path)
+
+    return '{path}: {message}'.format(path=path, message=error.message) if path else error.message
+
+
+def validate(schema):
+    """Decorator validating req.media with compiled schema validator
+
+    Replaces falcon.media.validators.jsonschema.validate, which builds
+    validator and tries all oneOf subschemas on each request.
+    """
+
+    validator = compile_validator(schema)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, req, resp, *args, **kwargs):
+            error = get_error(validator, req.media)
+
+            if error:
+                raise falcon.HTTPBadRequest(
+                    'Failed data validation',
+                    description=error
+                )
+
+            return func(self, req, resp, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
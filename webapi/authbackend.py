@@ -0,0 +1,110 @@
+import collections
+import hashlib
+import threading
+import time
+
+import falcon
+from falcon_auth import JWTAuthBackend
+
+__all__ = [
+    'TokenCache',
+    'CachedJWTAuthBackend'
+]
+
+TOKEN_CACHE_SIZE = 10000  # tokens
+TOKEN_CACHE_TTL = 300  # seconds, for tokens without exp
+
+
+def get_token_digest(token):
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+class TokenCache:
+    """Users of verified tokens until token expires, oldest are evicted
+
+    Key is digest of token, raw tokens are not kept in memory.
+    """
+
+    def __init__(self, size=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._entries.get(digest, None)
+
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[digest]
+
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self.hits += 1
+
+            return entry[1]
+
+    def set(self, digest, user, exp=None):
+        expires = time.time() + self.ttl
+
+        if isinstance(exp, (int, float)):
+            expires = min(expires, exp)
+
+        with self._lock:
+            self._entries.pop(digest, None)
+            self._entries[digest] = (expires, user)
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachedJWTAuthBackend(JWTAuthBackend):
+    """JWTAuthBackend which verifies each token once
+
+    Signature and claims are checked on first request with token, next
+    requests get user from cache until exp claim of token. Invalid
+    tokens are not cached.
+    """
+
+    def __init__(self, user_loader, secret_key, cache=None, **kwargs):
+        super().__init__(user_loader, secret_key, **kwargs)
+
+        self.cache = cache if cache is not None else TokenCache()
+
+    def authenticate(self, req, resp, resource):
+        auth_header = req.get_header('Authorization')
+
+        if not auth_header:
+            # raises HTTPUnauthorized
+            return super().authenticate(req, resp, resource)
+
+        digest = get_token_digest(auth_header)
+        user = self.cache.get(digest)
+
+        if user is not None:
+            return user
+
+        payload = self._decode_jwt_token(req)
+        user = self.user_loader(payload)
+
+        if not user:
+            raise falcon.HTTPUnauthorized(
+                title='401 Unauthorized',
+                description='Invalid JWT Credentials',
+                challenges=None)
+
+        self.cache.set(digest, user, payload.get('exp', None))
+
+        return user
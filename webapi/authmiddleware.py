@@ -10,25 +10,58 @@ class NeuroseedAuthMiddleware(FalconAuthMiddleware):
         'optional_routes': []
         'optional_methods': []
     }
+
+    Auth settings of resource are computed on first request to resource.
     """
 
     def __init__(self, backend, exempt_routes=None, exempt_methods=None
 , optional_routes=None, optional_methods=None):
         super().__init__(backend, exempt_routes, exempt_methods)
 
-        self.optional_routes = list(optional_routes or [])
-        self.optional_methods = list(optional_methods or [])
+        self.exempt_routes = set(self.exempt_routes)
+        self.exempt_methods = set(self.exempt_methods)
+        self.optional_routes = set(optional_routes or [])
+        self.optional_methods = set(optional_methods or [])
+        self._resource_settings = {}
+
+    def _get_auth_settings(self, req, resource):
+        try:
+            return self._resource_settings[resource]
+        except KeyError:
+            pass
+
+        auth = getattr(resource, 'auth', {})
+
+        auth_settings = {
+            'auth_disabled': bool(auth.get('auth_disabled')),
+            'exempt_routes': set(auth.get('exempt_routes', ())),
+            'exempt_methods': set(auth.get('exempt_methods') or self.exempt_methods),
+            'backend': auth.get('backend') or self.backend,
+            'optional_routes': set(auth.get('optional_routes', ())),
+            'optional_methods': set(auth.get('optional_methods', ()))
+        }
+
+        self._resource_settings[resource] = auth_settings
+
+        return auth_settings
 
     def process_resource(self, req, resp, resource, *args, **kwargs):
         auth_setting = self._get_auth_settings(req, resource)
+
+        if auth_setting['auth_disabled'] or \
+           req.path in self.exempt_routes or \
+           req.path in auth_setting['exempt_routes'] or \
+           req.method in auth_setting['exempt_methods']:
+            return
+
         try:
-            super().process_resource(req, resp, resource, *args, **kwargs)
+            backend = auth_setting['backend']
+            req.context['user'] = backend.authenticate(req, resp, resource, **kwargs)
         except falcon.HTTPUnauthorized:
-            optional_routes = tuple(self.optional_routes) + tuple(auth_setting.get('optional_routes', ()))
-            optional_methods = tuple(self.optional_methods) + tuple(auth_setting.get('optional_methods', ()))
-
-            if req.path in optional_routes or \
-               req.method in optional_methods:
+            if req.path in self.optional_routes or \
+               req.path in auth_setting['optional_routes'] or \
+               req.method in self.optional_methods or \
+               req.method in auth_setting['optional_methods']:
                 req.context['user'] = None
             else:
                 raise
@@ -0,0 +1,130 @@
+"""Negotiated gzip/deflate compression of response bodies
+
+Bodies set by resp.body, resp.data or resp.media are compressed if they
+are larger than min_size and client accepts gzip or deflate. Streams
+(file downloads with Range) are not compressed.
+"""
+
+import zlib
+
+import falcon
+
+__all__ = [
+    'CompressionMiddleware',
+    'select_encoding'
+]
+
+GZIP = 'gzip'
+DEFLATE = 'deflate'
+
+ENCODINGS = [GZIP, DEFLATE]  # in order of preference
+
+MIN_SIZE = 1024  # bytes
+COMPRESSION_LEVEL = 6
+
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'text/'
+)
+
+
+def parse_accept_encoding(header):
+    """Return dict of coding to quality from Accept-Encoding header"""
+
+    qualities = {}
+
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+
+        if not coding:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+
+        qualities[coding] = quality
+
+    return qualities
+
+
+def select_encoding(header):
+    """Return preferred encoding accepted by Accept-Encoding header or None"""
+
+    if not header:
+        return None
+
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get('*', 0.0)
+
+    best = None
+    best_quality = 0.0
+
+    for encoding in ENCODINGS:
+        quality = qualities.get(encoding, wildcard)
+
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def compress(data, encoding, level=COMPRESSION_LEVEL):
+    if encoding == GZIP:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    return zlib.compress(data, level)
+
+
+class CompressionMiddleware:
+    def __init__(self, min_size=MIN_SIZE, level=COMPRESSION_LEVEL):
+        self.min_size = min_size
+        self.level = level
+
+    def is_compressible(self, req, resp):
+        if req.method == 'HEAD' or resp.status in (falcon.HTTP_204, falcon.HTTP_304):
+            return False
+
+        if resp.get_header('Content-Encoding') or resp.get_header('Content-Range'):
+            return False
+
+        content_type = resp.content_type or ''
+
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        if not self.is_compressible(req, resp):
+            return
+
+        if resp.body is not None:
+            data = resp.body if isinstance(resp.body, bytes) else resp.body.encode('utf-8')
+        elif resp.data is not None:
+            data = resp.data
+        else:
+            return
+
+        resp.append_header('Vary', 'Accept-Encoding')
+
+        if len(data) < self.min_size:
+            return
+
+        encoding = select_encoding(req.get_header('Accept-Encoding'))
+
+        if encoding is None:
+            return
+
+        resp.body = None
+        resp.data = compress(data, encoding, self.level)
+        resp.set_header('Content-Encoding', encoding)
+
+        # compressed body is other representation, weak etag still matches If-None-Match
+        etag = resp.get_header('ETag')
+        if etag and not etag.startswith('W/'):
+            resp.set_header('ETag', 'W/' + etag)
@@ -0,0 +1,153 @@
+import os
+import datetime
+import functools
+
+import falcon
+
+import storage
+
+HASH_CACHE_SIZE = 1024
+
+
+class RangeReader:
+    """File-like object which reads only length bytes from current position"""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+
+        data = self.file.read(size)
+        self.remaining -= len(data)
+
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+@functools.lru_cache(HASH_CACHE_SIZE)
+def _get_file_hash(path, mtime, size):
+    return storage.get_file_hash(path)
+
+
+def get_file_hash(path, stat=None):
+    """Return content hash of file, cached until file is changed"""
+
+    stat = stat or os.stat(path)
+    return _get_file_hash(path, stat.st_mtime_ns, stat.st_size)
+
+
+def etag_matches(header, etag, weak=True):
+    """Check If-None-Match / If-Range header value against strong etag
+
+    If-None-Match uses weak comparison, If-Range needs strong comparison
+    (weak=False): weak validator and * do not match.
+    """
+
+    if weak and header.strip() == '*':
+        return True
+
+    for value in header.split(','):
+        value = value.strip()
+
+        if value.startswith('W/'):
+            if not weak:
+                continue
+
+            value = value[2:]
+
+        if value == etag:
+            return True
+
+    return False
+
+
+def get_byte_range(req, size):
+    """Return (start, end) of requested bytes or None for full file"""
+
+    req_range = req.range
+    if req_range is None or req.range_unit != 'bytes':
+        return None
+
+    start, end = req_range
+
+    if start < 0:
+        start = max(size + start, 0)
+        end = size - 1
+    elif end < 0 or end >= size:
+        end = size - 1
+
+    if start >= size or start > end:
+        raise falcon.HTTPRangeNotSatisfiable(size)
+
+    return start, end
+
+
+def serve_file(req, resp, path, content_type='application/octet-stream', etag=None, filename=None):
+    """Send file with Range requests, conditional GET and ETag support
+
+    Full file is sent as real file object, so server can use
+    wsgi.file_wrapper (sendfile) to transfer it.
+
+    Args:
+        req (falcon.Request): request
+        resp (falcon.Response): response
+        path (str): path of file
+        content_type (str): response content type
+        etag (None or str): content hash of file, computed if None
+        filename (None or str): download file name
+
+    Raises:
+        falcon.HTTPNotFound - file does not exist
+        falcon.HTTPRangeNotSatisfiable - invalid range
+    """
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise falcon.HTTPNotFound(
+            title="File not found",
+            description="File does not exist"
+        )
+
+    size = stat.st_size
+    etag = '"{hash}"'.format(hash=etag or get_file_hash(path, stat))
+
+    resp.etag = etag
+    resp.last_modified = datetime.datetime.utcfromtimestamp(int(stat.st_mtime))
+    resp.accept_ranges = 'bytes'
+    resp.cache_control = ['private', 'no-cache']
+
+    if filename:
+        resp.downloadable_as = filename
+
+    if_none_match = req.if_none_match
+    if if_none_match and etag_matches(if_none_match, etag):
+        resp.status = falcon.HTTP_304
+        return
+
+    byte_range = None
+    if_range = req.if_range
+    if not if_range or etag_matches(if_range, etag, weak=False):
+        byte_range = get_byte_range(req, size)
+
+    resp.content_type = content_type
+    file = open(path, 'rb')
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        file.seek(start)
+
+        resp.status = falcon.HTTP_206
+        resp.content_range = (start, end, size)
+        resp.stream = RangeReader(file, length)
+        resp.stream_len = length
+    else:
+        resp.status = falcon.HTTP_200
+        resp.stream = file
+        resp.stream_len = size
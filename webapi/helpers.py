@@ -1,10 +1,18 @@
+import atexit
 import logging
 import logging.handlers
 import sys
 import os
 
+from .logqueue import start_queue_logging
+
+
+def init_logging(log_file='log-web-api.txt', level=logging.INFO):
+    """Log to rotating file in logs directory and stderr
+
+    Records are queued and written by background thread, see logqueue.
+    """
 
-def init_logging():
     def excepthook(type, value, traceback):
         logging.critical('Uncaught exception',
                          exc_info=(type, value, traceback))
@@ -19,18 +27,19 @@ def init_logging():
         os.mkdir('logs')
 
     logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(level)
 
     formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s')
 
-    file_handler = logging.handlers.RotatingFileHandler('logs/log-web-api.txt', mode='a', maxBytes=2**20, backupCount=5)
-    file_handler.setLevel(logging.DEBUG)
+    file_handler = logging.handlers.RotatingFileHandler(os.path.join('logs', log_file), mode='a', maxBytes=2**20, backupCount=5)
+    file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
     stream_handler = logging.StreamHandler()
-    stream_handler.setLevel(logging.DEBUG)
+    stream_handler.setLevel(level)
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+
+    listener = start_queue_logging(logger, [file_handler, stream_handler])
+    atexit.register(listener.stop)
 
     logging.warning('Start logging')
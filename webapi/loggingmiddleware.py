@@ -1,39 +1,61 @@
 import json
+import random
+import time
 
+__all__ = [
+    'AccessLogMiddleware'
+]
+
+SLOW_REQUEST_TIME = 1.0  # seconds, slow requests are logged always
+
+
+class AccessLogMiddleware:
+    """Single line JSON record per request
+
+    Record fields: method, route (uri template), path, status, latency_ms,
+    request_bytes, user, remote_addr, sample_rate. Requests are logged
+    with probability sample_rate of route, server errors and slow
+    requests are logged always.
+    """
+
+    def __init__(self, logger, sample_rate=1.0, route_sample_rates=None, slow_request_time=SLOW_REQUEST_TIME):
+        """
+        Args:
+            logger (logging.Logger): access logger
+            sample_rate (float): fraction of logged requests
+            route_sample_rates (dict): uri template to sample rate of route
+            slow_request_time (float): seconds
+        """
 
-class LoggingMidleware:
-    def __init__(self, logger):
         self.logger = logger
+        self.sample_rate = sample_rate
+        self.route_sample_rates = dict(route_sample_rates or {})
+        self.slow_request_time = slow_request_time
 
     def process_request(self, req, resp):
-        content_type = req.content_type
-        content_length = req.content_length
-        relative_uri = req.relative_uri
-        method = req.method
-        scheme = req.scheme
-        headers = req.headers
-        headers_json = json.dumps(headers, indent=2)
-        params = req.params
-
-        self.logger.info('Request {scheme} {method} {relative_uri}\n'
-                    'Content Type: {content_type}\n'
-                    'Content Length: {content_length}\n'
-                    'Params: {params}\n'
-                    'Headers: {headers}'.format(
-            scheme=scheme,
-            method=method,
-            relative_uri=relative_uri,
-            content_type=content_type,
-            content_length=content_length,
-            params=params,
-            headers=headers_json))
+        req.context['request_start'] = time.perf_counter()
 
     def process_response(self, req, resp, resource, req_succeeded):
-        content_type = resp.content_type
-        status = resp.status
-
-        self.logger.info('Response\n'
-                    'Content Type: {content_type}\n'
-                    'Status: {status}'.format(
-            content_type=content_type,
-            status=status))
+        start = req.context.get('request_start', None)
+        latency = time.perf_counter() - start if start is not None else 0.0
+
+        route = req.uri_template
+        sample_rate = self.route_sample_rates.get(route, self.sample_rate)
+        status = int(resp.status[:3])
+
+        if status < 500 and latency < self.slow_request_time and random.random() >= sample_rate:
+            return
+
+        record = {
+            'method': req.method,
+            'route': route,
+            'path': req.path,
+            'status': status,
+            'latency_ms': round(latency * 1000, 3),
+            'request_bytes': req.content_length or 0,
+            'user': req.context.get('user', None),
+            'remote_addr': req.remote_addr,
+            'sample_rate': sample_rate
+        }
+
+        self.logger.info(json.dumps(record, separators=(',', ':')))
@@ -0,0 +1,106 @@
+"""Log records are written by background thread
+
+Request handlers only append record to queue, formatting and writing to
+file and stream are done by listener thread. In gevent mode listener is
+started as real thread with functions not patched by gevent, so writes
+do not block event loop.
+"""
+
+import collections
+import importlib
+import logging.handlers
+import queue
+
+__all__ = [
+    'RecordQueue',
+    'BackgroundQueueListener',
+    'start_queue_logging'
+]
+
+QUEUE_SIZE = 100000  # records, oldest are dropped when writer falls behind
+POLL_INTERVAL = 0.05  # seconds
+
+
+def get_original(module, name):
+    """Return function of module not patched by gevent"""
+
+    try:
+        from gevent import monkey
+    except ImportError:
+        return getattr(importlib.import_module(module), name)
+
+    return monkey.get_original(module, name)
+
+
+class RecordQueue:
+    """Bounded queue of log records, put never blocks or switches greenlet
+
+    Listener polls queue, so no lock is shared between request greenlets
+    and listener thread.
+    """
+
+    def __init__(self, size=QUEUE_SIZE, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._records = collections.deque(maxlen=size)
+        self._sleep = get_original('time', 'sleep')
+
+    def put_nowait(self, record):
+        self._records.append(record)
+
+    def get(self, block=True):
+        while True:
+            try:
+                return self._records.popleft()
+            except IndexError:
+                if not block:
+                    raise queue.Empty
+
+            self._sleep(self.poll_interval)
+
+    def __len__(self):
+        return len(self._records)
+
+
+class BackgroundQueueListener(logging.handlers.QueueListener):
+    """QueueListener running in real thread also under gevent monkey patching"""
+
+    def start(self):
+        start_new_thread = get_original('_thread', 'start_new_thread')
+        allocate_lock = get_original('_thread', 'allocate_lock')
+
+        self._thread = allocate_lock()
+        self._thread.acquire()
+        start_new_thread(self._run, ())
+
+    def _run(self):
+        try:
+            self._monitor()
+        finally:
+            self._thread.release()
+
+    def stop(self):
+        """Write queued records and stop thread"""
+
+        if self._thread is None:
+            return
+
+        self.enqueue_sentinel()
+        self._thread.acquire()
+        self._thread = None
+
+
+def start_queue_logging(logger, handlers, size=QUEUE_SIZE):
+    """Add queue handler to logger, handlers are called by listener thread
+
+    Returns:
+        started BackgroundQueueListener
+    """
+
+    record_queue = RecordQueue(size)
+
+    logger.addHandler(logging.handlers.QueueHandler(record_queue))
+
+    listener = BackgroundQueueListener(record_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    return listener
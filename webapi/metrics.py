@@ -0,0 +1,378 @@
+"""Metrics of web api in Prometheus text format
+
+Request counts, latency histograms and in-flight requests by route
+template are collected by MetricsMiddleware. Mongo commands are timed by
+pymongo command listener and summed per request, broker dispatch of
+tasks is timed by celery publish signals.
+"""
+
+import collections
+import math
+import threading
+import time
+
+import falcon
+from pymongo import monitoring
+from celery.signals import before_task_publish, after_task_publish
+
+__all__ = [
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'Registry',
+    'REGISTRY',
+    'MongoCommandListener',
+    'MetricsMiddleware',
+    'MetricsResource',
+    'register_listeners'
+]
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+THROUGHPUT_BUCKETS = (1e5, 1e6, 1e7, 3e7, 1e8, 3e8, 1e9)  # bytes per second
+
+UNMATCHED_ROUTE = 'unmatched'
+
+# publishes without after_task_publish (broker errors, timeouts) are dropped
+PUBLISH_TIMER_SIZE = 10000
+PUBLISH_TIMER_EXPIRE = 60  # seconds, longer than publish timeout of manager.task
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+
+    return repr(float(value))
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+
+    if not pairs:
+        return ''
+
+    labels = ','.join('{name}="{value}"'.format(
+        name=name,
+        value=str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for name, value in pairs)
+
+    return '{' + labels + '}'
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get_key(self, labels):
+        if len(labels) != len(self.label_names):
+            raise ValueError('{name} needs labels {labels}'.format(name=self.name, labels=self.label_names))
+
+        return tuple(str(label) for label in labels)
+
+    def samples(self):
+        """Return list of (name, label values, extra labels, value)"""
+
+        with self._lock:
+            return [(self.name, key, (), value) for key, value in sorted(self._values.items())]
+
+    def expose(self):
+        lines = [
+            '# HELP {name} {doc}'.format(name=self.name, doc=self.documentation),
+            '# TYPE {name} {type}'.format(name=self.name, type=self.type)
+        ]
+
+        for name, key, extra, value in self.samples():
+            lines.append('{name}{labels} {value}'.format(
+                name=name,
+                labels=format_labels(self.label_names, key, extra),
+                value=format_value(value)))
+
+        return lines
+
+    def get(self, *labels):
+        with self._lock:
+            return self._values.get(self.get_key(labels), None)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *labels, amount=1):
+        key = self.get_key(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, *labels):
+        key = self.get_key(labels)
+
+        with self._lock:
+            counts = self._values.get(key, None)
+
+            if counts is None:
+                # counts of buckets, sum
+                counts = self._values[key] = [[0] * len(self.buckets), 0.0]
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[0][i] += 1
+                    break
+
+            counts[1] += value
+
+    def get(self, *labels):
+        """Return (count, sum) of observations"""
+
+        with self._lock:
+            counts = self._values.get(self.get_key(labels), None)
+
+            return (sum(counts[0]), counts[1]) if counts else None
+
+    def samples(self):
+        samples = []
+
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    samples.append((self.name + '_bucket', key, [('le', format_value(bound))], cumulative))
+
+                samples.append((self.name + '_sum', key, (), total))
+                samples.append((self.name + '_count', key, (), cumulative))
+
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        return self.add(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs):
+        return self.add(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs):
+        return self.add(Histogram(*args, **kwargs))
+
+    def expose(self):
+        """Return metrics in Prometheus text format"""
+
+        lines = []
+
+        for metric in self.metrics:
+            lines.extend(metric.expose())
+
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        for metric in self.metrics:
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.counter(
+    'webapi_requests_total', 'Number of requests',
+    ('method', 'route', 'status'))
+REQUEST_DURATION = REGISTRY.histogram(
+    'webapi_request_duration_seconds', 'Latency of requests',
+    ('method', 'route'))
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    'webapi_requests_in_flight', 'Number of requests in processing')
+
+REQUEST_MONGO_COMMANDS = REGISTRY.histogram(
+    'webapi_request_mongo_commands', 'Number of mongo commands per request',
+    ('route',), buckets=COUNT_BUCKETS)
+REQUEST_MONGO_DURATION = REGISTRY.histogram(
+    'webapi_request_mongo_duration_seconds', 'Time of mongo commands per request',
+    ('route',))
+MONGO_COMMANDS = REGISTRY.counter(
+    'webapi_mongo_commands_total', 'Number of mongo commands',
+    ('command', 'result'))
+MONGO_COMMAND_DURATION = REGISTRY.histogram(
+    'webapi_mongo_command_duration_seconds', 'Latency of mongo commands',
+    ('command',))
+
+TASK_SEND_DURATION = REGISTRY.histogram(
+    'webapi_task_send_duration_seconds', 'Latency of publishing task to broker',
+    ('task',))
+
+UPLOAD_BYTES = REGISTRY.counter(
+    'webapi_upload_bytes_total', 'Bytes of uploaded multipart bodies',
+    ('route',))
+UPLOAD_THROUGHPUT = REGISTRY.histogram(
+    'webapi_upload_throughput_bytes_per_second', 'Throughput of uploads',
+    ('route',), buckets=THROUGHPUT_BUCKETS)
+
+# mongo commands of request processed by current thread (greenlet in gevent mode)
+_request_local = threading.local()
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.record(event, 'success')
+
+    def failed(self, event):
+        self.record(event, 'failure')
+
+    def record(self, event, result):
+        duration = event.duration_micros / 1e6
+
+        MONGO_COMMANDS.inc(event.command_name, result)
+        MONGO_COMMAND_DURATION.observe(duration, event.command_name)
+
+        stats = getattr(_request_local, 'mongo', None)
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += duration
+
+
+class TaskPublishTimer:
+    """Time between celery before_task_publish and after_task_publish signals
+
+    Starts of failed publishes are evicted by age and by size.
+    """
+
+    def __init__(self, size=PUBLISH_TIMER_SIZE, expire=PUBLISH_TIMER_EXPIRE):
+        self.size = size
+        self.expire = expire
+        self._starts = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._starts)
+
+    def before(self, sender=None, headers=None, **kwargs):
+        task_id = (headers or {}).get('id', None)
+
+        if not task_id:
+            return
+
+        now = time.perf_counter()
+
+        with self._lock:
+            self._starts.pop(task_id, None)
+            self._starts[task_id] = now
+
+            # starts are ordered by time
+            while self._starts:
+                oldest = next(iter(self._starts.values()))
+
+                if len(self._starts) <= self.size and now - oldest < self.expire:
+                    break
+
+                self._starts.popitem(last=False)
+
+    def after(self, sender=None, headers=None, **kwargs):
+        with self._lock:
+            start = self._starts.pop((headers or {}).get('id', None), None)
+
+        if start is not None:
+            TASK_SEND_DURATION.observe(time.perf_counter() - start, sender)
+
+
+_listeners = []
+
+
+def register_listeners():
+    """Register mongo command listener and celery publish signals once
+
+    Mongo listener is used by clients created after registration.
+    """
+
+    if _listeners:
+        return
+
+    mongo_listener = MongoCommandListener()
+    monitoring.register(mongo_listener)
+
+    publish_timer = TaskPublishTimer()
+    before_task_publish.connect(publish_timer.before, weak=False)
+    after_task_publish.connect(publish_timer.after, weak=False)
+
+    _listeners.extend([mongo_listener, publish_timer])
+
+
+class MetricsMiddleware:
+    def process_request(self, req, resp):
+        req.context['metrics_start'] = time.perf_counter()
+        _request_local.mongo = [0, 0.0]
+        REQUESTS_IN_FLIGHT.inc()
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        start = req.context.get('metrics_start', None)
+
+        if start is None:
+            return
+
+        duration = time.perf_counter() - start
+        route = req.uri_template or UNMATCHED_ROUTE
+
+        REQUESTS_IN_FLIGHT.dec()
+        REQUESTS.inc(req.method, route, resp.status[:3])
+        REQUEST_DURATION.observe(duration, req.method, route)
+
+        mongo = getattr(_request_local, 'mongo', None)
+        _request_local.mongo = None
+
+        if mongo is not None:
+            REQUEST_MONGO_COMMANDS.observe(mongo[0], route)
+            REQUEST_MONGO_DURATION.observe(mongo[1], route)
+
+        content_type = req.content_type or ''
+        if req.content_length and content_type.startswith('multipart/form-data'):
+            UPLOAD_BYTES.inc(route, amount=req.content_length)
+            UPLOAD_THROUGHPUT.observe(req.content_length / max(duration, 1e-6), route)
+
+
+class MetricsResource:
+    """Prometheus scrape endpoint"""
+
+    auth = {
+        'exempt_methods': ['GET']
+    }
+
+    def __init__(self, registry=REGISTRY):
+        self.registry = registry
+
+    def on_get(self, req, resp):
+        resp.status = falcon.HTTP_200
+        resp.content_type = CONTENT_TYPE
+        resp.data = self.registry.expose().encode('utf-8')
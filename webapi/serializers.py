@@ -1,6 +1,17 @@
 import json
+import importlib
+import logging
 
 import falcon
+from falcon.media import BaseHandler
+
+logger = logging.getLogger(__name__)
+
+# faster encoders, first installed is used
+JSON_LIBRARIES = [
+    'ujson',
+    'rapidjson'
+]
 
 
 def falcon_error_serializer(_: falcon.Request, resp: falcon.Response, exc: falcon.HTTPError) -> None:
@@ -19,3 +30,62 @@ def falcon_error_serializer(_: falcon.Request, resp: falcon.Response, exc: falco
         error['links'] = {'about': exc.link['href']}
 
     resp.body = json.dumps(error)
+
+
+def json_dumps(media):
+    return json.dumps(media, ensure_ascii=False, separators=(',', ':'))
+
+
+def get_fast_json(libraries=JSON_LIBRARIES):
+    """Return (name, dumps, loads) of first installed fast json library or None"""
+
+    for name in libraries:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+
+        if name == 'ujson':
+            dumps = lambda media: module.dumps(media, ensure_ascii=False, escape_forward_slashes=False)
+        else:
+            dumps = lambda media: module.dumps(media, ensure_ascii=False)
+
+        return name, dumps, module.loads
+
+    return None
+
+
+class JSONHandler(BaseHandler):
+    """JSON media handler with fast encoder if installed
+
+    Media which fast encoder can not serialize (NaN, not str keys) is
+    serialized by json module, as by default falcon handler.
+    """
+
+    def __init__(self, libraries=JSON_LIBRARIES):
+        fast_json = get_fast_json(libraries)
+
+        if fast_json:
+            self.library, self._fast_dumps, self._loads = fast_json
+        else:
+            self.library, self._fast_dumps, self._loads = 'json', None, json.loads
+
+        logger.debug('Use {library} json library'.format(library=self.library))
+
+    def deserialize(self, raw):
+        try:
+            return self._loads(raw.decode('utf-8'))
+        except ValueError as err:
+            raise falcon.HTTPBadRequest(
+                'Invalid JSON',
+                'Could not parse JSON body - {0}'.format(err)
+            )
+
+    def serialize(self, media):
+        if self._fast_dumps is not None:
+            try:
+                return self._fast_dumps(media).encode('utf-8')
+            except (TypeError, ValueError, OverflowError):
+                pass
+
+        return json_dumps(media).encode('utf-8')
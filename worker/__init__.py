@@ -2,6 +2,9 @@ import sys
 import json
 
 from .tasks import *
+from .tasks import base
+from .tasks import counters
+from .tasks import webhooks
 from .app import app
 
 CONFIG = {}
@@ -41,6 +44,35 @@ def main(*args, **kwargs):
     storage_config = CONFIG['storage_config']
     storage.from_config(storage_config)
 
+    model_cache_budget = CONFIG.get('model_cache_budget', None)
+    if model_cache_budget:
+        base.MODEL_CACHE.memory_budget = model_cache_budget
+
+    webhooks.configure_allowed_networks(CONFIG.get('webhook_allowed_networks', []))
+
+    beat_schedule = {}
+
+    reconcile_interval = CONFIG.get('reconcile_counters_interval', counters.RECONCILE_COUNTERS_INTERVAL)
+    if reconcile_interval:
+        beat_schedule['reconcile-counters'] = {
+            'task': 'metadata.reconcile_counters',
+            'schedule': reconcile_interval
+        }
+
+    webhook_interval = CONFIG.get('webhook_delivery_interval', webhooks.WEBHOOK_DELIVERY_INTERVAL)
+    if webhook_interval:
+        beat_schedule['deliver-webhooks'] = {
+            'task': 'metadata.deliver_webhooks',
+            'schedule': webhook_interval
+        }
+
+    if beat_schedule:
+        app.conf.beat_schedule = beat_schedule
+
+        # schedule must run in one process, else each worker sends periodic tasks
+        if CONFIG.get('beat', False):
+            sys.argv.append('--beat')
+
     log_level = CONFIG['log_level']
     sys.argv.extend(['-l', log_level])
     sys.argv.append('--logfile=logs/%p-%i.log')
@@ -0,0 +1,118 @@
+import collections
+import contextlib
+import logging
+import os
+
+import tensorflow as tf
+from keras.models import load_model
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET = 2**30  # in bytes
+FLOAT_SIZE = 4  # in bytes
+
+
+def get_fingerprint(path):
+    """Return fingerprint of model file which changes when file is rewritten"""
+
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CachedModel:
+    """Keras model loaded in own graph and session with compiled functions"""
+
+    def __init__(self, path):
+        self.path = path
+        self.fingerprint = get_fingerprint(path)
+
+        self.graph = tf.Graph()
+        with self.graph.as_default():
+            self.session = tf.Session(graph=self.graph)
+            with self.session.as_default():
+                self.model = load_model(path)
+
+                # build predict and test functions ahead of use
+                self.model._make_predict_function()
+                if getattr(self.model, 'optimizer', None) is not None:
+                    self.model._make_test_function()
+
+        self.memory = self.model.count_params() * FLOAT_SIZE
+
+    @contextlib.contextmanager
+    def as_default(self):
+        """Use model graph and session in context manager"""
+
+        with self.graph.as_default(), self.session.as_default():
+            yield self.model
+
+    def close(self):
+        self.session.close()
+
+
+class ModelCache:
+    """Per-process LRU cache of loaded models with memory budget
+
+    Models are keyed by model id and file fingerprint, so retrained model
+    file is loaded again.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self._models = collections.OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, model_id):
+        return model_id in self._models
+
+    @property
+    def memory(self):
+        return sum(model.memory for model in self._models.values())
+
+    def get(self, model_id, path):
+        fingerprint = get_fingerprint(path)
+        cached = self._models.get(model_id)
+
+        if cached is not None and cached.fingerprint == fingerprint:
+            self.hits += 1
+            self._models.move_to_end(model_id)
+
+            return cached
+
+        if cached is not None:
+            self.evict(model_id)
+
+        self.misses += 1
+
+        cached = CachedModel(path)
+        self._models[model_id] = cached
+        logger.debug('Model {id} loaded to cache'.format(id=model_id))
+
+        # keep at least just loaded model
+        while len(self._models) > 1 and self.memory > self.memory_budget:
+            self.evict()
+
+        return cached
+
+    def evict(self, model_id=None):
+        """Evict model by id or least recently used model"""
+
+        if model_id is None:
+            model_id, cached = self._models.popitem(last=False)
+        else:
+            cached = self._models.pop(model_id)
+
+        cached.close()
+        self.evictions += 1
+
+        logger.debug('Model {id} evicted from cache'.format(id=model_id))
+
+    def clear(self):
+        while self._models:
+            self.evict()
@@ -1,3 +1,5 @@
 from .train_model import *
 from .test_model import *
 from .predict_model import *
+from .counters import *
+from .webhooks import *
@@ -6,6 +6,9 @@ from keras.models import load_model
 
 import metadata
 import storage
+from ..model_cache import ModelCache
+
+MODEL_CACHE = ModelCache()
 
 
 class BaseTask(celery.Task):
@@ -65,6 +68,15 @@ class BaseTask(celery.Task):
             self.task_meta.status = metadata.task.SUCCESS
 
 
+def is_failed_before_start(task):
+    """Return True if web api marked task failed before worker received it
+
+    Publish of task which timed out in web api can reach broker later.
+    """
+
+    return task.status == metadata.task.FAILURE
+
+
 def prepare_dataset(dataset):
     if isinstance(dataset, str):
         meta = metadata.DatasetMetadata.from_id(id=dataset)
@@ -99,6 +111,21 @@ def prepare_model(model):
     return model
 
 
+def get_cached_model(model):
+    """Return model from process model cache, use it in model.as_default() context"""
+
+    if isinstance(model, str):
+        model = metadata.ModelMetadata.from_id(id=model)
+    elif not isinstance(model, metadata.ModelMetadata):
+        type_ = type(model)
+        msg = 'model type must be str or metadata.ModelMetadata, not {type}'.format(type=type_)
+        raise TypeError(msg)
+
+    model_path = storage.get_model_path(model.url)
+
+    return MODEL_CACHE.get(model.id, model_path)
+
+
 def slice_dataset(dataset, slice):
     if not isinstance(slice, float):
         raise ValueError('type of slice must be float')
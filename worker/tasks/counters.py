@@ -0,0 +1,16 @@
+import logging
+
+import metadata
+from ..app import app
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_COUNTERS_INTERVAL = 3600  # seconds
+
+
+@app.task(name='metadata.reconcile_counters')
+def celery_reconcile_counters():
+    report = metadata.reconcile_counters()
+    logger.info('Reconcile counters: {report}'.format(report=report))
+
+    return report
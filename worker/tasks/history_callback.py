@@ -1,11 +1,19 @@
 import time
 from keras import callbacks
 
+from metadata import history
+
 SAVE_METRICS_ON_BATCH = False
 UPDATE_ON_BATCH_N = 10
 
 
 class HistoryCallback(callbacks.Callback):
+    """Write training progress of task
+
+    Metrics of epochs (and batches if enabled) are appended to task history
+    collection, progress counters are set in task document with atomic update,
+    so task document is never rewritten while training.
+    """
 
     def __init__(self, task, epochs, batches_in_epoch, examples,
                  save_metrics_on_batch=SAVE_METRICS_ON_BATCH, update_on_batch_n=UPDATE_ON_BATCH_N):
@@ -14,9 +22,6 @@ class HistoryCallback(callbacks.Callback):
         self._task = task
         self.batches_in_epoch = batches_in_epoch
 
-        #task.history['batch'] = {}
-        task.history['epoch'] = {}
-
         task.history['epochs'] = epochs
         task.history['current_epoch'] = 0
 
@@ -34,59 +39,69 @@ class HistoryCallback(callbacks.Callback):
         self.save_metrics_on_batch = save_metrics_on_batch
         self.update_on_batch_n = update_on_batch_n
 
+        self.current_epoch = 0
+        self.batch_points = []
+
         task.save()
 
     @property
     def task(self):
         return self._task
 
+    def set_progress(self, **counters):
+        # keep in-memory task in sync without marking fields as changed
+        dict.update(self.task.history, counters)
+        history.set_progress(self.task.id, **counters)
+
+    def flush_batches(self):
+        if self.batch_points:
+            history.append_history(self.task.id, history.BATCH, self.batch_points)
+            self.batch_points = []
+
     def on_batch_end(self, batch, logs=None):
-        if self.save_metrics_on_batch:
-            del logs['batch']  # delete batch number
-            del logs['size']  # delete batch size
-            logs['time'] = round(time.time(), 3)  # add current time
+        logs = logs or {}
+        current_batch = self.current_epoch * self.batches_in_epoch + batch
 
-            batch_history = self.task.history['batch']
+        if self.save_metrics_on_batch:
+            point = {key: float(value) for key, value in logs.items() if key not in ('batch', 'size')}
+            point['time'] = round(time.time(), 3)  # add current time
+            point['step'] = current_batch
 
-            for key in logs:
-                history = batch_history.setdefault(key, [])
-                value = float(logs[key])
-                history.append(value)
+            self.batch_points.append(point)
 
         if batch % self.update_on_batch_n == 0:
-            with self.task.save_context():
-                self.task.history['current_batch_in_epoch'] = batch
-                self.task.history['current_example'] = int(batch / self.batches_in_epoch * self.examples)
-
-                current_epoch = self.task.history['current_epoch']
-                batch = (current_epoch - 1) * self.batches_in_epoch + batch
+            self.flush_batches()
 
-                self.task.history['current_batch'] = batch
+            self.set_progress(
+                current_batch_in_epoch=batch,
+                current_example=int(batch / self.batches_in_epoch * self.examples),
+                current_batch=current_batch
+            )
 
     def on_epoch_begin(self, epoch, logs=None):
-        self.task.history['current_epoch'] = epoch + 1
-        self.task.history['current_batch'] = 0
-        self.task.history['current_batch_in_epoch'] = 0
-        self.task.history['current_example'] = 0
+        self.current_epoch = epoch
 
-        self.task.save()
+        self.set_progress(
+            current_epoch=epoch + 1,
+            current_batch=self.batches_in_epoch * epoch,
+            current_batch_in_epoch=0,
+            current_example=0
+        )
 
     def on_epoch_end(self, epoch, logs=None):
-        logs['time'] = round(time.time(), 3)  # add current time
-
-        epoch_history = self.task.history['epoch']
-
-        for key in logs:
-            history = epoch_history.setdefault(key, [])
-            value = float(logs[key])
-            history.append(value)
+        point = {key: float(value) for key, value in (logs or {}).items()}
+        point['time'] = round(time.time(), 3)  # add current time
+        point['step'] = epoch
 
-        self.task.history['current_epoch'] = epoch + 1
-        self.task.history['current_batch'] = self.batches_in_epoch * (epoch + 1)
-        self.task.history['current_batch_in_epoch'] = self.batches_in_epoch
-        self.task.history['current_example'] = self.task.history['examples']
+        self.flush_batches()
+        history.append_history(self.task.id, history.EPOCH, [point])
 
-        self.task.save()
+        self.set_progress(
+            current_epoch=epoch + 1,
+            current_batch=self.batches_in_epoch * (epoch + 1),
+            current_batch_in_epoch=self.batches_in_epoch,
+            current_example=self.examples
+        )
 
     def on_train_end(self, logs=None):
-        pass
+        self.flush_batches()
@@ -35,10 +35,11 @@ def predict_on_task_exc(task):
     (x, _), _ = base.slice_dataset(dataset, 1.0)
     print('Dataset sliced')
 
-    model = base.prepare_model(model_meta)
+    cached_model = base.get_cached_model(model_meta)
     print('Model loaded')
 
-    result = predict_model(model, x)
+    with cached_model.as_default() as model:
+        result = predict_model(model, x)
 
     # save result
     tmp_name = task.id
@@ -46,14 +47,20 @@ def predict_on_task_exc(task):
     with storage.open_dataset(tmp_name, mode='w', prefix='tmp') as h5:
         h5.create_dataset('y', data=result)
 
+    result_path = storage.get_dataset_path(tmp_name, prefix='tmp')
+
     with task.save_context():
         task.history['result'] = tmp_name
+        task.history['result_hash'] = storage.get_file_hash(result_path)
 
 
 def predict_on_task(task):
     if type(task) is str:
         task = metadata.TaskMetadata.from_id(id=task)
 
+    if base.is_failed_before_start(task):
+        return
+
     with task.save_context():
         task.status = metadata.task.STARTED
 
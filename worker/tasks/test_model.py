@@ -42,10 +42,11 @@ def test_on_task_exc(task):
     (x, y), (_, _) = base.slice_dataset(dataset, 1.0)
     print('Dataset sliced')
 
-    model = base.prepare_model(model_meta)
+    cached_model = base.get_cached_model(model_meta)
     print('Model loaded')
 
-    metrics = test_model(model, x, y)
+    with cached_model.as_default() as model:
+        metrics = test_model(model, x, y)
 
     # save result
     with task.save_context():
@@ -56,6 +57,9 @@ def test_on_task(task):
     if type(task) is str:
         task = metadata.TaskMetadata.from_id(id=task)
 
+    if base.is_failed_before_start(task):
+        return
+
     with task.save_context():
         task.status = metadata.task.STARTED
 
@@ -1,3 +1,4 @@
+import os
 import traceback
 import collections
 
@@ -69,6 +70,12 @@ def save_model(model, meta=None, path=None):
 
     keras_save_models(model, path)
 
+    if meta:
+        # date of model is creation date, modification time of file is sent from file
+        with meta.save_context():
+            meta.base.size = os.path.getsize(path)
+            meta.base.hash = storage.get_file_hash(path)
+
 
 def train_on_model(model_meta, config, callbacks=[]):
     dataset_meta = model_meta.base.dataset
@@ -133,6 +140,9 @@ def train_on_task(task):
     if type(task) is str:
         task = metadata.TaskMetadata.from_id(id=task)
 
+    if base.is_failed_before_start(task):
+        return
+
     with task.save_context():
         task.status = metadata.task.STARTED
 
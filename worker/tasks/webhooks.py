@@ -0,0 +1,200 @@
+import collections
+import hashlib
+import hmac
+import http.client
+import ipaddress
+import json
+import logging
+import time
+import urllib.error
+import urllib.request
+
+import metadata
+from ..app import app
+
+__all__ = [
+    'UnsafeAddressError',
+    'sign_payload',
+    'check_address',
+    'configure_allowed_networks',
+    'post_events',
+    'deliver_webhooks'
+]
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_DELIVERY_INTERVAL = 5  # seconds
+SEND_TIMEOUT = 10  # seconds
+
+SIGNATURE_HEADER = 'X-Neuroseed-Signature'
+TIMESTAMP_HEADER = 'X-Neuroseed-Timestamp'
+
+
+def sign_payload(secret, timestamp, body):
+    """Return HMAC-SHA256 signature of 'timestamp.body' by secret of webhook
+
+    Receiver computes the same signature and rejects old timestamps.
+    """
+
+    message = timestamp.encode('utf-8') + b'.' + body
+    digest = hmac.new(secret.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+    return 'sha256=' + digest
+
+
+# private addresses allowed as webhook targets, e.g. receiver in local network
+ALLOWED_NETWORKS = []
+
+
+class UnsafeAddressError(ValueError):
+    """Webhook url resolves to loopback, private, link-local or reserved address"""
+
+
+def configure_allowed_networks(networks):
+    """Set networks (list of CIDR strings) allowed despite being private"""
+
+    ALLOWED_NETWORKS[:] = [ipaddress.ip_network(network) for network in networks]
+
+
+def check_address(address):
+    """
+    Raises:
+        UnsafeAddressError - address of worker network or of cloud metadata service
+    """
+
+    ip = ipaddress.ip_address(address.split('%', 1)[0])
+
+    if any(ip in network for network in ALLOWED_NETWORKS):
+        return
+
+    if ip.is_loopback or ip.is_private or ip.is_link_local or ip.is_reserved \
+            or ip.is_multicast or ip.is_unspecified or not ip.is_global:
+        raise UnsafeAddressError('webhook address {ip} is not allowed'.format(ip=ip))
+
+
+class SafeHTTPConnection(http.client.HTTPConnection):
+    """Connection checking address of peer before request is sent
+
+    Address is checked after connect, so host resolved to other address
+    than checked (DNS rebinding) is also refused.
+    """
+
+    def connect(self):
+        super().connect()
+
+        try:
+            check_address(self.sock.getpeername()[0])
+        except UnsafeAddressError:
+            self.close()
+            raise
+
+
+class SafeHTTPSConnection(http.client.HTTPSConnection):
+    def connect(self):
+        super().connect()
+
+        try:
+            check_address(self.sock.getpeername()[0])
+        except UnsafeAddressError:
+            self.close()
+            raise
+
+
+class SafeHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(SafeHTTPConnection, req)
+
+
+class SafeHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(SafeHTTPSConnection, req, context=self._context, check_hostname=self._check_hostname)
+
+
+# proxies are not used: address of proxy is not address of receiver
+OPENER = urllib.request.build_opener(urllib.request.ProxyHandler({}), SafeHTTPHandler, SafeHTTPSHandler)
+
+
+def post_events(url, secret, events, timeout=SEND_TIMEOUT):
+    """POST batch of events to url, signed by secret
+
+    Raises:
+        UnsafeAddressError - url host is address of internal network
+        urllib.error.URLError, OSError - connection error or status >= 400
+    """
+
+    body = json.dumps({'events': events}, separators=(',', ':')).encode('utf-8')
+    timestamp = str(int(time.time()))
+
+    request = urllib.request.Request(url, data=body, method='POST', headers={
+        'Content-Type': 'application/json',
+        'User-Agent': 'neuroseed-webhooks',
+        TIMESTAMP_HEADER: timestamp,
+        SIGNATURE_HEADER: sign_payload(secret, timestamp, body)
+    })
+
+    with OPENER.open(request, timeout=timeout) as response:
+        response.read()
+
+
+def deliver_webhooks(limit=metadata.webhook.DELIVERIES_LIMIT, send=post_events):
+    """Send due deliveries of outbox, one request per webhook with all its events
+
+    Failed deliveries are retried with exponential backoff.
+
+    Returns:
+        dict with numbers of delivered and failed deliveries
+    """
+
+    deliveries = metadata.claim_deliveries(limit)
+
+    batches = collections.OrderedDict()
+    for delivery in deliveries:
+        batches.setdefault(delivery.webhook, []).append(delivery)
+
+    webhooks = metadata.WebhookMetadata.objects(id__in=list(batches))
+    webhooks = {webhook.id: webhook for webhook in webhooks}
+
+    report = {'delivered': 0, 'failed': 0}
+
+    for webhook_id, batch in batches.items():
+        webhook = webhooks.get(webhook_id, None)
+
+        if webhook is None:
+            # webhook is deleted, events are not sent
+            metadata.WebhookDelivery.objects(id__in=[delivery.id for delivery in batch]).update(
+                set__status=metadata.webhook.FAILED,
+                set__last_error='webhook is deleted')
+            report['failed'] += len(batch)
+            continue
+
+        # previous sends of run may take longer than claim timeout
+        batch = metadata.extend_claim(batch)
+
+        if not batch:
+            continue
+
+        try:
+            send(webhook.url, webhook.secret, [delivery.event for delivery in batch])
+        except UnsafeAddressError as err:
+            logger.warning('Webhook {id} is refused: {err}'.format(id=webhook_id, err=err))
+            metadata.mark_failed(batch, err, retry=False)
+            report['failed'] += len(batch)
+        except (urllib.error.URLError, OSError, ValueError) as err:
+            logger.warning('Can not deliver webhook {id}: {err}'.format(id=webhook_id, err=err))
+            metadata.mark_failed(batch, err)
+            report['failed'] += len(batch)
+        else:
+            metadata.mark_delivered(batch)
+            report['delivered'] += len(batch)
+
+    return report
+
+
+@app.task(name='metadata.deliver_webhooks')
+def celery_deliver_webhooks():
+    report = deliver_webhooks()
+
+    if report['delivered'] or report['failed']:
+        logger.info('Deliver webhooks: {report}'.format(report=report))
+
+    return report